@@ -1,12 +1,20 @@
 """
 应用配置管理
 """
+import hashlib
 import os
+import sys
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import cache, cached_property
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.utils.logger import logger
+
+# 优先使用 libyaml 加速的 CSafeLoader，未安装 libyaml 时回退到纯 Python 实现
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class XTQuantMode(str, Enum):
@@ -16,8 +24,14 @@ class XTQuantMode(str, Enum):
     PROD = "prod"  # 连接xtquant，获取真实数据，允许真实交易
 
 
+# 合法的运行模式取值（与 XTQuantMode 保持一致）
+_VALID_MODES = frozenset(mode.value for mode in XTQuantMode)
+
+
 class AppConfig(BaseModel):
     """应用基础配置"""
+    model_config = ConfigDict(frozen=True)
+
     name: str = "xtquant-proxy"
     version: str = "1.0.0"
     debug: bool = False
@@ -27,6 +41,8 @@ class AppConfig(BaseModel):
 
 class LoggingConfig(BaseModel):
     """日志配置"""
+    model_config = ConfigDict(frozen=True)
+
     level: str = "INFO"
     file: Optional[str] = "logs/app.log"
     error_file: Optional[str] = "logs/error.log"
@@ -41,6 +57,8 @@ class LoggingConfig(BaseModel):
 
 class XTQuantDataConfig(BaseModel):
     """xtquant数据配置"""
+    model_config = ConfigDict(frozen=True)
+
     path: str = "./data"
     config_path: str = "./xtquant/config"
     qmt_userdata_path: Optional[str] = None  # QMT客户端的userdata_mini路径
@@ -53,6 +71,8 @@ class XTQuantDataConfig(BaseModel):
 
 class XTQuantTradingConfig(BaseModel):
     """xtquant交易配置"""
+    model_config = ConfigDict(frozen=True)
+
     allow_real_trading: bool = False
     mock_account_id: str = "mock_account_001"
     mock_password: str = "mock_password"
@@ -63,6 +83,8 @@ class XTQuantTradingConfig(BaseModel):
 
 class XTQuantConfig(BaseModel):
     """xtquant配置"""
+    model_config = ConfigDict(frozen=True)
+
     mode: XTQuantMode = XTQuantMode.MOCK
     data: XTQuantDataConfig = Field(default_factory=XTQuantDataConfig)
     trading: XTQuantTradingConfig = Field(default_factory=XTQuantTradingConfig)
@@ -70,23 +92,36 @@ class XTQuantConfig(BaseModel):
 
 class SecurityConfig(BaseModel):
     """安全配置"""
+    model_config = ConfigDict(frozen=True)
+
     secret_key: str = "your-secret-key-change-in-production"
     api_key_header: str = "X-API-Key"
     api_keys: List[str] = Field(default_factory=list)
 
+    @cached_property
+    def api_key_digests(self) -> Tuple[bytes, ...]:
+        """API密钥的 SHA-256 摘要（去重，校验时与请求密钥的摘要逐个做常量时间比较）"""
+        return tuple(dict.fromkeys(hashlib.sha256(key.encode("utf-8")).digest() for key in self.api_keys))
+
 
 class DatabaseConfig(BaseModel):
     """数据库配置"""
+    model_config = ConfigDict(frozen=True)
+
     url: Optional[str] = None
 
 
 class RedisConfig(BaseModel):
     """Redis配置"""
+    model_config = ConfigDict(frozen=True)
+
     url: Optional[str] = None
 
 
 class CORSConfig(BaseModel):
     """CORS配置"""
+    model_config = ConfigDict(frozen=True)
+
     allow_origins: List[str] = Field(default_factory=lambda: ["*"])
     allow_credentials: bool = True
     allow_methods: List[str] = Field(default_factory=lambda: ["*"])
@@ -94,11 +129,17 @@ class CORSConfig(BaseModel):
 
 class UvicornConfig(BaseModel):
     """uvicorn配置"""
+    model_config = ConfigDict(frozen=True)
+
     timeout_keep_alive: int = 120  # 连接保持超时（秒），增大以支持长时间请求
+    loop: str = "auto"  # 事件循环实现：auto 在已安装 uvloop 时使用 uvloop（Windows 不支持，回退到 asyncio）
+    http: str = "auto"  # HTTP 协议实现：auto 在已安装 httptools 时使用 httptools
 
 
 class RequestTimeoutConfig(BaseModel):
     """请求超时配置"""
+    model_config = ConfigDict(frozen=True)
+
     default: float = 30.0  # 默认请求超时（秒）
     market_data: float = 60.0  # 市场数据请求超时
     financial_data: float = 60.0  # 财务数据请求超时
@@ -109,6 +150,8 @@ class RequestTimeoutConfig(BaseModel):
 
 class Settings(BaseModel):
     """完整配置类"""
+    model_config = ConfigDict(frozen=True)
+
     app: AppConfig = Field(default_factory=AppConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     xtquant: XTQuantConfig = Field(default_factory=XTQuantConfig)
@@ -126,129 +169,221 @@ class Settings(BaseModel):
     grpc_max_workers: int = 50  # 增大线程池以支持更多并发请求
     grpc_max_message_length: int = 50 * 1024 * 1024  # 50MB
 
+    # run_sync 阻塞调用线程池大小（xtquant 调用专用，与 Starlette 默认线程池隔离）
+    thread_pool_max_workers: int = 50
+
+
+# 已解析的配置文件缓存：路径 -> (mtime_ns, size, 配置数据)，文件未变化时跳过重复解析
+_config_data_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def _intern_keys(node: Any) -> Any:
+    """
+    递归驻留YAML解析结果中的字典键
+
+    源码中的键字面量已由CPython自动驻留，驻留解析得到的键后，
+    后续 .get() 查找可直接按指针命中，无需逐字节比较
+    """
+    if isinstance(node, dict):
+        return {
+            (sys.intern(key) if isinstance(key, str) else key): _intern_keys(value)
+            for key, value in node.items()
+        }
+    if isinstance(node, list):
+        return [_intern_keys(item) for item in node]
+    return node
+
+
+def _read_config_data(config_file: str) -> Dict[str, Any]:
+    """读取并解析YAML配置文件（按文件修改时间和大小缓存解析结果）"""
+    stat = os.stat(config_file)
+    cached = _config_data_cache.get(config_file)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
 
-def load_config(config_file: Optional[str] = None) -> Settings:
+    # 以二进制方式读取，交由 YAML 解析器自行识别编码，省去 Python 层的解码
+    with open(config_file, 'rb') as f:
+        config_data = _intern_keys(yaml.load(f, Loader=_YamlLoader) or {})
+
+    _config_data_cache[config_file] = (stat.st_mtime_ns, stat.st_size, config_data)
+    return config_data
+
+
+def _construct_settings(config: Dict[str, Any]) -> Settings:
+    """
+    基于可信的配置字典直接构建Settings
+
+    配置来自本地YAML与硬编码默认值，使用 model_construct 逐层构建以跳过Pydantic校验；
+    model_construct 不做类型转换，枚举字段需在此处显式转换
+    """
+    xtquant = config["xtquant"]
+    return Settings.model_construct(
+        app=AppConfig.model_construct(**config["app"]),
+        logging=LoggingConfig.model_construct(**config["logging"]),
+        xtquant=XTQuantConfig.model_construct(
+            mode=XTQuantMode(xtquant["mode"]),
+            data=XTQuantDataConfig.model_construct(**xtquant["data"]),
+            trading=XTQuantTradingConfig.model_construct(**xtquant["trading"]),
+        ),
+        security=SecurityConfig.model_construct(**config["security"]),
+        database=DatabaseConfig.model_construct(**config["database"]),
+        redis=RedisConfig.model_construct(**config["redis"]),
+        cors=CORSConfig.model_construct(**config["cors"]),
+        uvicorn=UvicornConfig.model_construct(**config["uvicorn"]),
+        request_timeout=RequestTimeoutConfig.model_construct(**config["request_timeout"]),
+        grpc_enabled=config["grpc_enabled"],
+        grpc_host=config["grpc_host"],
+        grpc_port=config["grpc_port"],
+        grpc_max_workers=config["grpc_max_workers"],
+        grpc_max_message_length=config["grpc_max_message_length"],
+        thread_pool_max_workers=config["thread_pool_max_workers"],
+    )
+
+
+def _build_config_dict(config_data: Dict[str, Any], mode_config: Dict[str, Any], app_mode: str) -> Dict[str, Any]:
+    """根据全局配置与模式特定配置组装完整配置字典"""
+    # 各配置段只取一次，避免重复的 .get(..., {}) 链式查找
+    app_cfg = config_data.get("app") or {}
+    logging_cfg = config_data.get("logging") or {}
+    mode_logging_cfg = mode_config.get("logging") or {}
+    xtquant_cfg = config_data.get("xtquant") or {}
+    data_cfg = xtquant_cfg.get("data") or {}
+    security_cfg = config_data.get("security") or {}
+    uvicorn_cfg = config_data.get("uvicorn") or {}
+    grpc_cfg = config_data.get("grpc") or {}
+    thread_pool_cfg = config_data.get("thread_pool") or {}
+
+    # 构建完整配置
+    return {
+        "app": {
+            "name": app_cfg.get("name", "xtquant-proxy"),
+            "version": app_cfg.get("version", "1.0.0"),
+            "debug": mode_config.get("debug", False),
+            "host": mode_config.get("host", "0.0.0.0"),
+            "port": mode_config.get("port", 8000)
+        },
+        "logging": {
+            "level": mode_config.get("log_level", "INFO"),
+            "file": logging_cfg.get("file", "logs/app.log"),
+            "error_file": logging_cfg.get("error_file", "logs/error.log"),
+            "format": logging_cfg.get("format", LoggingConfig.model_fields["format"].default),
+            "rotation": logging_cfg.get("rotation", "10 MB"),
+            "retention": logging_cfg.get("retention", "30 days"),
+            "compression": logging_cfg.get("compression", "zip"),
+            # 允许模式特定配置覆盖全局配置
+            "console_output": mode_logging_cfg.get("console_output", logging_cfg.get("console_output", True)),
+            "backtrace": mode_logging_cfg.get("backtrace", logging_cfg.get("backtrace", True)),
+            "diagnose": mode_logging_cfg.get("diagnose", logging_cfg.get("diagnose", False))
+        },
+        "xtquant": {
+            "mode": mode_config.get("xtquant_mode", app_mode),
+            "data": {
+                "path": data_cfg.get("path", "./data"),
+                "config_path": data_cfg.get("config_path", "./xtquant/config"),
+                "qmt_userdata_path": xtquant_cfg.get("qmt_userdata_path")
+            },
+            "trading": {
+                "allow_real_trading": mode_config.get("allow_real_trading", False),
+                "mock_account_id": "mock_account_001",
+                "mock_password": "mock_password"
+            }
+        },
+        "security": {
+            "secret_key": security_cfg.get("secret_key", "change-me"),
+            "api_key_header": security_cfg.get("api_key_header", "X-API-Key"),
+            "api_keys": mode_config.get("api_keys", [])
+        },
+        "database": {
+            "url": (mode_config.get("database") or {}).get("url")
+        },
+        "redis": {
+            "url": (mode_config.get("redis") or {}).get("url")
+        },
+        "cors": mode_config.get("cors", {
+            "allow_origins": ["*"],
+            "allow_credentials": True,
+            "allow_methods": ["*"],
+            "allow_headers": ["*"]
+        }),
+        "uvicorn": {
+            "timeout_keep_alive": uvicorn_cfg.get("timeout_keep_alive", 120),
+            "loop": uvicorn_cfg.get("loop", "auto"),
+            "http": uvicorn_cfg.get("http", "auto")
+        },
+        "request_timeout": config_data.get("request_timeout", {
+            "default": 30.0,
+            "market_data": 60.0,
+            "financial_data": 60.0,
+            "download": 300.0,
+            "trading": 30.0,
+            "subscription": 60.0
+        }),
+        "grpc_enabled": grpc_cfg.get("enabled", True),
+        "grpc_host": grpc_cfg.get("host", "0.0.0.0"),
+        "grpc_port": grpc_cfg.get("port", 50051),
+        "grpc_max_workers": grpc_cfg.get("max_workers", 50),
+        "grpc_max_message_length": grpc_cfg.get("max_message_length", 50 * 1024 * 1024),
+        "thread_pool_max_workers": thread_pool_cfg.get("max_workers", 50),
+    }
+
+
+def load_config(config_file: Optional[str] = None, strict: bool = False) -> Settings:
     """
     加载配置文件
     通过环境变量 APP_MODE 选择模式: mock, dev, prod
     默认使用 dev 模式
+
+    Args:
+        config_file: 配置文件路径，默认 config.yml
+        strict: 是否对配置执行完整的Pydantic校验（调试配置文件时使用）
     """
     if config_file is None:
         config_file = "config.yml"
     
-    if not os.path.exists(config_file):
+    try:
+        config_data = _read_config_data(config_file)
+    except FileNotFoundError:
+        # 配置文件不存在时使用默认配置（os.stat 同时承担存在性检查）
+        return Settings()
+    except (yaml.YAMLError, OSError) as e:
+        logger.error(f"读取配置文件失败，使用默认配置: {config_file}: {e}")
         return Settings()
     
-    try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
-        
-        # 获取运行模式
-        app_mode = os.getenv("APP_MODE", "dev").lower()
-        
-        if app_mode not in ["mock", "dev", "prod"]:
-            app_mode = "dev"
-        
-        # 获取模式特定配置
-        modes_config = config_data.get("modes", {})
-        mode_config = modes_config.get(app_mode, {})
-        
-        if not mode_config:
-            return Settings()
-        
-        # 构建完整配置
-        final_config = {
-            "app": {
-                "name": config_data.get("app", {}).get("name", "xtquant-proxy"),
-                "version": config_data.get("app", {}).get("version", "1.0.0"),
-                "debug": mode_config.get("debug", False),
-                "host": mode_config.get("host", "0.0.0.0"),
-                "port": mode_config.get("port", 8000)
-            },
-            "logging": {
-                "level": mode_config.get("log_level", "INFO"),
-                "file": config_data.get("logging", {}).get("file", "logs/app.log"),
-                "error_file": config_data.get("logging", {}).get("error_file", "logs/error.log"),
-                "format": config_data.get("logging", {}).get("format"),
-                "rotation": config_data.get("logging", {}).get("rotation", "10 MB"),
-                "retention": config_data.get("logging", {}).get("retention", "30 days"),
-                "compression": config_data.get("logging", {}).get("compression", "zip"),
-                # 允许模式特定配置覆盖全局配置
-                "console_output": mode_config.get("logging", {}).get("console_output", config_data.get("logging", {}).get("console_output", True)),
-                "backtrace": mode_config.get("logging", {}).get("backtrace", config_data.get("logging", {}).get("backtrace", True)),
-                "diagnose": mode_config.get("logging", {}).get("diagnose", config_data.get("logging", {}).get("diagnose", False))
-            },
-            "xtquant": {
-                "mode": mode_config.get("xtquant_mode", app_mode),
-                "data": {
-                    "path": config_data.get("xtquant", {}).get("data", {}).get("path", "./data"),
-                    "config_path": config_data.get("xtquant", {}).get("data", {}).get("config_path", "./xtquant/config"),
-                    "qmt_userdata_path": config_data.get("xtquant", {}).get("qmt_userdata_path")
-                },
-                "trading": {
-                    "allow_real_trading": mode_config.get("allow_real_trading", False),
-                    "mock_account_id": "mock_account_001",
-                    "mock_password": "mock_password"
-                }
-            },
-            "security": {
-                "secret_key": config_data.get("security", {}).get("secret_key", "change-me"),
-                "api_key_header": config_data.get("security", {}).get("api_key_header", "X-API-Key"),
-                "api_keys": mode_config.get("api_keys", [])
-            },
-            "database": {
-                "url": mode_config.get("database", {}).get("url")
-            },
-            "redis": {
-                "url": mode_config.get("redis", {}).get("url")
-            },
-            "cors": mode_config.get("cors", {
-                "allow_origins": ["*"],
-                "allow_credentials": True,
-                "allow_methods": ["*"],
-                "allow_headers": ["*"]
-            }),
-            "uvicorn": {
-                "timeout_keep_alive": config_data.get("uvicorn", {}).get("timeout_keep_alive", 120)
-            },
-            "request_timeout": config_data.get("request_timeout", {
-                "default": 30.0,
-                "market_data": 60.0,
-                "financial_data": 60.0,
-                "download": 300.0,
-                "trading": 30.0,
-                "subscription": 60.0
-            }),
-            "grpc_enabled": config_data.get("grpc", {}).get("enabled", True),
-            "grpc_host": config_data.get("grpc", {}).get("host", "0.0.0.0"),
-            "grpc_port": config_data.get("grpc", {}).get("port", 50051),
-            "grpc_max_workers": config_data.get("grpc", {}).get("max_workers", 50),
-            "grpc_max_message_length": config_data.get("grpc", {}).get("max_message_length", 50 * 1024 * 1024),
-        }
-        
-        return Settings(**final_config)
-        
-    except Exception:
-        import traceback
-        traceback.print_exc()
+    # 获取运行模式
+    app_mode = os.getenv("APP_MODE", "dev").lower()
+    
+    if app_mode not in _VALID_MODES:
+        app_mode = "dev"
+    
+    # 获取模式特定配置
+    modes_config = config_data.get("modes") or {}
+    mode_config = modes_config.get(app_mode) or {}
+    
+    if not mode_config:
         return Settings()
+    
+    final_config = _build_config_dict(config_data, mode_config, app_mode)
+    if strict:
+        return Settings(**final_config)
+    return _construct_settings(final_config)
 
 
-_settings_instance: Optional[Settings] = None
+@cache
+def get_settings() -> Settings:
+    """获取配置实例（单例模式，由 functools.cache 保证只加载一次）"""
+    return load_config()
 
 
-def get_settings() -> Settings:
-    """获取配置实例（单例模式）"""
-    global _settings_instance
-    if _settings_instance is None:
-        _settings_instance = load_config()
-    return _settings_instance
+@cache
+def get_request_timeouts() -> Dict[str, float]:
+    """获取各类请求的超时时间表（秒），路由在导入时取用，避免每次请求解析依赖与读取属性链"""
+    return get_settings().request_timeout.model_dump()
 
 
 def reset_settings():
     """重置配置实例（用于测试）"""
-    global _settings_instance
-    _settings_instance = None
+    get_settings.cache_clear()
+    get_request_timeouts.cache_clear()
 
 
 # 全局配置实例（延迟加载）
@@ -3,123 +3,183 @@
 """
 import os
 import sys
-from typing import Optional
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
 
-from fastapi import Depends
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import Depends, Request
 
 # 添加xtquant包到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.config import Settings, get_settings
-from app.utils.exceptions import AuthenticationException
+from app.config import Settings, XTQuantMode, get_request_timeouts, get_settings
+from app.services.data_service import DataService
+from app.services.subscription_manager import SubscriptionManager
+from app.services.trading_callback_manager import (
+    TradingCallbackManager,
+    get_trading_callback_manager as _get_trading_callback_manager,
+)
+from app.services.trading_service import TradingService
+from app.utils.async_utils import run_sync
+from app.utils.batcher import Batcher
 from app.utils.logger import logger
-
-# 安全方案
-security = HTTPBearer(auto_error=False)
-
+from app.utils.singleflight import SingleFlight
 
 # 全局服务实例（单例模式）
-_data_service_instance = None
-_trading_service_instance = None
-_subscription_manager_instance = None
-_trading_callback_manager_instance = None
+_data_service_instance: Optional[DataService] = None
+_trading_service_instance: Optional[TradingService] = None
+_subscription_manager_instance: Optional[SubscriptionManager] = None
+_trading_callback_manager_instance: Optional[TradingCallbackManager] = None
 
+# 服务初始化锁：双重检查，避免并发首次请求时重复构建服务（重复连接xtquant）
+_service_lock = threading.Lock()
 
-def get_data_service(settings: Settings = Depends(get_settings)):
+
+def get_data_service(settings: Settings = Depends(get_settings)) -> DataService:
     """获取DataService单例实例"""
     global _data_service_instance
     
     if _data_service_instance is None:
-        from app.services.data_service import DataService
-        logger.info("初始化 DataService...")
-        _data_service_instance = DataService(settings)
+        with _service_lock:
+            if _data_service_instance is None:
+                logger.info("初始化 DataService...")
+                _data_service_instance = DataService(settings)
     
     return _data_service_instance
 
 
-def get_trading_service(settings: Settings = Depends(get_settings)):
+def get_trading_service(settings: Settings = Depends(get_settings)) -> TradingService:
     """获取TradingService单例实例"""
     global _trading_service_instance
     
     if _trading_service_instance is None:
-        from app.services.trading_service import TradingService
-        logger.info("初始化 TradingService...")
-        _trading_service_instance = TradingService(settings)
+        with _service_lock:
+            if _trading_service_instance is None:
+                logger.info("初始化 TradingService...")
+                _trading_service_instance = TradingService(settings)
     
     return _trading_service_instance
 
 
-def get_subscription_manager(settings: Settings = Depends(get_settings)):
+def get_subscription_manager(settings: Settings = Depends(get_settings)) -> SubscriptionManager:
     """获取SubscriptionManager单例实例"""
     global _subscription_manager_instance
 
     if _subscription_manager_instance is None:
-        from app.services.subscription_manager import SubscriptionManager
-        logger.info("初始化 SubscriptionManager...")
-        _subscription_manager_instance = SubscriptionManager(settings)
+        with _service_lock:
+            if _subscription_manager_instance is None:
+                logger.info("初始化 SubscriptionManager...")
+                _subscription_manager_instance = SubscriptionManager(settings)
 
     return _subscription_manager_instance
 
 
-def get_trading_callback_manager(settings: Settings = Depends(get_settings)):
+def get_trading_callback_manager(settings: Settings = Depends(get_settings)) -> TradingCallbackManager:
     """获取TradingCallbackManager单例实例"""
     global _trading_callback_manager_instance
 
     if _trading_callback_manager_instance is None:
-        from app.services.trading_callback_manager import get_trading_callback_manager as _get_manager
-        logger.info("初始化 TradingCallbackManager...")
-        _trading_callback_manager_instance = _get_manager(settings)
+        with _service_lock:
+            if _trading_callback_manager_instance is None:
+                logger.info("初始化 TradingCallbackManager...")
+                _trading_callback_manager_instance = _get_trading_callback_manager(settings)
 
     return _trading_callback_manager_instance
 
 
-async def get_api_key(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    settings: Settings = Depends(get_settings)
-) -> Optional[str]:
-    """获取API密钥"""
-    if not credentials:
-        return None
-    
-    # 这里可以添加API密钥验证逻辑
-    # 目前简单返回token
-    return credentials.credentials
-
-
-async def verify_api_key(
-    api_key: Optional[str] = Depends(get_api_key),
-    settings: Settings = Depends(get_settings)
-) -> str:
-    """验证API密钥"""
-    if not api_key:
-        raise AuthenticationException("API密钥缺失")
-    
-    # 验证API密钥是否在允许列表中
-    if settings.security.api_keys and api_key not in settings.security.api_keys:
-        raise AuthenticationException("无效的API密钥")
-    
-    return api_key
+# 以下依赖读取应用启动时挂载在 app.state 上的实例或已创建的服务单例；定义为 async 函数，
+# FastAPI 直接在事件循环中调用，不像同步依赖那样每次请求都提交到线程池执行
+
+async def get_app_data_service(request: Request) -> DataService:
+    """获取DataService单例实例（应用启动时挂载在 app.state 上）"""
+    return request.app.state.data_service
+
+
+async def get_app_trading_service() -> TradingService:
+    """获取TradingService单例实例（异步依赖，已创建时直接返回，无需经线程池解析配置依赖）"""
+    service = _trading_service_instance
+    if service is None:
+        service = get_trading_service(get_settings())
+    return service
+
+
+async def get_app_subscription_manager() -> SubscriptionManager:
+    """获取SubscriptionManager单例实例（异步依赖，已创建时直接返回，无需经线程池解析配置依赖）"""
+    manager = _subscription_manager_instance
+    if manager is None:
+        manager = get_subscription_manager(get_settings())
+    return manager
+
+
+async def get_singleflight(request: Request) -> SingleFlight:
+    """获取请求合并器（应用启动时挂载在 app.state 上）"""
+    return request.app.state.singleflight
+
+
+# 支持微批合并的 Level2 接口（DataService 方法名，参数均为标的代码列表）
+L2_BATCH_METHODS = ("get_l2_quote", "get_l2_order", "get_l2_transaction")
+
+
+def create_l2_batchers(settings: Settings) -> Dict[str, Batcher]:
+    """创建 Level2 接口的微批处理器（应用启动时调用，DataService 在首次合并调用时才初始化）"""
+    timeout = get_request_timeouts()["market_data"]
+
+    def make_fetch(method: str):
+        async def fetch(stock_codes):
+            data_service = get_data_service(settings)
+            return await run_sync(getattr(data_service, method), stock_codes, timeout=timeout)
+        return fetch
+
+    return {method: Batcher(make_fetch(method)) for method in L2_BATCH_METHODS}
+
+
+async def get_l2_batchers(request: Request) -> Dict[str, Batcher]:
+    """获取 Level2 微批处理器（应用启动时挂载在 app.state 上）"""
+    return request.app.state.l2_batchers
+
+
+class XTQuantPaths(NamedTuple):
+    """预解析的xtquant路径与模式"""
+    data_path: str
+    config_path: str
+    mode: str
+
+
+# (配置实例, 解析结果)；配置实例变化（如 reset_settings）时重新解析
+_xtquant_paths: Optional[Tuple[Settings, XTQuantPaths]] = None
+
+
+def _get_xtquant_paths() -> XTQuantPaths:
+    """获取预解析的xtquant路径与模式，避免每次请求遍历配置属性链"""
+    global _xtquant_paths
+
+    settings = get_settings()
+    cached = _xtquant_paths
+    if cached is None or cached[0] is not settings:
+        xtquant = settings.xtquant
+        cached = (settings, XTQuantPaths(xtquant.data.path, xtquant.data.config_path, xtquant.mode.value))
+        _xtquant_paths = cached
+    return cached[1]
 
 
-def get_xtquant_data_path(settings: Settings = Depends(get_settings)) -> str:
+def get_xtquant_data_path() -> str:
     """获取xtquant数据路径"""
-    return settings.xtquant.data.path
+    return _get_xtquant_paths().data_path
 
 
-def get_xtquant_config_path(settings: Settings = Depends(get_settings)) -> str:
+def get_xtquant_config_path() -> str:
     """获取xtquant配置路径"""
-    return settings.xtquant.data.config_path
+    return _get_xtquant_paths().config_path
 
 
-def get_xtquant_mode(settings: Settings = Depends(get_settings)) -> str:
+def get_xtquant_mode() -> str:
     """获取xtquant接口模式"""
-    return settings.xtquant.mode.value
+    return _get_xtquant_paths().mode
 
 
-def is_real_trading_allowed(settings: Settings = Depends(get_settings)) -> bool:
+def is_real_trading_allowed() -> bool:
     """检查是否允许真实交易"""
+    settings = get_settings()
     return (
-        settings.xtquant.mode.value == "real" and 
+        settings.xtquant.mode is XTQuantMode.PROD and
         settings.xtquant.trading.allow_real_trading
     )
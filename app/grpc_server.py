@@ -1,20 +1,27 @@
 """
 gRPC 服务器
 """
+import asyncio
+import os
 from concurrent import futures
 
+# 在首次导入 protobuf 之前默认选用 upb C 实现（已显式设置该环境变量时保持用户配置）
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
+
 import grpc
+from google.protobuf.internal import api_implementation
 
 from app.config import get_settings
 from app.grpc_services.data_grpc_service import DataGrpcService
 from app.grpc_services.health_grpc_service import HealthGrpcService
+from app.grpc_services.interceptors import LoggingInterceptor
 from app.grpc_services.trading_grpc_service import TradingGrpcService
 from app.utils.logger import configure_logging, logger
 from generated import data_pb2_grpc, health_pb2_grpc, trading_pb2_grpc
 
 
-def serve():
-    """启动 gRPC 服务器"""
+async def _serve():
+    """启动 gRPC 服务器（grpc.aio）"""
     settings = get_settings()
     
     # 初始化日志系统
@@ -28,14 +35,26 @@ def serve():
         compression=settings.logging.compression
     )
     
+    # 检查 protobuf 运行时实现：upb/cpp 为 C 实现，python 为纯 Python 实现（序列化性能差数倍）
+    protobuf_impl = api_implementation.Type()
+    if protobuf_impl == "python":
+        logger.warning("protobuf 正在使用纯 Python 实现，请检查 PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION 环境变量或升级 protobuf")
+    else:
+        logger.info(f"protobuf 运行时实现: {protobuf_impl}")
+    
     # 获取 gRPC 配置
     grpc_host = getattr(settings, 'grpc_host', '0.0.0.0')
     grpc_port = getattr(settings, 'grpc_port', 50051)
     max_workers = getattr(settings, 'grpc_max_workers', 10)
     
-    # 创建服务器
-    server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=max_workers),
+    # 调用日志拦截器仅在 DEBUG 级别注册，其他级别下处理函数不做任何包装
+    interceptors = [LoggingInterceptor()] if settings.logging.level.upper() == "DEBUG" else []
+    
+    # 创建服务器：流式回调等异步方法直接运行在事件循环上，
+    # 其余同步方法由 migration_thread_pool 线程池执行
+    server = grpc.aio.server(
+        migration_thread_pool=futures.ThreadPoolExecutor(max_workers=max_workers),
+        interceptors=interceptors,
         options=[
             ('grpc.max_send_message_length', 50 * 1024 * 1024),  # 50MB
             ('grpc.max_receive_message_length', 50 * 1024 * 1024),  # 50MB
@@ -68,16 +87,24 @@ def serve():
     server.add_insecure_port(server_address)
     
     # 启动服务器
-    server.start()
+    await server.start()
     logger.info(f"gRPC 服务已就绪 (工作线程: {max_workers})")
     
     try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
+        await server.wait_for_termination()
+    finally:
         logger.info("gRPC 服务正在关闭...")
-        server.stop(grace=5)
+        await server.stop(grace=5)
         logger.info("gRPC 服务已关闭")
 
 
+def serve():
+    """启动 gRPC 服务器"""
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == '__main__':
     serve()
@@ -0,0 +1,246 @@
+"""
+gRPC 交易消息转换函数
+
+将交易服务返回的 REST 模型与回调管理器推送的回调字典逐条写入 protobuf 消息。列表接口和
+回调流中每条记录都会调用一次，因此保持为带类型注解、无闭包和动态特性的模块级函数，
+可直接交给 mypyc 编译为 C 扩展
+"""
+import operator
+from typing import Any, Callable, Dict, Optional
+
+from app.models.trading_models import AccountType as RestAccountType
+from generated import trading_pb2
+
+
+# ==================== 枚举映射表：REST -> protobuf ====================
+
+# 账户类型
+PB_ACCOUNT_TYPE: Dict[Any, int] = {
+    RestAccountType.FUTURE: trading_pb2.ACCOUNT_TYPE_FUTURE,
+    RestAccountType.SECURITY: trading_pb2.ACCOUNT_TYPE_SECURITY,
+    RestAccountType.CREDIT: trading_pb2.ACCOUNT_TYPE_CREDIT,
+    RestAccountType.FUTURE_OPTION: trading_pb2.ACCOUNT_TYPE_FUTURE_OPTION,
+    RestAccountType.STOCK_OPTION: trading_pb2.ACCOUNT_TYPE_STOCK_OPTION
+}
+
+# 订单方向
+PB_ORDER_SIDE: Dict[str, int] = {
+    "BUY": trading_pb2.ORDER_SIDE_BUY,
+    "SELL": trading_pb2.ORDER_SIDE_SELL
+}
+
+# 订单类型
+PB_ORDER_TYPE: Dict[str, int] = {
+    "MARKET": trading_pb2.ORDER_TYPE_MARKET,
+    "LIMIT": trading_pb2.ORDER_TYPE_LIMIT,
+    "STOP": trading_pb2.ORDER_TYPE_STOP,
+    "STOP_LIMIT": trading_pb2.ORDER_TYPE_STOP_LIMIT
+}
+
+# 订单状态
+PB_ORDER_STATUS: Dict[str, int] = {
+    "PENDING": trading_pb2.ORDER_STATUS_PENDING,
+    "SUBMITTED": trading_pb2.ORDER_STATUS_SUBMITTED,
+    "PARTIAL_FILLED": trading_pb2.ORDER_STATUS_PARTIAL_FILLED,
+    "FILLED": trading_pb2.ORDER_STATUS_FILLED,
+    "CANCELLED": trading_pb2.ORDER_STATUS_CANCELLED,
+    "REJECTED": trading_pb2.ORDER_STATUS_REJECTED
+}
+
+
+# ==================== 字段批量读取器（一次 C 调用取出全部字段，代替逐个属性访问） ====================
+
+_ACCOUNT_FIELDS = operator.attrgetter(
+    "account_id", "account_type", "account_name", "status", "balance",
+    "available_balance", "frozen_balance", "market_value", "total_asset"
+)
+
+_ORDER_FIELDS = operator.attrgetter(
+    "order_id", "stock_code", "side", "order_type", "volume", "price", "status",
+    "submitted_time_iso", "filled_volume", "filled_amount", "average_price"
+)
+
+_TRADE_FIELDS = operator.attrgetter(
+    "trade_id", "order_id", "stock_code", "side", "volume", "price", "amount",
+    "trade_time_iso", "commission"
+)
+
+
+# ==================== 转换函数 ====================
+
+def convert_account_info(
+    account_info: Any,
+    pb_account_info: Optional[trading_pb2.AccountInfo] = None
+) -> trading_pb2.AccountInfo:
+    """转换账户信息（传入 pb_account_info 时直接写入该消息）"""
+    if pb_account_info is None:
+        pb_account_info = trading_pb2.AccountInfo()
+    (account_id, account_type, account_name, status, balance,
+     available_balance, frozen_balance, market_value, total_asset) = _ACCOUNT_FIELDS(account_info)
+    pb_account_info.account_id = account_id
+    pb_account_info.account_type = PB_ACCOUNT_TYPE.get(account_type, trading_pb2.ACCOUNT_TYPE_UNSPECIFIED)
+    pb_account_info.account_name = account_name
+    pb_account_info.status = status
+    pb_account_info.balance = balance
+    pb_account_info.available_balance = available_balance
+    pb_account_info.frozen_balance = frozen_balance
+    pb_account_info.market_value = market_value
+    pb_account_info.total_asset = total_asset
+    return pb_account_info
+
+
+def convert_order_info(
+    order_response: Any,
+    pb_order_info: Optional[trading_pb2.OrderInfo] = None
+) -> trading_pb2.OrderInfo:
+    """转换订单信息（传入 pb_order_info 时直接写入该消息）"""
+    if pb_order_info is None:
+        pb_order_info = trading_pb2.OrderInfo()
+    (order_id, stock_code, side, order_type, volume, price, status,
+     submitted_time_iso, filled_volume, filled_amount, average_price) = _ORDER_FIELDS(order_response)
+    pb_order_info.order_id = order_id
+    pb_order_info.stock_code = stock_code
+    pb_order_info.side = PB_ORDER_SIDE.get(side, trading_pb2.ORDER_SIDE_UNSPECIFIED)
+    pb_order_info.order_type = PB_ORDER_TYPE.get(order_type, trading_pb2.ORDER_TYPE_UNSPECIFIED)
+    pb_order_info.volume = volume
+    pb_order_info.price = price or 0.0
+    pb_order_info.status = PB_ORDER_STATUS.get(status, trading_pb2.ORDER_STATUS_UNSPECIFIED)
+    pb_order_info.submitted_time = submitted_time_iso
+    pb_order_info.filled_volume = filled_volume
+    pb_order_info.filled_amount = filled_amount
+    pb_order_info.average_price = average_price or 0.0
+    return pb_order_info
+
+
+def convert_trade_info(
+    trade_info: Any,
+    pb_trade_info: Optional[trading_pb2.TradeInfo] = None
+) -> trading_pb2.TradeInfo:
+    """转换成交信息（传入 pb_trade_info 时直接写入该消息）"""
+    if pb_trade_info is None:
+        pb_trade_info = trading_pb2.TradeInfo()
+    (trade_id, order_id, stock_code, side, volume, price, amount,
+     trade_time_iso, commission) = _TRADE_FIELDS(trade_info)
+    pb_trade_info.trade_id = trade_id
+    pb_trade_info.order_id = order_id
+    pb_trade_info.stock_code = stock_code
+    pb_trade_info.side = PB_ORDER_SIDE.get(side, trading_pb2.ORDER_SIDE_UNSPECIFIED)
+    pb_trade_info.volume = volume
+    pb_trade_info.price = price
+    pb_trade_info.amount = amount
+    pb_trade_info.trade_time = trade_time_iso
+    pb_trade_info.commission = commission
+    return pb_trade_info
+
+
+# ==================== 回调数据填充函数（按回调类型查表调用） ====================
+# 直接写入父消息持有的子消息，避免临时对象与 CopyFrom 复制；
+# 先 SetInParent 激活 oneof，保证全为默认值的数据也能标记为当前字段
+
+def fill_order_data(message: trading_pb2.TradingCallbackMessage, data: Dict[str, Any]) -> None:
+    """填充委托回调数据（data 为 OrderCallbackDict，字符串字段无需再 str 转换）"""
+    get = data.get
+    od = message.order_data
+    od.SetInParent()
+    od.order_id = get("order_id", "")
+    od.order_sysid = get("order_sysid") or ""
+    od.stock_code = get("stock_code", "")
+    od.stock_name = get("stock_name") or ""
+    od.side = get("side", "")
+    od.order_type = get("order_type", "")
+    od.volume = get("volume", 0)
+    od.price = get("price", 0.0)
+    od.status = get("status", "")
+    od.status_msg = get("status_msg") or ""
+    od.filled_volume = get("filled_volume", 0)
+    od.filled_amount = get("filled_amount", 0.0)
+    od.order_time = str(get("order_time") or "")
+
+
+def fill_trade_data(message: trading_pb2.TradingCallbackMessage, data: Dict[str, Any]) -> None:
+    """填充成交回调数据（data 为 TradeCallbackDict，字符串字段无需再 str 转换）"""
+    get = data.get
+    td = message.trade_data
+    td.SetInParent()
+    td.trade_id = get("trade_id", "")
+    td.order_id = get("order_id", "")
+    td.order_sysid = get("order_sysid") or ""
+    td.stock_code = get("stock_code", "")
+    td.stock_name = get("stock_name") or ""
+    td.side = get("side", "")
+    td.volume = get("volume", 0)
+    td.price = get("price", 0.0)
+    td.amount = get("amount", 0.0)
+    td.trade_time = str(get("trade_time") or "")
+    td.commission = get("commission", 0.0)
+
+
+def fill_position_data(message: trading_pb2.TradingCallbackMessage, data: Dict[str, Any]) -> None:
+    """填充持仓回调数据"""
+    get = data.get
+    pd = message.position_data
+    pd.SetInParent()
+    pd.stock_code = get("stock_code", "")
+    pd.stock_name = get("stock_name") or ""
+    pd.volume = get("volume", 0)
+    pd.available_volume = get("available_volume", 0)
+    pd.frozen_volume = get("frozen_volume", 0)
+    pd.cost_price = get("cost_price", 0.0)
+    pd.market_price = get("market_price", 0.0)
+    pd.market_value = get("market_value", 0.0)
+    pd.profit_loss = get("profit_loss", 0.0)
+
+
+def fill_asset_data(message: trading_pb2.TradingCallbackMessage, data: Dict[str, Any]) -> None:
+    """填充资产回调数据"""
+    get = data.get
+    ad = message.asset_data
+    ad.SetInParent()
+    ad.total_asset = get("total_asset", 0.0)
+    ad.market_value = get("market_value", 0.0)
+    ad.cash = get("cash", 0.0)
+    ad.frozen_cash = get("frozen_cash", 0.0)
+    ad.available_cash = get("available_cash", 0.0)
+
+
+def fill_error_data(message: trading_pb2.TradingCallbackMessage, data: Dict[str, Any]) -> None:
+    """填充下单/撤单失败回调数据"""
+    get = data.get
+    ed = message.error_data
+    ed.SetInParent()
+    ed.error_code = str(get("error_code", ""))
+    ed.error_msg = get("error_msg", "") or str(data)
+    ed.order_id = str(get("order_id") or "")
+
+
+def fill_async_order_data(message: trading_pb2.TradingCallbackMessage, data: Dict[str, Any]) -> None:
+    """填充异步下单回调数据"""
+    get = data.get
+    aod = message.async_order_data
+    aod.SetInParent()
+    aod.seq = get("seq", 0) or 0
+    aod.order_id = str(get("order_id") or "")
+    aod.error_msg = get("error_msg") or ""
+
+
+def fill_async_cancel_data(message: trading_pb2.TradingCallbackMessage, data: Dict[str, Any]) -> None:
+    """填充异步撤单回调数据"""
+    get = data.get
+    acd = message.async_cancel_data
+    acd.SetInParent()
+    acd.seq = get("seq", 0) or 0
+    acd.order_id = str(get("order_id") or "")
+    acd.error_msg = get("error_msg") or ""
+
+
+# 回调类型 -> 填充函数（无数据字段的类型不在表中）
+CALLBACK_FILLERS: Dict[int, Callable[[trading_pb2.TradingCallbackMessage, Dict[str, Any]], None]] = {
+    trading_pb2.CALLBACK_TYPE_ORDER: fill_order_data,
+    trading_pb2.CALLBACK_TYPE_TRADE: fill_trade_data,
+    trading_pb2.CALLBACK_TYPE_POSITION: fill_position_data,
+    trading_pb2.CALLBACK_TYPE_ASSET: fill_asset_data,
+    trading_pb2.CALLBACK_TYPE_ORDER_ERROR: fill_error_data,
+    trading_pb2.CALLBACK_TYPE_CANCEL_ERROR: fill_error_data,
+    trading_pb2.CALLBACK_TYPE_ASYNC_ORDER: fill_async_order_data,
+    trading_pb2.CALLBACK_TYPE_ASYNC_CANCEL: fill_async_cancel_data,
+}
@@ -1,7 +1,8 @@
 """
 gRPC 数据服务实现
 """
-from typing import Any
+import asyncio
+from typing import Any, AsyncIterator, Dict
 
 import grpc
 from google.protobuf import empty_pb2
@@ -15,6 +16,7 @@ from app.models.data_models import PeriodType
 # 导入现有服务
 from app.services.data_service import DataService
 from app.utils.exceptions import DataServiceException
+from app.utils.helpers import now_iso
 
 # 导入生成的 protobuf 代码
 from generated import common_pb2, data_pb2, data_pb2_grpc
@@ -1344,97 +1346,36 @@ class DataGrpcService(data_pb2_grpc.DataServiceServicer):
     
     # ==================== 阶段6: 行情订阅接口 ====================
     
-    def SubscribeQuote(
+    async def SubscribeQuote(
         self,
         request: data_pb2.SubscriptionRequest,
-        context: grpc.ServicerContext
-    ):
+        context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[data_pb2.QuoteUpdate]:
         """
         订阅行情（Server Streaming）
         
-        持续推送行情数据，直到客户端断开连接
+        持续推送行情数据，直到客户端断开连接；
+        运行在 grpc.aio 事件循环上，直接迭代订阅管理器的异步生成器
         """
-        import asyncio
-        from datetime import datetime
-
         from app.config import get_settings
         from app.dependencies import get_subscription_manager
         
+        # 验证股票代码列表
+        if not request.symbols:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("股票代码列表不能为空")
+            return
+        
         try:
-            settings = get_settings()
-            subscription_manager = get_subscription_manager(settings)
-            
-            # 检测当前线程是否已有事件循环
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                # 没有事件循环，创建新的
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                # 通知订阅管理器使用此事件循环
-                subscription_manager.set_event_loop(loop)
-            
-            # 验证股票代码列表
-            if not request.symbols or len(list(request.symbols)) == 0:
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details("股票代码列表不能为空")
-                return
+            subscription_manager = get_subscription_manager(get_settings())
+            # 行情回调需投递到消费队列所在的事件循环
+            subscription_manager.set_event_loop(asyncio.get_running_loop())
             
             # 创建订阅
             subscription_id = subscription_manager.subscribe_quote(
                 symbols=list(request.symbols),
                 adjust_type=request.adjust_type or "none"
             )
-            
-            # 记录订阅信息
-            context.set_code(grpc.StatusCode.OK)
-            
-            # 流式推送数据
-            async def stream_data():
-                try:
-                    async for quote_data in subscription_manager.stream_quotes(subscription_id):
-                        # 构造protobuf消息
-                        quote_update = data_pb2.QuoteUpdate(
-                            stock_code=quote_data.get('stock_code', ''),
-                            timestamp=quote_data.get('timestamp', datetime.now().isoformat()),
-                            last_price=quote_data.get('last_price', 0.0),
-                            open=quote_data.get('open', 0.0),
-                            high=quote_data.get('high', 0.0),
-                            low=quote_data.get('low', 0.0),
-                            close=quote_data.get('close', 0.0),
-                            volume=quote_data.get('volume', 0),
-                            amount=quote_data.get('amount', 0.0),
-                            pre_close=quote_data.get('pre_close', 0.0),
-                            bid_price=quote_data.get('bid_price', []),
-                            ask_price=quote_data.get('ask_price', []),
-                            bid_vol=quote_data.get('bid_vol', []),
-                            ask_vol=quote_data.get('ask_vol', [])
-                        )
-                        
-                        yield quote_update
-                        
-                        # 检查客户端是否断开
-                        if context.is_active() is False:
-                            break
-                
-                finally:
-                    # 清理订阅
-                    subscription_manager.unsubscribe(subscription_id)
-            
-            # 使用事件循环迭代异步生成器
-            try:
-                async_gen = stream_data()
-                while True:
-                    try:
-                        quote_update = loop.run_until_complete(async_gen.__anext__())
-                        yield quote_update
-                    except StopAsyncIteration:
-                        break
-            finally:
-                # 只在当前线程创建的循环时才关闭
-                if not loop.is_running():
-                    loop.close()
-        
         except DataServiceException as e:
             # 处理业务异常
             if e.error_code in ["EMPTY_SYMBOLS", "INVALID_SYMBOLS"]:
@@ -1447,87 +1388,79 @@ class DataGrpcService(data_pb2_grpc.DataServiceServicer):
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return
+        
+        async for quote_update in self._stream_quote_updates(subscription_manager, subscription_id, context):
+            yield quote_update
     
-    def SubscribeWholeQuote(
+    async def SubscribeWholeQuote(
         self,
         request: data_pb2.WholeQuoteRequest,
-        context: grpc.ServicerContext
-    ):
+        context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[data_pb2.QuoteUpdate]:
         """
         订阅全推行情（Server Streaming）
         """
-        import asyncio
-        from datetime import datetime
-
         from app.config import get_settings
         from app.dependencies import get_subscription_manager
         
         try:
-            settings = get_settings()
-            subscription_manager = get_subscription_manager(settings)
-            
-            # 检测当前线程是否已有事件循环
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                # 没有事件循环，创建新的
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                # 通知订阅管理器使用此事件循环
-                subscription_manager.set_event_loop(loop)
+            subscription_manager = get_subscription_manager(get_settings())
+            subscription_manager.set_event_loop(asyncio.get_running_loop())
             
             # 创建全推订阅
             subscription_id = subscription_manager.subscribe_whole_quote()
-            
-            context.set_code(grpc.StatusCode.OK)
-            
-            # 流式推送数据
-            async def stream_data():
-                try:
-                    async for quote_data in subscription_manager.stream_quotes(subscription_id):
-                        quote_update = data_pb2.QuoteUpdate(
-                            stock_code=quote_data.get('stock_code', ''),
-                            timestamp=quote_data.get('timestamp', datetime.now().isoformat()),
-                            last_price=quote_data.get('last_price', 0.0),
-                            open=quote_data.get('open', 0.0),
-                            high=quote_data.get('high', 0.0),
-                            low=quote_data.get('low', 0.0),
-                            close=quote_data.get('close', 0.0),
-                            volume=quote_data.get('volume', 0),
-                            amount=quote_data.get('amount', 0.0),
-                            pre_close=quote_data.get('pre_close', 0.0),
-                            bid_price=quote_data.get('bid_price', []),
-                            ask_price=quote_data.get('ask_price', []),
-                            bid_vol=quote_data.get('bid_vol', []),
-                            ask_vol=quote_data.get('ask_vol', [])
-                        )
-                        
-                        yield quote_update
-                        
-                        if context.is_active() is False:
-                            break
-                
-                finally:
-                    subscription_manager.unsubscribe(subscription_id)
-            
-            # 使用事件循环迭代异步生成器
-            try:
-                async_gen = stream_data()
-                while True:
-                    try:
-                        quote_update = loop.run_until_complete(async_gen.__anext__())
-                        yield quote_update
-                    except StopAsyncIteration:
-                        break
-            finally:
-                # 只在当前线程创建的循环时才关闭
-                if not loop.is_running():
-                    loop.close()
-        
         except Exception as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return
+        
+        async for quote_update in self._stream_quote_updates(subscription_manager, subscription_id, context):
+            yield quote_update
+    
+    async def _stream_quote_updates(
+        self,
+        subscription_manager: Any,
+        subscription_id: str,
+        context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[data_pb2.QuoteUpdate]:
+        """迭代订阅行情并转换为 QuoteUpdate，客户端断开或流结束时取消订阅"""
+        context_done = context.done
+        try:
+            async for quote_data in subscription_manager.stream_quotes(subscription_id):
+                # 检查客户端是否断开
+                if context_done():
+                    break
+                yield self._build_quote_update(quote_data)
+        except DataServiceException as e:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(str(e.message))
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+        finally:
+            # 清理订阅
+            subscription_manager.unsubscribe(subscription_id)
+    
+    @staticmethod
+    def _build_quote_update(quote_data: Dict[str, Any]) -> data_pb2.QuoteUpdate:
+        """构造行情推送消息"""
+        get = quote_data.get
+        return data_pb2.QuoteUpdate(
+            stock_code=get('stock_code', ''),
+            timestamp=get('timestamp') or now_iso(),
+            last_price=get('last_price', 0.0),
+            open=get('open', 0.0),
+            high=get('high', 0.0),
+            low=get('low', 0.0),
+            close=get('close', 0.0),
+            volume=get('volume', 0),
+            amount=get('amount', 0.0),
+            pre_close=get('pre_close', 0.0),
+            bid_price=get('bid_price', []),
+            ask_price=get('ask_price', []),
+            bid_vol=get('bid_vol', []),
+            ask_vol=get('ask_vol', [])
+        )
     
     def UnsubscribeQuote(
         self,
@@ -0,0 +1,78 @@
+"""
+gRPC 服务端拦截器
+"""
+import inspect
+import time
+
+import grpc
+
+from app.utils.logger import logger
+
+
+def _log_call(method: str, start: float):
+    """记录 RPC 调用耗时"""
+    logger.debug("gRPC 调用 {} 耗时 {:.2f}ms", method, (time.perf_counter() - start) * 1000)
+
+
+def _wrap_unary(behavior, method: str):
+    """包装一元调用处理函数（保持同步/异步形态不变）"""
+    if inspect.iscoroutinefunction(behavior):
+        async def async_wrapper(request, context):
+            start = time.perf_counter()
+            try:
+                return await behavior(request, context)
+            finally:
+                _log_call(method, start)
+        return async_wrapper
+
+    def wrapper(request, context):
+        start = time.perf_counter()
+        try:
+            return behavior(request, context)
+        finally:
+            _log_call(method, start)
+    return wrapper
+
+
+def _wrap_stream(behavior, method: str):
+    """包装流式响应处理函数（服务端流/双向流，保持同步/异步生成器形态不变）"""
+    if inspect.isasyncgenfunction(behavior):
+        async def async_wrapper(request, context):
+            start = time.perf_counter()
+            try:
+                async for response in behavior(request, context):
+                    yield response
+            finally:
+                _log_call(method, start)
+        return async_wrapper
+
+    def wrapper(request, context):
+        start = time.perf_counter()
+        try:
+            yield from behavior(request, context)
+        finally:
+            _log_call(method, start)
+    return wrapper
+
+
+class LoggingInterceptor(grpc.aio.ServerInterceptor):
+    """
+    调用日志拦截器
+
+    统一以 DEBUG 级别记录每个 RPC 的方法名与耗时，由服务器在日志级别为 DEBUG 时注册，
+    其他级别下不会包装处理函数
+    """
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+
+        method = handler_call_details.method
+        if handler.unary_unary is not None:
+            return handler._replace(unary_unary=_wrap_unary(handler.unary_unary, method))
+        if handler.unary_stream is not None:
+            return handler._replace(unary_stream=_wrap_stream(handler.unary_stream, method))
+        if handler.stream_stream is not None:
+            return handler._replace(stream_stream=_wrap_stream(handler.stream_stream, method))
+        return handler
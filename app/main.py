@@ -9,17 +9,25 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, applications
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 # 添加xtquant包到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from app.config import get_settings
+from app.middleware.auth import ApiKeyMiddleware
 from app.routers import data, health, trading, websocket
 from app.utils.exceptions import XTQuantException
 from app.utils.helpers import format_response
 from app.utils.logger import configure_logging, logger
 
+# 安装了 orjson 时使用 ORJSONResponse 作为默认响应类（序列化比标准库 json 快数倍），否则回退到 JSONResponse
+try:
+    import orjson  # noqa: F401
+    DefaultJSONResponse = ORJSONResponse
+except ImportError:
+    DefaultJSONResponse = JSONResponse
+
 
 def reset_api_docs(swagger_ui_version: str = "5", redoc_version: str = "2") -> None:
     """
@@ -99,6 +107,50 @@ async def lifespan(app: FastAPI):
         compression=settings.logging.compression,
     )
 
+    # 预先构建根路径与应用信息接口的数据（配置在进程内不可变，无需每次请求重新读取）
+    app.state.root_data = {
+        "app_name": settings.app.name,
+        "app_version": settings.app.version,
+        "xtquant_mode": settings.xtquant.mode.value,
+        "description": "基于xtquant的量化交易代理服务",
+        "docs_url": "/docs",
+        "redoc_url": "/redoc",
+    }
+    app.state.info_data = {
+        "name": settings.app.name,
+        "version": settings.app.version,
+        "debug": settings.app.debug,
+        "host": settings.app.host,
+        "port": settings.app.port,
+        "log_level": settings.logging.level,
+        "xtquant_mode": settings.xtquant.mode.value,
+        "allow_real_trading": settings.xtquant.trading.allow_real_trading,
+    }
+
+    # 按配置创建 run_sync 使用的 xtquant 专用线程池
+    from app.utils.async_utils import init_executor
+
+    init_executor(settings.thread_pool_max_workers)
+    logger.info(f"阻塞调用线程池已创建 (工作线程: {settings.thread_pool_max_workers})")
+
+    # 初始化参考数据响应缓存（Redis 不可用时自动降级为直接查询）
+    from app.utils.cache import close_cache, init_cache
+
+    await init_cache(settings.redis.url)
+
+    # 数据服务在启动时创建并挂载到 app.state，路由直接读取，无需每次请求解析依赖链
+    from app.dependencies import create_l2_batchers, get_data_service
+
+    app.state.data_service = get_data_service(settings)
+
+    # 行情查询请求合并：相同参数的并发请求共享一次 xtdata 调用
+    from app.utils.singleflight import SingleFlight
+
+    app.state.singleflight = SingleFlight()
+
+    # Level2 行情微批处理：同一时间窗口内的并发请求合并为一次 xtdata 调用
+    app.state.l2_batchers = create_l2_batchers(settings)
+
     # 初始化订阅管理器并设置事件循环
     import asyncio
 
@@ -135,6 +187,12 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"关闭异步线程池失败: {e}")
 
+    # 关闭响应缓存连接池
+    try:
+        await close_cache()
+    except Exception as e:
+        logger.error(f"关闭响应缓存失败: {e}")
+
     # 关闭订阅管理器
     try:
         subscription_manager = get_subscription_manager(settings)
@@ -153,15 +211,25 @@ async def lifespan(app: FastAPI):
 
 
 # 创建FastAPI应用
-app = FastAPI(title="xtquant-proxy", description="基于xtquant的量化交易代理服务", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="xtquant-proxy",
+    description="基于xtquant的量化交易代理服务",
+    version="1.0.0",
+    default_response_class=DefaultJSONResponse,
+    lifespan=lifespan,
+)
 
-# 添加CORS中间件
+# 添加API密钥校验中间件（先于CORS注册，使CORS位于外层：预检请求不受影响，401响应也带CORS头）
+app.add_middleware(ApiKeyMiddleware)
+
+# 添加CORS中间件（按运行模式读取 config.yml 中的 cors 配置，生产环境只放行明确的域名）
+cors_config = get_settings().cors
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # 生产环境中应该限制具体域名
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=cors_config.allow_origins,
+    allow_credentials=cors_config.allow_credentials,
+    allow_methods=cors_config.allow_methods,
+    allow_headers=cors_config.allow_headers,
 )
 
 reset_api_docs()
@@ -171,7 +239,7 @@ reset_api_docs()
 @app.exception_handler(XTQuantException)
 async def xtquant_exception_handler(request: Request, exc: XTQuantException):
     """处理xtquant相关异常"""
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=500, content=format_response(data=None, message=exc.message, success=False, code=500)
     )
 
@@ -179,7 +247,7 @@ async def xtquant_exception_handler(request: Request, exc: XTQuantException):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """处理HTTP异常"""
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=exc.status_code,
         content=format_response(data=None, message=str(exc.detail), success=False, code=exc.status_code),
     )
@@ -188,7 +256,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """处理通用异常"""
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=500,
         content=format_response(data=None, message=f"内部服务器错误: {str(exc)}", success=False, code=500),
     )
@@ -204,37 +272,14 @@ app.include_router(websocket.router)
 @app.get("/")
 async def root():
     """根路径"""
-    settings = get_settings()
-    return format_response(
-        data={
-            "app_name": settings.app.name,
-            "app_version": settings.app.version,
-            "xtquant_mode": settings.xtquant.mode.value,
-            "description": "基于xtquant的量化交易代理服务",
-            "docs_url": "/docs",
-            "redoc_url": "/redoc",
-        },
-        message="欢迎使用xtquant-proxy服务",
-    )
+    # 时间戳仍按请求生成，只复用启动时构建的数据
+    return format_response(data=app.state.root_data, message="欢迎使用xtquant-proxy服务")
 
 
 @app.get("/info")
 async def app_info():
     """应用信息"""
-    settings = get_settings()
-    return format_response(
-        data={
-            "name": settings.app.name,
-            "version": settings.app.version,
-            "debug": settings.app.debug,
-            "host": settings.app.host,
-            "port": settings.app.port,
-            "log_level": settings.logging.level,
-            "xtquant_mode": settings.xtquant.mode.value,
-            "allow_real_trading": settings.xtquant.trading.allow_real_trading,
-        },
-        message="应用信息获取成功",
-    )
+    return format_response(data=app.state.info_data, message="应用信息获取成功")
 
 
 if __name__ == "__main__":
@@ -250,4 +295,6 @@ if __name__ == "__main__":
         reload=False,  # 热加载已关闭
         reload_includes=None,  # 仅监控 .py 文件（当 reload=True 时）
         log_level=settings.logging.level.lower(),
+        loop=settings.uvicorn.loop,
+        http=settings.uvicorn.http,
     )
@@ -0,0 +1 @@
+# 中间件模块
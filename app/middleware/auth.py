@@ -0,0 +1,79 @@
+"""
+API 密钥校验中间件
+
+在路由匹配之前校验 API 密钥，校验失败直接返回 401，不再为每个接口注入认证依赖。
+实现为纯 ASGI 中间件（而非 BaseHTTPMiddleware），通过的请求不会被额外包装。
+"""
+import hashlib
+import hmac
+from typing import Optional, Sequence, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import get_settings
+from app.utils.helpers import format_response
+
+
+class ApiKeyMiddleware:
+    """
+    API 密钥校验中间件
+
+    仅校验路径以 protected_prefixes 开头的 HTTP 请求（健康检查、文档、WebSocket 不受影响）；
+    密钥取自 Authorization: Bearer <key>，或配置项 security.api_key_header 指定的请求头。
+    未配置 api_keys 时只要求携带密钥，与原 verify_api_key 依赖行为一致。
+    校验时用 hmac.compare_digest 将请求密钥的 SHA-256 摘要与每个配置密钥的摘要逐个比较，
+    不提前退出，耗时与密钥内容及匹配位置无关。
+    """
+
+    def __init__(self, app: ASGIApp, protected_prefixes: Tuple[str, ...] = ("/api/",)):
+        self.app = app
+        self.protected_prefixes = protected_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(self.protected_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        security = get_settings().security
+        api_key = _extract_api_key(scope, security.api_key_header.lower().encode("latin-1"))
+        if not api_key:
+            message = "API密钥缺失"
+        elif security.api_keys and not _is_valid_key(api_key, security.api_key_digests):
+            message = "无效的API密钥"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            status_code=401,
+            content=format_response(data=None, message=message, success=False, code=401),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        await response(scope, receive, send)
+
+
+def _is_valid_key(api_key: str, digests: Sequence[bytes]) -> bool:
+    """常量时间校验密钥：与全部配置摘要逐个比较后再返回结果"""
+    digest = hashlib.sha256(api_key.encode("utf-8")).digest()
+    matched = False
+    for expected in digests:
+        matched |= hmac.compare_digest(digest, expected)
+    return matched
+
+
+def _extract_api_key(scope: Scope, api_key_header: bytes) -> Optional[str]:
+    """从原始请求头中取出 API 密钥（Bearer 令牌优先）"""
+    header_key = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token.strip()
+        elif name == api_key_header:
+            header_key = value.decode("latin-1").strip()
+    return header_key
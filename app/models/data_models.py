@@ -2,7 +2,7 @@
 数据相关模型
 """
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -438,6 +438,26 @@ class SectorResetRequest(BaseModel):
     stock_list: List[str] = Field(..., description="新的股票列表")
 
 
+class SectorMutation(BaseModel):
+    """单个板块成分股修改操作"""
+    op: Literal["add", "remove", "reset"] = Field(..., description="操作类型：add-添加, remove-移除, reset-重置")
+    sector_name: str = Field(..., description="板块名称")
+    stock_list: List[str] = Field(..., description="股票列表")
+
+
+class SectorBatchMutateRequest(BaseModel):
+    """批量修改板块成分股请求"""
+    ops: List[SectorMutation] = Field(..., min_length=1, description="按顺序执行的操作列表")
+
+
+class SectorMutationResult(BaseModel):
+    """单个板块修改操作结果"""
+    op: str = Field(..., description="操作类型")
+    sector_name: str = Field(..., description="板块名称")
+    success: bool = Field(..., description="是否成功")
+    message: str = Field("", description="失败原因")
+
+
 # ==================== 阶段5: Level2数据接口模型 ====================
 
 class L2QuoteRequest(BaseModel):
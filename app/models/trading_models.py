@@ -3,9 +3,10 @@
 """
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from functools import cached_property
+from typing import Any, Dict, Optional, TypedDict
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AccountType(str, Enum):
@@ -74,24 +75,15 @@ class PositionInfo(BaseModel):
 
 class OrderRequest(BaseModel):
     """下单请求"""
+    # 请求模型构造后不再修改；数量/价格约束由 pydantic-core 校验，无需 Python 回调
+    model_config = ConfigDict(frozen=True)
+
     stock_code: str = Field(..., description="股票代码")
     side: OrderSide = Field(..., description="买卖方向")
     order_type: OrderType = Field(OrderType.LIMIT, description="订单类型")
-    volume: int = Field(..., description="数量")
-    price: Optional[float] = Field(None, description="价格")
+    volume: int = Field(..., gt=0, description="数量")
+    price: Optional[float] = Field(None, gt=0, description="价格")
     strategy_name: Optional[str] = Field(None, description="策略名称")
-    
-    @field_validator('volume')
-    def validate_volume(cls, v):
-        if v <= 0:
-            raise ValueError('数量必须大于0')
-        return v
-    
-    @field_validator('price')
-    def validate_price(cls, v):
-        if v is not None and v <= 0:
-            raise ValueError('价格必须大于0')
-        return v
 
 
 class OrderResponse(BaseModel):
@@ -108,9 +100,16 @@ class OrderResponse(BaseModel):
     filled_amount: float = 0.0
     average_price: Optional[float] = None
 
+    @cached_property
+    def submitted_time_iso(self) -> str:
+        """ISO 格式的提交时间（首次访问时格式化并缓存，不参与序列化）"""
+        return self.submitted_time.isoformat()
+
 
 class CancelOrderRequest(BaseModel):
     """撤单请求"""
+    model_config = ConfigDict(frozen=True)
+
     order_id: str = Field(..., description="订单ID")
 
 
@@ -126,6 +125,11 @@ class TradeInfo(BaseModel):
     trade_time: datetime
     commission: float
 
+    @cached_property
+    def trade_time_iso(self) -> str:
+        """ISO 格式的成交时间（首次访问时格式化并缓存，不参与序列化）"""
+        return self.trade_time.isoformat()
+
 
 class AssetInfo(BaseModel):
     """资产信息"""
@@ -156,6 +160,16 @@ class StrategyInfo(BaseModel):
     last_update_time: datetime
     parameters: Dict[str, Any]
 
+    @cached_property
+    def created_time_iso(self) -> str:
+        """ISO 格式的创建时间（首次访问时格式化并缓存，不参与序列化）"""
+        return self.created_time.isoformat()
+
+    @cached_property
+    def last_update_time_iso(self) -> str:
+        """ISO 格式的最后更新时间（首次访问时格式化并缓存，不参与序列化）"""
+        return self.last_update_time.isoformat()
+
 
 class ConnectRequest(BaseModel):
     """连接请求"""
@@ -176,25 +190,15 @@ class ConnectResponse(BaseModel):
 
 class AsyncOrderRequest(BaseModel):
     """异步下单请求"""
+    model_config = ConfigDict(frozen=True)
+
     stock_code: str = Field(..., description="股票代码")
     side: OrderSide = Field(..., description="买卖方向")
     order_type: OrderType = Field(OrderType.LIMIT, description="订单类型")
-    volume: int = Field(..., description="数量")
-    price: Optional[float] = Field(None, description="价格")
+    volume: int = Field(..., gt=0, description="数量")
+    price: Optional[float] = Field(None, gt=0, description="价格")
     strategy_name: Optional[str] = Field(None, description="策略名称")
 
-    @field_validator('volume')
-    def validate_volume(cls, v):
-        if v <= 0:
-            raise ValueError('数量必须大于0')
-        return v
-
-    @field_validator('price')
-    def validate_price(cls, v):
-        if v is not None and v <= 0:
-            raise ValueError('价格必须大于0')
-        return v
-
 
 class AsyncOrderResponse(BaseModel):
     """异步下单响应"""
@@ -209,6 +213,8 @@ class AsyncOrderResponse(BaseModel):
 
 class AsyncCancelRequest(BaseModel):
     """异步撤单请求"""
+    model_config = ConfigDict(frozen=True)
+
     order_id: Optional[str] = Field(None, description="订单ID（二选一）")
     order_sysid: Optional[str] = Field(None, description="柜台合同编号（二选一）")
 
@@ -240,6 +246,8 @@ class TradingCallbackType(str, Enum):
 
 class TradingCallback(BaseModel):
     """交易回调消息"""
+    model_config = ConfigDict(frozen=True)
+
     callback_type: TradingCallbackType
     account_id: str
     timestamp: datetime
@@ -249,6 +257,8 @@ class TradingCallback(BaseModel):
 
 class OrderCallback(BaseModel):
     """委托回报"""
+    model_config = ConfigDict(frozen=True)
+
     account_id: str
     order_id: str
     order_sysid: Optional[str] = None  # 柜台合同编号
@@ -267,6 +277,8 @@ class OrderCallback(BaseModel):
 
 class TradeCallback(BaseModel):
     """成交回报"""
+    model_config = ConfigDict(frozen=True)
+
     account_id: str
     trade_id: str
     order_id: str
@@ -283,6 +295,8 @@ class TradeCallback(BaseModel):
 
 class PositionCallback(BaseModel):
     """持仓变动回报"""
+    model_config = ConfigDict(frozen=True)
+
     account_id: str
     stock_code: str
     stock_name: Optional[str] = None
@@ -297,9 +311,82 @@ class PositionCallback(BaseModel):
 
 class AssetCallback(BaseModel):
     """资金变动回报"""
+    model_config = ConfigDict(frozen=True)
+
     account_id: str
     total_asset: float
     market_value: float
     cash: float
     frozen_cash: float
     available_cash: float
+
+
+# ==================== 交易回调载荷（内部热路径使用的 TypedDict） ====================
+# 与上方回调模型字段一一对应。xtquant 回调线程直接构造普通 dict，跳过 pydantic 校验与
+# model_dump，分发给 gRPC/WebSocket 订阅者；仅在 REST 边界需要校验时才使用 BaseModel
+
+class OrderCallbackDict(TypedDict):
+    """委托回报载荷"""
+    account_id: str
+    order_id: str
+    order_sysid: Optional[str]
+    stock_code: str
+    stock_name: Optional[str]
+    side: str
+    order_type: str
+    volume: int
+    price: float
+    status: str
+    status_msg: Optional[str]
+    filled_volume: int
+    filled_amount: float
+    order_time: Optional[datetime]
+
+
+class TradeCallbackDict(TypedDict):
+    """成交回报载荷"""
+    account_id: str
+    trade_id: str
+    order_id: str
+    order_sysid: Optional[str]
+    stock_code: str
+    stock_name: Optional[str]
+    side: str
+    volume: int
+    price: float
+    amount: float
+    trade_time: datetime
+    commission: float
+
+
+class PositionCallbackDict(TypedDict):
+    """持仓变动载荷"""
+    account_id: str
+    stock_code: str
+    stock_name: Optional[str]
+    volume: int
+    available_volume: int
+    frozen_volume: int
+    cost_price: float
+    market_price: float
+    market_value: float
+    profit_loss: float
+
+
+class AssetCallbackDict(TypedDict):
+    """资金变动载荷"""
+    account_id: str
+    total_asset: float
+    market_value: float
+    cash: float
+    frozen_cash: float
+    available_cash: float
+
+
+class TradingCallbackDict(TypedDict):
+    """分发给订阅者的回调消息（与 TradingCallback 字段对应，枚举与时间已转为字符串）"""
+    callback_type: str
+    account_id: str
+    timestamp: str
+    data: Dict[str, Any]
+    seq: Optional[int]
@@ -4,13 +4,15 @@
 所有路由使用 run_sync 将同步 xtdata 调用放入线程池执行，
 防止阻塞 FastAPI 事件循环导致服务卡死。
 """
-from datetime import datetime
-from typing import List
+import asyncio
+import functools
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from app.config import Settings, get_settings
-from app.dependencies import get_data_service, verify_api_key
+from app.config import get_request_timeouts
+from app.dependencies import get_app_data_service, get_app_subscription_manager, get_l2_batchers, get_singleflight
 from app.models.data_models import (  # 阶段2: 行情数据请求模型; 阶段3: 数据下载请求模型; 阶段5: Level2请求模型; 阶段6: 订阅请求模型
     DividFactorsRequest,
     DownloadFinancialDataBatchRequest,
@@ -33,229 +35,222 @@ from app.models.data_models import (  # 阶段2: 行情数据请求模型; 阶
     LocalDataRequest,
     MarketDataRequest,
     MarketDataResponse,
+    SectorAddRequest,
+    SectorBatchMutateRequest,
+    SectorCreateRequest,
+    SectorRemoveStockRequest,
     SectorRequest,
+    SectorResetRequest,
     SectorResponse,
     SubscriptionRequest,
+    SubscriptionType,
     TradingCalendarResponse,
 )
 from app.services.data_service import DataService
+from app.services.subscription_manager import SubscriptionManager
 from app.utils.async_utils import run_sync, run_sync_no_timeout
-from app.utils.exceptions import DataServiceException, handle_xtquant_exception
-from app.utils.helpers import format_response
+from app.utils.cache import TTL_DAY, TTL_HOUR, TTL_TEN_MINUTES, cached, exclusive, invalidate
+from app.utils.exceptions import ServiceErrorHandler
+from app.utils.helpers import (
+    etag_response,
+    format_response,
+    json_response,
+    model_response,
+    now_iso,
+    stream_json_response,
+)
 from app.utils.logger import logger
+from app.utils.batcher import Batcher
+from app.utils.singleflight import SingleFlight, TTLSingleFlight, make_key
 
 router = APIRouter(prefix="/api/v1/data", tags=["数据服务"])
 
+# 请求超时表（配置在进程内不可变，导入时读取一次）
+_TIMEOUTS = get_request_timeouts()
+
+# 板块列表缓存键（板块增删改接口会使其失效）
+SECTORS_CACHE_KEY = "data:sectors"
+
+# 进程内板块索引：(过期时间, 板块名 -> 板块数据)，供按名称查询板块时 O(1) 查找
+_sector_index: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+
+# 订阅列表/订阅信息查询的短时缓存（秒级以下），合并高频轮询；创建或取消订阅时移除相关键
+_subscription_cache = TTLSingleFlight(ttl=0.3)
+_SUBSCRIPTIONS_KEY = "subscriptions"
+
+
+def _subscription_key(subscription_id: str) -> str:
+    """订阅信息的缓存键"""
+    return f"subscription:{subscription_id}"
+
+
+def _forget_subscription(subscription_id: str):
+    """移除订阅列表与指定订阅信息的缓存，不影响其他订阅的缓存"""
+    _subscription_cache.forget(_SUBSCRIPTIONS_KEY)
+    _subscription_cache.forget(_subscription_key(subscription_id))
+
+
+async def _load_sectors(data_service: DataService) -> List[Any]:
+    """获取板块列表（经响应缓存，命中 Redis 时元素为 dict）"""
+    return await cached(SECTORS_CACHE_KEY, TTL_HOUR, lambda: run_sync(
+        data_service.get_sector_list,
+        timeout=_TIMEOUTS["default"]
+    ))
+
+
+async def _get_sector_index(data_service: DataService) -> Dict[str, Dict[str, Any]]:
+    """获取按板块名索引的板块数据（过期后重新加载）"""
+    global _sector_index
+
+    entry = _sector_index
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+
+    index: Dict[str, Dict[str, Any]] = {}
+    for sector in await _load_sectors(data_service):
+        data = sector if isinstance(sector, dict) else sector.model_dump()
+        index.setdefault(data["sector_name"], data)
+    _sector_index = (time.monotonic() + TTL_TEN_MINUTES, index)
+    return index
+
+
+async def _invalidate_sectors():
+    """板块被修改后清除板块列表缓存与进程内索引"""
+    global _sector_index
+    _sector_index = None
+    await invalidate(SECTORS_CACHE_KEY)
+
 
 @router.post("/market", response_model=List[MarketDataResponse])
 async def get_market_data(
     request: MarketDataRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service),
+    singleflight: SingleFlight = Depends(get_singleflight)
 ) -> List[MarketDataResponse]:
     """获取市场数据"""
-    try:
-        results = await run_sync(
-            data_service.get_market_data, request,
-            timeout=settings.request_timeout.market_data
-        )
-        return results
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取市场数据失败: {str(e)}"}
+    with ServiceErrorHandler("获取市场数据失败"):
+        results = await singleflight.do(
+            make_key("market", request),
+            lambda: run_sync(
+                data_service.get_market_data, request,
+                timeout=_TIMEOUTS["market_data"]
+            )
         )
+        return model_response(results)
 
 
 @router.post("/financial", response_model=List[FinancialDataResponse])
 async def get_financial_data(
     request: FinancialDataRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 )-> List[FinancialDataResponse]:
     """获取财务数据"""
-    try:
+    with ServiceErrorHandler("获取财务数据失败"):
         results = await run_sync(
             data_service.get_financial_data, request,
-            timeout=settings.request_timeout.financial_data
-        )
-        return results
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取财务数据失败: {str(e)}"}
+            timeout=_TIMEOUTS["financial_data"]
         )
+        return model_response(results)
 
 
 @router.get("/sectors", response_model=List[SectorResponse])
 async def get_sector_list(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ) -> List[SectorResponse]:
     """获取板块列表"""
-    try:
-        results = await run_sync(
-            data_service.get_sector_list,
-            timeout=settings.request_timeout.default
-        )
-        return results
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取板块列表失败: {str(e)}"}
-        )
+    with ServiceErrorHandler("获取板块列表失败"):
+        results = await _load_sectors(data_service)
+        return model_response(results)
 
 
 @router.post("/sector")
 async def get_sector_stocks(
     request: SectorRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取板块内股票列表"""
-    try:
-        # 调用 get_sector_list 获取所有板块，或实现单独的 get_sector_stocks 方法
-        # 这里先使用 get_sector_list 并过滤
-        all_sectors = await run_sync(
-            data_service.get_sector_list,
-            timeout=settings.request_timeout.default
-        )
-
-        # 查找匹配的板块
-        for sector in all_sectors:
-            if sector.sector_name == request.sector_name:
-                return format_response(
-                    data=sector.dict(),
-                    message="获取板块股票列表成功"
-                )
+    with ServiceErrorHandler("获取板块股票列表失败"):
+        # 基于 get_sector_list 的结果建立板块名索引后查找
+        sectors_by_name = await _get_sector_index(data_service)
+
+        sector = sectors_by_name.get(request.sector_name)
+        if sector is not None:
+            return format_response(
+                data=sector,
+                message="获取板块股票列表成功"
+            )
 
         # 未找到板块
         return format_response(
             data={"sector_name": request.sector_name, "stock_list": []},
             message=f"未找到板块: {request.sector_name}"
         )
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取板块股票列表失败: {str(e)}"}
-        )
 
 
 @router.post("/index-weight", response_model=IndexWeightResponse)
 async def get_index_weight(
     request: IndexWeightRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取指数权重"""
-    try:
+    with ServiceErrorHandler("获取指数权重失败"):
         result = await run_sync(
             data_service.get_index_weight, request,
-            timeout=settings.request_timeout.default
-        )
-        return result
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取指数权重失败: {str(e)}"}
+            timeout=_TIMEOUTS["default"]
         )
+        return model_response(result)
 
 
 @router.get("/trading-calendar/{year}", response_model=TradingCalendarResponse)
 async def get_trading_calendar(
     year: int,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取交易日历"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取交易日历失败"):
+        result = await cached(f"data:calendar:{year}", TTL_DAY, lambda: run_sync(
             data_service.get_trading_calendar, year,
-            timeout=settings.request_timeout.default
-        )
-        return result
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取交易日历失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
+        return etag_response(request, result)
 
 
 @router.get("/instrument/{stock_code}", response_model=InstrumentInfo)
 async def get_instrument_info(
     stock_code: str,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取合约信息"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取合约信息失败"):
+        result = await cached(f"data:instrument:{stock_code}", TTL_TEN_MINUTES, lambda: run_sync(
             data_service.get_instrument_info, stock_code,
-            timeout=settings.request_timeout.default
-        )
-        return result
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取合约信息失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
+        return model_response(result)
+
+
+@functools.lru_cache(maxsize=4096)
+def _etf_info(etf_code: str) -> ETFInfoResponse:
+    """ETF信息（目前仅由代码决定的静态数据，按代码缓存，不再每次请求构建模型）"""
+    return ETFInfoResponse(
+        etf_code=etf_code,
+        etf_name=f"ETF{etf_code}",
+        underlying_asset="沪深300",
+        creation_unit=1000000,
+        redemption_unit=1000000
+    )
 
 
 @router.get("/etf/{etf_code}", response_model=ETFInfoResponse)
 async def get_etf_info(
     etf_code: str,
-    api_key: str = Depends(verify_api_key)
+    request: Request
 ):
     """获取ETF信息"""
-    try:
+    with ServiceErrorHandler("获取ETF信息失败"):
         # 这里可以添加获取ETF信息的逻辑
-        return ETFInfoResponse(
-            etf_code=etf_code,
-            etf_name=f"ETF{etf_code}",
-            underlying_asset="沪深300",
-            creation_unit=1000000,
-            redemption_unit=1000000
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取ETF信息失败: {str(e)}"}
-        )
+        return etag_response(request, _etf_info(etf_code))
 
 
 # ==================== 阶段1: 基础信息接口 ====================
@@ -263,134 +258,85 @@ async def get_etf_info(
 @router.get("/instrument-type/{stock_code}")
 async def get_instrument_type(
     stock_code: str,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取合约类型"""
-    try:
+    with ServiceErrorHandler("获取合约类型失败"):
         result = await run_sync(
             data_service.get_instrument_type, stock_code,
-            timeout=settings.request_timeout.default
+            timeout=_TIMEOUTS["default"]
         )
         return format_response(data=result, message="获取合约类型成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取合约类型失败: {str(e)}"}
-        )
 
 
 @router.get("/holidays")
 async def get_holidays(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取节假日列表"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取节假日列表失败"):
+        result = await cached("data:holidays", TTL_DAY, lambda: run_sync(
             data_service.get_holidays,
-            timeout=settings.request_timeout.default
-        )
-        return format_response(data=result, message="获取节假日列表成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取节假日列表失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
+        return etag_response(request, result, message="获取节假日列表成功")
 
 
 @router.get("/convertible-bonds")
 async def get_cb_info(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取可转债信息"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取可转债信息失败"):
+        result = await cached("data:cb_info", TTL_HOUR, lambda: run_sync(
             data_service.get_cb_info,
-            timeout=settings.request_timeout.default
-        )
-        return format_response(data=result, message="获取可转债信息成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取可转债信息失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
+        return etag_response(request, result, message="获取可转债信息成功")
 
 
 @router.get("/ipo-info")
 async def get_ipo_info(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取新股申购信息"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取新股申购信息失败"):
+        result = await cached("data:ipo_info", TTL_HOUR, lambda: run_sync(
             data_service.get_ipo_info,
-            timeout=settings.request_timeout.default
-        )
-        return format_response(data=result, message="获取新股申购信息成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取新股申购信息失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
+        return etag_response(request, result, message="获取新股申购信息成功")
 
 
 @router.get("/period-list")
 async def get_period_list(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取可用周期列表"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取可用周期列表失败"):
+        result = await cached("data:period_list", TTL_DAY, lambda: run_sync(
             data_service.get_period_list,
-            timeout=settings.request_timeout.default
-        )
-        return format_response(data=result, message="获取可用周期列表成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取可用周期列表失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
+        return etag_response(request, result, message="获取可用周期列表成功")
 
 
 @router.get("/data-dir")
 async def get_data_dir(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取本地数据路径"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取数据路径失败"):
+        result = await cached("data:data_dir", TTL_DAY, lambda: run_sync(
             data_service.get_data_dir,
-            timeout=settings.request_timeout.default
-        )
-        return format_response(data=result, message="获取数据路径成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取数据路径失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
+        return etag_response(request, result, message="获取数据路径成功")
 
 
 # ==================== 阶段2: 行情数据获取接口 ====================
@@ -398,323 +344,241 @@ async def get_data_dir(
 @router.post("/local-data")
 async def get_local_data(
     request: LocalDataRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取本地行情数据"""
-    try:
+    with ServiceErrorHandler("获取本地行情数据失败"):
         result = await run_sync(
             data_service.get_local_data, request,
-            timeout=settings.request_timeout.market_data
+            timeout=_TIMEOUTS["market_data"]
         )
         return format_response(data=result, message="获取本地行情数据成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取本地行情数据失败: {str(e)}"}
-        )
 
 
 @router.post("/full-tick")
 async def get_full_tick(
     request: FullTickRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service),
+    singleflight: SingleFlight = Depends(get_singleflight)
 ):
     """获取完整tick数据"""
-    try:
-        result = await run_sync(
-            data_service.get_full_tick, request,
-            timeout=settings.request_timeout.market_data
-        )
-        return format_response(data=result, message="获取完整tick数据成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取完整tick数据失败: {str(e)}"}
+    with ServiceErrorHandler("获取完整tick数据失败"):
+        result = await singleflight.do(
+            make_key("full_tick", request),
+            lambda: run_sync(
+                data_service.get_full_tick, request,
+                timeout=_TIMEOUTS["market_data"]
+            )
         )
+        return json_response(data=result, message="获取完整tick数据成功")
 
 
 @router.post("/divid-factors")
 async def get_divid_factors(
     request: DividFactorsRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """获取除权除息数据"""
-    try:
+    with ServiceErrorHandler("获取除权除息数据失败"):
         result = await run_sync(
             data_service.get_divid_factors, request.stock_code,
-            timeout=settings.request_timeout.default
+            timeout=_TIMEOUTS["default"]
         )
         return format_response(data=result, message="获取除权除息数据成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取除权除息数据失败: {str(e)}"}
-        )
 
 
 @router.post("/full-kline")
 async def get_full_kline(
     request: FullKlineRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service),
+    singleflight: SingleFlight = Depends(get_singleflight)
 ):
     """获取完整K线数据（带复权信息）"""
-    try:
-        result = await run_sync(
-            data_service.get_full_kline, request,
-            timeout=settings.request_timeout.market_data
-        )
-        return format_response(data=result, message="获取完整K线数据成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取完整K线数据失败: {str(e)}"}
+    with ServiceErrorHandler("获取完整K线数据失败"):
+        result = await singleflight.do(
+            make_key("full_kline", request),
+            lambda: run_sync(
+                data_service.get_full_kline, request,
+                timeout=_TIMEOUTS["market_data"]
+            )
         )
+        return stream_json_response(result, message="获取完整K线数据成功")
 
 
 # ==================== 阶段3: 数据下载接口 ====================
 # 下载接口使用较长超时或无超时，因为下载操作可能需要较长时间
+# 板块/可转债/ETF/节假日/历史合约下载与调用方无关，同一时间只执行一次，并发触发直接返回"进行中"
+
+# 下载互斥锁过期时间（秒），持有者异常退出时锁最迟在此时间后释放
+DOWNLOAD_LOCK_TTL = TTL_HOUR
+
+# 同时执行的下载任务数上限：下载占用线程池线程与 xtdata 连接的时间很长（批量下载无超时），
+# 超出的请求在事件循环中排队，避免占满线程池阻塞行情、交易等其他接口
+DOWNLOAD_CONCURRENCY = 4
+_DOWNLOAD_SEM = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
 
 @router.post("/download/history-data")
 async def download_history_data(
     request: DownloadHistoryDataRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载单只股票历史数据"""
-    try:
-        result = await run_sync(
-            data_service.download_history_data,
-            request.stock_code, request.period, request.start_time,
-            request.end_time, request.incrementally,
-            timeout=settings.request_timeout.download
-        )
+    with ServiceErrorHandler("下载历史数据失败"):
+        async with _DOWNLOAD_SEM:
+            result = await run_sync(
+                data_service.download_history_data,
+                request.stock_code, request.period, request.start_time,
+                request.end_time, request.incrementally,
+                timeout=_TIMEOUTS["download"]
+            )
         return format_response(data=result, message="下载历史数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载历史数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/history-data-batch")
 async def download_history_data_batch(
     request: DownloadHistoryDataBatchRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """批量下载历史数据（无超时，可能需要很长时间）"""
-    try:
+    with ServiceErrorHandler("批量下载历史数据失败"):
         # 批量下载使用无超时模式
-        result = await run_sync_no_timeout(
-            data_service.download_history_data_batch,
-            request.stock_list, request.period, request.start_time, request.end_time
-        )
+        async with _DOWNLOAD_SEM:
+            result = await run_sync_no_timeout(
+                data_service.download_history_data_batch,
+                request.stock_list, request.period, request.start_time, request.end_time
+            )
         return format_response(data=result, message="批量下载历史数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"批量下载历史数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/financial-data")
 async def download_financial_data(
     request: DownloadFinancialDataRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载财务数据"""
-    try:
+    with ServiceErrorHandler("下载财务数据失败"):
         # 直接传入请求模型给服务层
-        result = await run_sync(
-            data_service.download_financial_data, request,
-            timeout=settings.request_timeout.download
-        )
+        async with _DOWNLOAD_SEM:
+            result = await run_sync(
+                data_service.download_financial_data, request,
+                timeout=_TIMEOUTS["download"]
+            )
         return format_response(data=result, message="下载财务数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载财务数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/financial-data-batch")
 async def download_financial_data_batch(
     request: DownloadFinancialDataBatchRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """批量下载财务数据（带回调）"""
-    try:
-        result = await run_sync_no_timeout(
-            data_service.download_financial_data_batch, request
-        )
+    with ServiceErrorHandler("批量下载财务数据失败"):
+        async with _DOWNLOAD_SEM:
+            result = await run_sync_no_timeout(
+                data_service.download_financial_data_batch, request
+            )
         return format_response(data=result, message="批量下载财务数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"批量下载财务数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/sector-data")
 async def download_sector_data(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载板块数据"""
-    try:
-        result = await run_sync(
-            data_service.download_sector_data,
-            timeout=settings.request_timeout.download
-        )
+    with ServiceErrorHandler("下载板块数据失败"):
+        async with exclusive("download:sector-data", DOWNLOAD_LOCK_TTL) as acquired:
+            if not acquired:
+                return format_response(data={"status": "in_progress"}, message="下载任务已在进行")
+            async with _DOWNLOAD_SEM:
+                result = await run_sync(
+                    data_service.download_sector_data,
+                    timeout=_TIMEOUTS["download"]
+                )
         return format_response(data=result, message="下载板块数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载板块数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/index-weight")
 async def download_index_weight(
     request: DownloadIndexWeightRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载指数权重数据"""
-    try:
-        result = await run_sync(
-            data_service.download_index_weight, request,
-            timeout=settings.request_timeout.download
-        )
+    with ServiceErrorHandler("下载指数权重数据失败"):
+        async with _DOWNLOAD_SEM:
+            result = await run_sync(
+                data_service.download_index_weight, request,
+                timeout=_TIMEOUTS["download"]
+            )
         return format_response(data=result, message="下载指数权重数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载指数权重数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/cb-data")
 async def download_cb_data(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载可转债数据"""
-    try:
-        result = await run_sync(
-            data_service.download_cb_data,
-            timeout=settings.request_timeout.download
-        )
+    with ServiceErrorHandler("下载可转债数据失败"):
+        async with exclusive("download:cb-data", DOWNLOAD_LOCK_TTL) as acquired:
+            if not acquired:
+                return format_response(data={"status": "in_progress"}, message="下载任务已在进行")
+            async with _DOWNLOAD_SEM:
+                result = await run_sync(
+                    data_service.download_cb_data,
+                    timeout=_TIMEOUTS["download"]
+                )
         return format_response(data=result, message="下载可转债数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载可转债数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/etf-info")
 async def download_etf_info(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载ETF基础信息"""
-    try:
-        result = await run_sync(
-            data_service.download_etf_info,
-            timeout=settings.request_timeout.download
-        )
+    with ServiceErrorHandler("下载ETF信息失败"):
+        async with exclusive("download:etf-info", DOWNLOAD_LOCK_TTL) as acquired:
+            if not acquired:
+                return format_response(data={"status": "in_progress"}, message="下载任务已在进行")
+            async with _DOWNLOAD_SEM:
+                result = await run_sync(
+                    data_service.download_etf_info,
+                    timeout=_TIMEOUTS["download"]
+                )
         return format_response(data=result, message="下载ETF信息任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载ETF信息失败: {str(e)}"}
-        )
 
 
 @router.post("/download/holiday-data")
 async def download_holiday_data(
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载节假日数据"""
-    try:
-        result = await run_sync(
-            data_service.download_holiday_data,
-            timeout=settings.request_timeout.download
-        )
+    with ServiceErrorHandler("下载节假日数据失败"):
+        async with exclusive("download:holiday-data", DOWNLOAD_LOCK_TTL) as acquired:
+            if not acquired:
+                return format_response(data={"status": "in_progress"}, message="下载任务已在进行")
+            async with _DOWNLOAD_SEM:
+                result = await run_sync(
+                    data_service.download_holiday_data,
+                    timeout=_TIMEOUTS["download"]
+                )
         return format_response(data=result, message="下载节假日数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载节假日数据失败: {str(e)}"}
-        )
 
 
 @router.post("/download/history-contracts")
 async def download_history_contracts(
     request: DownloadHistoryContractsRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """下载历史合约数据"""
-    try:
-        result = await run_sync(
-            data_service.download_history_contracts, request,
-            timeout=settings.request_timeout.download
-        )
+    with ServiceErrorHandler("下载历史合约数据失败"):
+        async with exclusive(f"download:history-contracts:{request.market or ''}", DOWNLOAD_LOCK_TTL) as acquired:
+            if not acquired:
+                return format_response(data={"status": "in_progress"}, message="下载任务已在进行")
+            async with _DOWNLOAD_SEM:
+                result = await run_sync(
+                    data_service.download_history_contracts, request,
+                    timeout=_TIMEOUTS["download"]
+                )
         return format_response(data=result, message="下载历史合约数据任务已提交")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"下载历史合约数据失败: {str(e)}"}
-        )
 
 
 # ==================== 阶段4: 板块管理接口 ====================
@@ -723,148 +587,105 @@ async def download_history_contracts(
 async def create_sector_folder(
     parent_node: str = "",
     folder_name: str = "",
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """创建板块文件夹"""
-    try:
+    with ServiceErrorHandler("创建板块文件夹失败"):
         result = await run_sync(
             data_service.create_sector_folder, parent_node, folder_name,
-            timeout=settings.request_timeout.default
+            timeout=_TIMEOUTS["default"]
         )
         return format_response(data={"created_name": result}, message="创建板块文件夹成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"创建板块文件夹失败: {str(e)}"}
-        )
 
 
 @router.post("/sector/create")
 async def create_sector(
-    request: dict,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: SectorCreateRequest,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """创建板块"""
-    try:
-        parent_node = request.get("parent_node", "")
-        sector_name = request.get("sector_name", "")
-        overwrite = request.get("overwrite", True)
+    with ServiceErrorHandler("创建板块失败"):
         result = await run_sync(
-            data_service.create_sector, parent_node, sector_name, overwrite,
-            timeout=settings.request_timeout.default
+            data_service.create_sector, request.parent_node, request.sector_name, request.overwrite,
+            timeout=_TIMEOUTS["default"]
         )
+        await _invalidate_sectors()
         return format_response(data={"created_name": result}, message="创建板块成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"创建板块失败: {str(e)}"}
-        )
 
 
 @router.post("/sector/add-stocks")
 async def add_sector(
-    request: dict,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: SectorAddRequest,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """添加股票到板块"""
-    try:
-        sector_name = request.get("sector_name", "")
-        stock_list = request.get("stock_list", [])
+    with ServiceErrorHandler("添加股票到板块失败"):
         await run_sync(
-            data_service.add_sector, sector_name, stock_list,
-            timeout=settings.request_timeout.default
+            data_service.add_sector, request.sector_name, request.stock_list,
+            timeout=_TIMEOUTS["default"]
         )
+        await _invalidate_sectors()
         return format_response(data=None, message="添加股票到板块成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"添加股票到板块失败: {str(e)}"}
-        )
 
 
 @router.post("/sector/remove-stocks")
 async def remove_stock_from_sector(
-    request: dict,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: SectorRemoveStockRequest,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """从板块移除股票"""
-    try:
-        sector_name = request.get("sector_name", "")
-        stock_list = request.get("stock_list", [])
+    with ServiceErrorHandler("从板块移除股票失败"):
         await run_sync(
-            data_service.remove_stock_from_sector, sector_name, stock_list,
-            timeout=settings.request_timeout.default
+            data_service.remove_stock_from_sector, request.sector_name, request.stock_list,
+            timeout=_TIMEOUTS["default"]
         )
+        await _invalidate_sectors()
         return format_response(data=None, message="从板块移除股票成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"从板块移除股票失败: {str(e)}"}
-        )
 
 
 @router.post("/sector/remove")
 async def remove_sector(
     sector_name: str,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """删除板块"""
-    try:
+    with ServiceErrorHandler("删除板块失败"):
         await run_sync(
             data_service.remove_sector, sector_name,
-            timeout=settings.request_timeout.default
+            timeout=_TIMEOUTS["default"]
         )
+        await _invalidate_sectors()
         return format_response(data=None, message="删除板块成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"删除板块失败: {str(e)}"}
-        )
 
 
 @router.post("/sector/reset")
 async def reset_sector(
-    request: dict,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    request: SectorResetRequest,
+    data_service: DataService = Depends(get_app_data_service)
 ):
     """重置板块成分股"""
-    try:
-        sector_name = request.get("sector_name", "")
-        stock_list = request.get("stock_list", [])
+    with ServiceErrorHandler("重置板块成分股失败"):
         await run_sync(
-            data_service.reset_sector, sector_name, stock_list,
-            timeout=settings.request_timeout.default
+            data_service.reset_sector, request.sector_name, request.stock_list,
+            timeout=_TIMEOUTS["default"]
         )
+        await _invalidate_sectors()
         return format_response(data=None, message="重置板块成分股成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"重置板块成分股失败: {str(e)}"}
+
+
+@router.post("/sector/batch-mutate")
+async def batch_mutate_sectors(
+    request: SectorBatchMutateRequest,
+    data_service: DataService = Depends(get_app_data_service)
+):
+    """批量修改板块成分股（多个添加/移除/重置操作合并为一次线程池调用）"""
+    with ServiceErrorHandler("批量修改板块失败"):
+        result = await run_sync(
+            data_service.batch_mutate_sectors, request.ops,
+            timeout=_TIMEOUTS["default"]
         )
+        await _invalidate_sectors()
+        return format_response(data=result, message="批量修改板块完成")
 
 
 # ==================== 阶段5: Level2数据接口 ====================
@@ -872,70 +693,46 @@ async def reset_sector(
 @router.post("/l2/quote")
 async def get_l2_quote(
     request: L2QuoteRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    singleflight: SingleFlight = Depends(get_singleflight),
+    batchers: Dict[str, Batcher] = Depends(get_l2_batchers)
 ):
     """获取Level2快照数据（10档行情）"""
-    try:
-        result = await run_sync(
-            data_service.get_l2_quote, request.stock_codes,
-            timeout=settings.request_timeout.market_data
-        )
-        return format_response(data=result, message="获取Level2快照数据成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取Level2快照数据失败: {str(e)}"}
+    with ServiceErrorHandler("获取Level2快照数据失败"):
+        result = await singleflight.do(
+            make_key("l2_quote", request),
+            lambda: batchers["get_l2_quote"].submit(request.stock_codes)
         )
+        return json_response(data=result, message="获取Level2快照数据成功")
 
 
 @router.post("/l2/order")
 async def get_l2_order(
     request: L2OrderRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    singleflight: SingleFlight = Depends(get_singleflight),
+    batchers: Dict[str, Batcher] = Depends(get_l2_batchers)
 ):
     """获取Level2逐笔委托数据"""
-    try:
-        result = await run_sync(
-            data_service.get_l2_order, request.stock_codes,
-            timeout=settings.request_timeout.market_data
-        )
-        return format_response(data=result, message="获取Level2逐笔委托数据成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取Level2逐笔委托数据失败: {str(e)}"}
+    with ServiceErrorHandler("获取Level2逐笔委托数据失败"):
+        result = await singleflight.do(
+            make_key("l2_order", request),
+            lambda: batchers["get_l2_order"].submit(request.stock_codes)
         )
+        return json_response(data=result, message="获取Level2逐笔委托数据成功")
 
 
 @router.post("/l2/transaction")
 async def get_l2_transaction(
     request: L2TransactionRequest,
-    api_key: str = Depends(verify_api_key),
-    data_service: DataService = Depends(get_data_service),
-    settings: Settings = Depends(get_settings)
+    singleflight: SingleFlight = Depends(get_singleflight),
+    batchers: Dict[str, Batcher] = Depends(get_l2_batchers)
 ):
     """获取Level2逐笔成交数据"""
-    try:
-        result = await run_sync(
-            data_service.get_l2_transaction, request.stock_codes,
-            timeout=settings.request_timeout.market_data
-        )
-        return format_response(data=result, message="获取Level2逐笔成交数据成功")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取Level2逐笔成交数据失败: {str(e)}"}
+    with ServiceErrorHandler("获取Level2逐笔成交数据失败"):
+        result = await singleflight.do(
+            make_key("l2_transaction", request),
+            lambda: batchers["get_l2_transaction"].submit(request.stock_codes)
         )
+        return json_response(data=result, message="获取Level2逐笔成交数据成功")
 
 
 # ==================== 阶段6: 行情订阅接口 ====================
@@ -943,8 +740,7 @@ async def get_l2_transaction(
 @router.post("/subscription", response_model=dict)
 async def create_subscription(
     request: SubscriptionRequest,
-    api_key: str = Depends(verify_api_key),
-    settings: Settings = Depends(get_settings)
+    subscription_manager: SubscriptionManager = Depends(get_app_subscription_manager)
 ):
     """
     创建行情订阅
@@ -955,18 +751,12 @@ async def create_subscription(
     Returns:
         订阅响应（包含subscription_id）
     """
-    try:
-        from app.dependencies import get_subscription_manager
-        from app.models.data_models import SubscriptionType
-
-        # 获取订阅管理器
-        subscription_manager = get_subscription_manager(settings)
-
+    with ServiceErrorHandler("创建订阅失败"):
         # 根据订阅类型创建订阅（订阅操作在线程池中执行）
         if request.subscription_type == SubscriptionType.WHOLE_QUOTE:
             subscription_id = await run_sync(
                 subscription_manager.subscribe_whole_quote,
-                timeout=settings.request_timeout.subscription
+                timeout=_TIMEOUTS["subscription"]
             )
         else:
             subscription_id = await run_sync(
@@ -975,14 +765,15 @@ async def create_subscription(
                 period=request.period.value,
                 start_date=request.start_date,
                 adjust_type=request.adjust_type,
-                timeout=settings.request_timeout.subscription
+                timeout=_TIMEOUTS["subscription"]
             )
+        _forget_subscription(subscription_id)
 
         # 构造响应
         response = {
             "subscription_id": subscription_id,
             "status": "active",
-            "created_at": datetime.now().isoformat(),
+            "created_at": now_iso(),
             "symbols": request.symbols if request.subscription_type == SubscriptionType.QUOTE else ["*"],
             "period": request.period.value,
             "start_date": request.start_date,
@@ -994,23 +785,11 @@ async def create_subscription(
         logger.info(f"创建订阅成功: {subscription_id}")
         return response
 
-    except DataServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"创建订阅失败: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"创建订阅失败: {str(e)}"}
-        )
-
 
 @router.delete("/subscription/{subscription_id}")
 async def delete_subscription(
     subscription_id: str,
-    api_key: str = Depends(verify_api_key),
-    settings: Settings = Depends(get_settings)
+    subscription_manager: SubscriptionManager = Depends(get_app_subscription_manager)
 ):
     """
     取消订阅
@@ -1021,17 +800,13 @@ async def delete_subscription(
     Returns:
         取消结果
     """
-    try:
-        from app.dependencies import get_subscription_manager
-
-        # 获取订阅管理器
-        subscription_manager = get_subscription_manager(settings)
-
+    with ServiceErrorHandler("取消订阅失败"):
         # 取消订阅
         success = await run_sync(
             subscription_manager.unsubscribe, subscription_id,
-            timeout=settings.request_timeout.default
+            timeout=_TIMEOUTS["default"]
         )
+        _forget_subscription(subscription_id)
 
         logger.info(f"取消订阅: {subscription_id}, 结果: {success}")
 
@@ -1041,21 +816,12 @@ async def delete_subscription(
             "subscription_id": subscription_id
         }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"取消订阅失败: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"取消订阅失败: {str(e)}"}
-        )
-
 
 @router.get("/subscription/{subscription_id}")
 async def get_subscription_info(
     subscription_id: str,
-    api_key: str = Depends(verify_api_key),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    subscription_manager: SubscriptionManager = Depends(get_app_subscription_manager)
 ):
     """
     获取订阅信息
@@ -1066,17 +832,12 @@ async def get_subscription_info(
     Returns:
         订阅详细信息
     """
-    try:
-        from app.dependencies import get_subscription_manager
-
-        # 获取订阅管理器
-        subscription_manager = get_subscription_manager(settings)
-
+    with ServiceErrorHandler("获取订阅信息失败"):
         # 获取订阅信息
-        info = await run_sync(
+        info = await _subscription_cache.do(_subscription_key(subscription_id), lambda: run_sync(
             subscription_manager.get_subscription_info, subscription_id,
-            timeout=settings.request_timeout.default
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
 
         if not info:
             raise HTTPException(
@@ -1084,22 +845,13 @@ async def get_subscription_info(
                 detail={"message": f"订阅不存在: {subscription_id}"}
             )
 
-        return info
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"获取订阅信息失败: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取订阅信息失败: {str(e)}"}
-        )
+        # 轮询场景：信息未变化时返回 304；max_age=0 要求客户端每次都重新验证
+        return etag_response(request, info, max_age=0)
 
 
 @router.get("/subscriptions")
 async def list_subscriptions(
-    api_key: str = Depends(verify_api_key),
-    settings: Settings = Depends(get_settings)
+    subscription_manager: SubscriptionManager = Depends(get_app_subscription_manager)
 ):
     """
     列出所有订阅
@@ -1107,28 +859,14 @@ async def list_subscriptions(
     Returns:
         所有订阅列表
     """
-    try:
-        from app.dependencies import get_subscription_manager
-
-        # 获取订阅管理器
-        subscription_manager = get_subscription_manager(settings)
-
+    with ServiceErrorHandler("列出订阅失败"):
         # 列出所有订阅
-        subscriptions = await run_sync(
+        subscriptions = await _subscription_cache.do(_SUBSCRIPTIONS_KEY, lambda: run_sync(
             subscription_manager.list_subscriptions,
-            timeout=settings.request_timeout.default
-        )
+            timeout=_TIMEOUTS["default"]
+        ))
 
-        return {
+        return model_response({
             "subscriptions": subscriptions,
             "total": len(subscriptions)
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"列出订阅失败: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"列出订阅失败: {str(e)}"}
-        )
+        })
@@ -1,16 +1,18 @@
 """
 健康检查路由
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 from app.utils.helpers import format_response
-from app.config import get_settings, Settings
+from app.config import get_settings
 
 router = APIRouter(prefix="/health", tags=["健康检查"])
 
 
 @router.get("/")
-async def health_check(settings: Settings = Depends(get_settings)):
+async def health_check():
     """健康检查接口"""
+    # 直接读取缓存的配置单例：同步依赖 Depends(get_settings) 每次请求都要经线程池执行
+    settings = get_settings()
     return format_response(
         data={
             "status": "healthy",
@@ -1,15 +1,15 @@
 """
 交易服务路由
 
-所有路由使用 run_sync 将同步 xttrader 调用放入线程池执行，
-防止阻塞 FastAPI 事件循环导致服务卡死。
+所有调用 xttrader 的路由使用 run_sync 将同步调用放入线程池执行，
+防止阻塞 FastAPI 事件循环导致服务卡死；仅读取内存状态的查询直接在事件循环中执行。
 """
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request
 
-from app.config import Settings, get_settings
-from app.dependencies import get_trading_service, verify_api_key
+from app.config import get_request_timeouts
+from app.dependencies import get_app_trading_service
 from app.models.trading_models import (
     AccountInfo,
     AssetInfo,
@@ -29,319 +29,221 @@ from app.models.trading_models import (
 )
 from app.services.trading_service import TradingService
 from app.utils.async_utils import run_sync
-from app.utils.exceptions import TradingServiceException, handle_xtquant_exception
-from app.utils.helpers import format_response
+from app.utils.batcher import CallBatcher
+from app.utils.exceptions import ServiceErrorHandler
+from app.utils.helpers import etag_response, flag_response, model_response
+from app.utils.singleflight import SingleFlight, TTLSingleFlight
 
 router = APIRouter(prefix="/api/v1/trading", tags=["交易服务"])
 
+# 请求超时表（配置在进程内不可变，导入时读取一次）
+_TIMEOUTS = get_request_timeouts()
+
+# 轮询类查询结果的保留时间（秒）：看板高频轮询时，窗口内的请求共享一次 xttrader 调用
+POLL_CACHE_TTL = 0.3
+
+# 账户/持仓/资产/策略/连接状态查询的短时缓存，键以 "{session_id}:" 开头，交易操作后按会话清除
+_poll_cache = TTLSingleFlight(POLL_CACHE_TTL)
+
+# 委托/成交/风险查询的请求合并（不缓存结果）：同一会话的并发查询共享一次 xttrader 调用
+_inflight_reads = SingleFlight()
+
+
+async def _submit_orders_batch(items):
+    """在一次线程池调用中提交窗口内收集的异步下单请求"""
+    trading_service = await get_app_trading_service()
+    return await run_sync(trading_service.submit_orders_async_batch, items, timeout=_TIMEOUTS["trading"])
+
+
+async def _cancel_orders_batch(items):
+    """在一次线程池调用中提交窗口内收集的异步撤单请求"""
+    trading_service = await get_app_trading_service()
+    return await run_sync(trading_service.cancel_orders_async_batch, items, timeout=_TIMEOUTS["trading"])
+
+
+# 异步下单/撤单微批处理：1ms 窗口内的并发请求合并为一次线程池调用，按到达顺序依次提交
+_order_batcher = CallBatcher(_submit_orders_batch)
+_cancel_batcher = CallBatcher(_cancel_orders_batch)
+
+
+def _forget_session(session_id: str):
+    """交易操作后清除该会话的查询缓存与进行中的合并调用"""
+    prefix = f"{session_id}:"
+    _poll_cache.forget(prefix)
+    _inflight_reads.forget(prefix)
+
 
 @router.post("/connect", response_model=ConnectResponse)
 async def connect_account(
     request: ConnectRequest,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """连接交易账户"""
-    try:
+    with ServiceErrorHandler("连接账户失败"):
         result = await run_sync(
             trading_service.connect_account, request,
-            timeout=settings.request_timeout.trading
+            timeout=_TIMEOUTS["trading"]
         )
         return result
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"连接账户失败: {str(e)}"}
-        )
 
 
 @router.post("/disconnect/{session_id}")
 async def disconnect_account(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """断开交易账户"""
-    try:
+    with ServiceErrorHandler("断开账户失败"):
         success = await run_sync(
             trading_service.disconnect_account, session_id,
-            timeout=settings.request_timeout.trading
-        )
-        return format_response(
-            data={"success": success},
-            message="断开账户成功" if success else "断开账户失败"
-        )
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"断开账户失败: {str(e)}"}
+            timeout=_TIMEOUTS["trading"]
         )
+        _forget_session(session_id)
+        return flag_response("success", success, "断开账户成功" if success else "断开账户失败")
 
 
 @router.get("/account/{session_id}", response_model=AccountInfo)
 async def get_account_info(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    request: Request,
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取账户信息"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取账户信息失败"):
+        result = await _poll_cache.do(f"{session_id}:account", lambda: run_sync(
             trading_service.get_account_info, session_id,
-            timeout=settings.request_timeout.trading
-        )
-        return result
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取账户信息失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["trading"]
+        ))
+        # 轮询场景：账户信息未变化时返回 304；max_age=0 要求客户端每次都重新验证
+        return etag_response(request, result, max_age=0)
 
 
 @router.get("/positions/{session_id}", response_model=List[PositionInfo])
 async def get_positions(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取持仓信息"""
-    try:
-        results = await run_sync(
+    with ServiceErrorHandler("获取持仓信息失败"):
+        results = await _poll_cache.do(f"{session_id}:positions", lambda: run_sync(
             trading_service.get_positions, session_id,
-            timeout=settings.request_timeout.trading
-        )
-        return results
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取持仓信息失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["trading"]
+        ))
+        return model_response(results)
 
 
 @router.post("/order/{session_id}", response_model=OrderResponse)
 async def submit_order(
     session_id: str,
     request: OrderRequest,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """提交订单"""
-    try:
+    with ServiceErrorHandler("提交订单失败"):
         result = await run_sync(
             trading_service.submit_order, session_id, request,
-            timeout=settings.request_timeout.trading
+            timeout=_TIMEOUTS["trading"]
         )
+        _forget_session(session_id)
         return result
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"提交订单失败: {str(e)}"}
-        )
 
 
 @router.post("/cancel/{session_id}")
 async def cancel_order(
     session_id: str,
     request: CancelOrderRequest,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """撤销订单"""
-    try:
+    with ServiceErrorHandler("撤销订单失败"):
         success = await run_sync(
             trading_service.cancel_order, session_id, request,
-            timeout=settings.request_timeout.trading
-        )
-        return format_response(
-            data={"success": success},
-            message="撤销订单成功" if success else "撤销订单失败"
-        )
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"撤销订单失败: {str(e)}"}
+            timeout=_TIMEOUTS["trading"]
         )
+        _forget_session(session_id)
+        return flag_response("success", success, "撤销订单成功" if success else "撤销订单失败")
 
 
 @router.get("/orders/{session_id}", response_model=List[OrderResponse])
 async def get_orders(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取订单列表"""
-    try:
-        results = await run_sync(
+    with ServiceErrorHandler("获取订单列表失败"):
+        results = await _inflight_reads.do(f"{session_id}:orders", lambda: run_sync(
             trading_service.get_orders, session_id,
-            timeout=settings.request_timeout.trading
-        )
-        return results
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取订单列表失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["trading"]
+        ))
+        return model_response(results)
 
 
 @router.get("/trades/{session_id}", response_model=List[TradeInfo])
 async def get_trades(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取成交记录"""
-    try:
-        results = await run_sync(
+    with ServiceErrorHandler("获取成交记录失败"):
+        results = await _inflight_reads.do(f"{session_id}:trades", lambda: run_sync(
             trading_service.get_trades, session_id,
-            timeout=settings.request_timeout.trading
-        )
-        return results
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取成交记录失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["trading"]
+        ))
+        return model_response(results)
 
 
 @router.get("/asset/{session_id}", response_model=AssetInfo)
 async def get_asset_info(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取资产信息"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取资产信息失败"):
+        result = await _poll_cache.do(f"{session_id}:asset", lambda: run_sync(
             trading_service.get_asset_info, session_id,
-            timeout=settings.request_timeout.trading
-        )
+            timeout=_TIMEOUTS["trading"]
+        ))
         return result
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取资产信息失败: {str(e)}"}
-        )
 
 
 @router.get("/risk/{session_id}", response_model=RiskInfo)
 async def get_risk_info(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取风险信息"""
-    try:
-        result = await run_sync(
+    with ServiceErrorHandler("获取风险信息失败"):
+        result = await _inflight_reads.do(f"{session_id}:risk", lambda: run_sync(
             trading_service.get_risk_info, session_id,
-            timeout=settings.request_timeout.trading
-        )
+            timeout=_TIMEOUTS["trading"]
+        ))
         return result
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取风险信息失败: {str(e)}"}
-        )
 
 
 @router.get("/strategies/{session_id}", response_model=List[StrategyInfo])
 async def get_strategies(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取策略列表"""
-    try:
-        results = await run_sync(
+    with ServiceErrorHandler("获取策略列表失败"):
+        results = await _poll_cache.do(f"{session_id}:strategies", lambda: run_sync(
             trading_service.get_strategies, session_id,
-            timeout=settings.request_timeout.trading
-        )
-        return results
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"获取策略列表失败: {str(e)}"}
-        )
+            timeout=_TIMEOUTS["trading"]
+        ))
+        return model_response(results)
 
 
 @router.get("/status/{session_id}")
 async def get_connection_status(
     session_id: str,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    trading_service: TradingService = Depends(get_app_trading_service)
 ):
     """获取连接状态"""
-    try:
-        is_connected = await run_sync(
-            trading_service.is_connected, session_id,
-            timeout=settings.request_timeout.trading
-        )
-        return format_response(
-            data={"connected": is_connected},
-            message="连接状态查询成功"
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"查询连接状态失败: {str(e)}"}
-        )
+    with ServiceErrorHandler("查询连接状态失败"):
+        # 仅判断会话是否在内存连接表中，不调用 xttrader，无需占用线程池
+        is_connected = trading_service.is_connected_sync(session_id)
+        return flag_response("connected", is_connected, "连接状态查询成功")
 
 
 # ==================== 异步交易接口 ====================
@@ -349,10 +251,7 @@ async def get_connection_status(
 @router.post("/order-async/{session_id}", response_model=AsyncOrderResponse)
 async def submit_order_async(
     session_id: str,
-    request: AsyncOrderRequest,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    request: AsyncOrderRequest
 ):
     """
     异步提交订单
@@ -360,30 +259,16 @@ async def submit_order_async(
     异步下单后立即返回，订单结果通过 WebSocket 回调推送。
     返回的 seq 字段用于匹配回调中的订单。
     """
-    try:
-        result = await run_sync(
-            trading_service.submit_order_async, session_id, request,
-            timeout=settings.request_timeout.trading
-        )
+    with ServiceErrorHandler("异步下单失败"):
+        result = await _order_batcher.submit((session_id, request))
+        _forget_session(session_id)
         return result
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"异步下单失败: {str(e)}"}
-        )
 
 
 @router.post("/cancel-async/{session_id}", response_model=AsyncCancelResponse)
 async def cancel_order_async(
     session_id: str,
-    request: AsyncCancelRequest,
-    api_key: str = Depends(verify_api_key),
-    trading_service: TradingService = Depends(get_trading_service),
-    settings: Settings = Depends(get_settings)
+    request: AsyncCancelRequest
 ):
     """
     异步撤销订单
@@ -391,18 +276,7 @@ async def cancel_order_async(
     异步撤单后立即返回，撤单结果通过 WebSocket 回调推送。
     可以使用 order_id 或 order_sysid 撤单（二选一）。
     """
-    try:
-        result = await run_sync(
-            trading_service.cancel_order_async, session_id, request,
-            timeout=settings.request_timeout.trading
-        )
+    with ServiceErrorHandler("异步撤单失败"):
+        result = await _cancel_batcher.submit((session_id, request))
+        _forget_session(session_id)
         return result
-    except TradingServiceException as e:
-        raise handle_xtquant_exception(e)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={"message": f"异步撤单失败: {str(e)}"}
-        )
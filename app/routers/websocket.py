@@ -3,7 +3,6 @@ WebSocket路由 - 用于实时行情推送和交易回调推送
 """
 import asyncio
 import json
-from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
@@ -11,7 +10,8 @@ from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, s
 from app.config import Settings, get_settings
 from app.dependencies import get_subscription_manager, get_trading_callback_manager
 from app.utils.exceptions import DataServiceException
-from app.utils.logger import logger
+from app.utils.helpers import now_iso
+from app.utils.logger import log_error, logger
 
 router = APIRouter(tags=["WebSocket"])
 
@@ -53,7 +53,7 @@ async def websocket_quote_stream(
             "type": "connected",
             "subscription_id": subscription_id,
             "message": "WebSocket连接成功",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         })
         
         # 创建接收客户端消息的任务（用于心跳）
@@ -67,7 +67,7 @@ async def websocket_quote_stream(
                     if message.get("type") == "ping":
                         await websocket.send_json({
                             "type": "pong",
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": now_iso()
                         })
                         logger.debug(f"收到心跳: {subscription_id}")
             
@@ -87,7 +87,7 @@ async def websocket_quote_stream(
                     await websocket.send_json({
                         "type": "quote",
                         "data": quote_data,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": now_iso()
                     })
                 
                 except WebSocketDisconnect:
@@ -121,7 +121,7 @@ async def websocket_quote_stream(
         logger.info(f"WebSocket断开: {subscription_id}")
     
     except Exception as e:
-        logger.error(f"WebSocket异常: {e}", exc_info=True)
+        log_error("WebSocket异常", e)
         try:
             await websocket.send_json({
                 "type": "error",
@@ -256,7 +256,7 @@ async def websocket_trading_stream(
             "type": "connected",
             "account_id": account_id,
             "message": "交易WebSocket连接成功",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         })
 
         # 发送最近的回调历史
@@ -265,7 +265,7 @@ async def websocket_trading_stream(
             await websocket.send_json({
                 "type": "history",
                 "data": recent_callbacks,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             })
 
         # 创建接收客户端消息的任务（用于心跳）
@@ -279,7 +279,7 @@ async def websocket_trading_stream(
                     if message.get("type") == "ping":
                         await websocket.send_json({
                             "type": "pong",
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": now_iso()
                         })
                         logger.debug(f"收到交易心跳: account_id={account_id}")
 
@@ -299,7 +299,7 @@ async def websocket_trading_stream(
                     await websocket.send_json({
                         "type": "callback",
                         "data": callback_data,
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": now_iso()
                     })
 
                 except WebSocketDisconnect:
@@ -325,7 +325,7 @@ async def websocket_trading_stream(
         logger.info(f"交易WebSocket断开: account_id={account_id}")
 
     except Exception as e:
-        logger.error(f"交易WebSocket异常: {e}", exc_info=True)
+        log_error("交易WebSocket异常", e)
         try:
             await websocket.send_json({
                 "type": "error",
@@ -57,6 +57,8 @@ from app.models.data_models import (
     MarketDataResponse,
     PeriodListResponse,
     SectorCreateResponse,
+    SectorMutation,
+    SectorMutationResult,
     SectorResponse,
     TickData,
     TradingCalendarResponse,
@@ -173,25 +175,26 @@ class DataService:
                             fill_data=request.fill_data
                         )
                         
-                        logger.debug(f"获取成功，原始数据类型: {type(data)}")
+                        logger.debug("获取成功，原始数据类型: {}", type(data))
                         if hasattr(data, 'shape'):
-                            logger.debug(f"数据形状: {data.shape}")
+                            logger.debug("数据形状: {}", data.shape)
                         
-                        # 打印原始数据结构用于调试
+                        # 打印原始数据结构用于调试（lazy：未启用 DEBUG 时不生成 dtypes/前几行的文本）
                         if isinstance(data, dict):
-                            logger.debug(f"数据字典keys: {list(data.keys())}")
+                            lazy_logger = logger.opt(lazy=True)
+                            lazy_logger.debug("数据字典keys: {}", lambda: list(data.keys()))
                             for k, v in data.items():
-                                logger.debug(f"[{k}] 类型: {type(v)}, 形状: {v.shape if hasattr(v, 'shape') else 'N/A'}")
-                                if hasattr(v, "dtypes"):                                                                        
-                                    logger.debug(f"[{k}] dtypes: {str(v.dtypes).split('\n')[0]}")                                    
+                                logger.debug("[{}] 类型: {}, 形状: {}", k, type(v), v.shape if hasattr(v, 'shape') else 'N/A')
+                                if hasattr(v, "dtypes"):
+                                    lazy_logger.debug("[{}] dtypes: {}", lambda: k, lambda: str(v.dtypes).split('\n')[0])
                                 if hasattr(v, 'head'):
-                                    logger.debug(f"前几行:\n{v.head()}")
+                                    lazy_logger.debug("前几行:\n{}", lambda: v.head())
                         
                         # 转换数据格式
                         formatted_data = self._format_market_data(data, request.fields)
-                        logger.debug(f"格式化后数据条数: {len(formatted_data)}")
+                        logger.debug("格式化后数据条数: {}", len(formatted_data))
                         if formatted_data:
-                            logger.debug(f"格式化后首条数据: {formatted_data[0]}")
+                            logger.debug("格式化后首条数据: {}", formatted_data[0])
                         
                     except Exception as e:
                         logger.error(f"获取真实数据失败: {e}")
@@ -503,22 +506,29 @@ class DataService:
         except Exception as e:
             raise DataServiceException(f"获取合约信息失败: {str(e)}")
     
+    # K线字段（包含xtquant所有K线字段）及其中转换为整数的字段
+    _KLINE_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'amount', 'settle', 'openInterest', 'preClose', 'suspendFlag')
+    _KLINE_INT_FIELDS = frozenset(('volume', 'openInterest', 'suspendFlag'))
+
     def _format_market_data(self, data: Any, fields: Optional[List[str]]) -> List[Dict[str, Any]]:
         """格式化市场数据
         xtquant返回格式: {'field_name': DataFrame, ...}
         DataFrame的行是股票代码（index），列是日期
+
+        每个字段整行取出为 numpy 数组后逐值转换，避免按 (股票, 日期) 逐格调用 DataFrame.loc，
+        大幅缩短转换期间持有 GIL 的时间
         """
         if not data:
             return []
         
-        logger.debug(f"格式化数据，类型: {type(data)}")
+        logger.debug("格式化数据，类型: {}", type(data))
         
         formatted_data = []
         
         # 处理xtdata特殊格式: {'time': DataFrame, 'open': DataFrame, ...}
         if isinstance(data, dict) and len(data) > 0:
             # 获取第一个field的DataFrame来确定日期列
-            first_field = list(data.keys())[0]
+            first_field = next(iter(data))
             first_df = data[first_field]
             
             if hasattr(first_df, 'columns') and hasattr(first_df, 'index'):
@@ -529,51 +539,58 @@ class DataService:
                 
                 # 获取所有日期（DataFrame的列）
                 dates = list(first_df.columns)
-                logger.debug(f"处理股票: {stock_code}, 日期数: {len(dates)}")
+                logger.debug("处理股票: {}, 日期数: {}", stock_code, len(dates))
                 
-                # 遍历每个日期，构建记录
-                for date in dates:
-                    record = {}
-                    
-                    # 添加时间字段
-                    if 'time' in data:
-                        time_value = data['time'].loc[stock_code, date]
+                # 添加时间字段（逐值判断类型，与逐格读取时得到的 numpy 标量一致）
+                if 'time' in data:
+                    time_values = data['time'].loc[stock_code, dates].to_numpy()
+                    for date, time_value in zip(dates, time_values):
                         # 时间戳转换为日期字符串
                         if isinstance(time_value, (int, float)) and time_value > 1000000000000:  # 毫秒时间戳
-                            from datetime import datetime
-                            record['time'] = datetime.fromtimestamp(time_value / 1000).strftime('%Y%m%d')
+                            formatted_data.append({'time': datetime.fromtimestamp(time_value / 1000).strftime('%Y%m%d')})
                         else:
-                            record['time'] = str(date)
-                    else:
-                        record['time'] = str(date)
-                    
-                    # 添加其他字段 (包含xtquant所有K线字段)
-                    for field in ['open', 'high', 'low', 'close', 'volume', 'amount', 'settle', 'openInterest', 'preClose', 'suspendFlag']:
-                        if field in data:
+                            formatted_data.append({'time': str(date)})
+                else:
+                    formatted_data = [{'time': str(date)} for date in dates]
+                
+                # 添加其他字段
+                for field in self._KLINE_FIELDS:
+                    if field not in data:
+                        continue
+                    try:
+                        values = data[field].loc[stock_code, dates].to_numpy()
+                    except Exception as e:
+                        logger.warning("获取字段 {} 失败: {}", field, e)
+                        continue
+
+                    convert = int if field in self._KLINE_INT_FIELDS else float
+                    if values.dtype.kind in 'biuf':
+                        # 数值类型：tolist 一次性转换为 Python 原生类型
+                        for record, value in zip(formatted_data, values.tolist()):
                             try:
-                                value = data[field].loc[stock_code, date]
-                                # 转换为Python原生类型
-                                if hasattr(value, 'item'):  # numpy类型
-                                    if field in ['volume', 'openInterest', 'suspendFlag']:
-                                        record[field] = int(value)
-                                    else:
-                                        record[field] = float(value)
-                                else:
-                                    logger.debug(f"field: {field} = original {value}")
-                                    record[field] = value
+                                record[field] = convert(value)
                             except Exception as e:
-                                logger.warning(f"获取字段 {field} 失败: {e}")
-                    
-                    formatted_data.append(record)
+                                logger.warning("获取字段 {} 失败: {}", field, e)
+                    else:
+                        for record, value in zip(formatted_data, values):
+                            # 转换为Python原生类型
+                            if hasattr(value, 'item'):  # numpy类型
+                                try:
+                                    record[field] = convert(value)
+                                except Exception as e:
+                                    logger.warning("获取字段 {} 失败: {}", field, e)
+                            else:
+                                logger.debug("field: {} = original {}", field, value)
+                                record[field] = value
                 
-                logger.debug(f"格式化完成，共 {len(formatted_data)} 条记录")
+                logger.debug("格式化完成，共 {} 条记录", len(formatted_data))
                 if formatted_data:
-                    logger.debug(f"首条: {formatted_data[0]}")
-                    logger.debug(f"末条: {formatted_data[-1]}")
+                    logger.debug("首条: {}", formatted_data[0])
+                    logger.debug("末条: {}", formatted_data[-1])
             else:
                 logger.warning("DataFrame格式不符合预期")
         else:
-            logger.warning(f"未知数据格式: {type(data)}")
+            logger.warning("未知数据格式: {}", type(data))
         
         return formatted_data
     
@@ -1600,6 +1617,29 @@ class DataService:
         except Exception as e:
             raise DataServiceException(f"重置板块失败: {str(e)}")
     
+    def batch_mutate_sectors(self, ops: List[SectorMutation]) -> List[SectorMutationResult]:
+        """批量修改板块成分股（在一次线程池调用内按顺序执行，单个操作失败不影响后续操作）"""
+        handlers = {
+            "add": self.add_sector,
+            "remove": self.remove_stock_from_sector,
+            "reset": self.reset_sector,
+        }
+        results = []
+        for op in ops:
+            try:
+                success = handlers[op.op](op.sector_name, op.stock_list)
+                message = ""
+            except DataServiceException as e:
+                success = False
+                message = e.message
+            results.append(SectorMutationResult(
+                op=op.op,
+                sector_name=op.sector_name,
+                success=success,
+                message=message
+            ))
+        return results
+    
     # ==================== 阶段5: Level2数据接口实现 ====================
     
     def get_l2_quote(self, stock_codes: List[str]) -> Dict[str, L2QuoteData]:
@@ -11,7 +11,7 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, AsyncIterator, Dict, List, Optional
-from app.utils.logger import logger
+from app.utils.logger import log_error, logger
 
 # 添加xtquant包到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -35,7 +35,8 @@ except ImportError:
 
 from app.config import Settings, XTQuantMode
 from app.utils.exceptions import DataServiceException
-from app.utils.logger import logger
+from app.utils.helpers import now_iso
+from app.utils.logger import log_error, logger
 
 
 @dataclass
@@ -197,7 +198,7 @@ class SubscriptionManager:
                             logger.error(f"推送数据到订阅 {sub_id} 失败: {e}")
 
         except Exception as e:
-            logger.error(f"行情回调处理异常: {e}", exc_info=True)
+            log_error("行情回调处理异常", e)
 
     async def _put_to_queue(self, queue: Optional[asyncio.Queue], data: Dict[str, Any]):
         """将数据放入队列（处理队列满的情况）"""
@@ -461,7 +462,7 @@ class SubscriptionManager:
                     for symbol in context.symbols:
                         mock_data = {
                             "stock_code": symbol,
-                            "timestamp": datetime.now().isoformat(),
+                            "timestamp": now_iso(),
                             "last_price": 10.0 + (hash(symbol) % 100) / 10.0,
                             "volume": 1000000,
                             "amount": 10000000.0,
@@ -501,7 +502,7 @@ class SubscriptionManager:
             raise
 
         except Exception as e:
-            logger.error(f"流式推送异常: {subscription_id}, {e}", exc_info=True)
+            log_error(f"流式推送异常: {subscription_id}", e)
             raise
 
         finally:
@@ -7,17 +7,22 @@
 3. 将交易回调推送到所有订阅的 WebSocket 客户端
 """
 import asyncio
+import functools
+import sys
 import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
 
 from app.config import Settings, XTQuantMode
 from app.models.trading_models import (
-    AssetCallback,
-    OrderCallback,
-    PositionCallback,
-    TradeCallback,
-    TradingCallback,
+    AssetCallbackDict,
+    OrderCallbackDict,
+    PositionCallbackDict,
+    TradeCallbackDict,
+    TradingCallbackDict,
     TradingCallbackType,
 )
 from app.utils.logger import logger
@@ -32,6 +37,32 @@ except ImportError:
     XtQuantTraderCallback = object  # 使用空基类
 
 
+@functools.lru_cache(maxsize=256)
+def _code_str(code: Any) -> str:
+    """
+    将 xtquant 的委托方向/报价类型/委托状态等枚举码转为字符串
+
+    取值集合很小，缓存后同一枚举码始终返回同一个驻留字符串，
+    回调热路径上不再重复 str() 分配，下游比较/哈希也只需比较指针
+    """
+    return sys.intern(str(code))
+
+
+@dataclass(eq=False)
+class CallbackSubscriber:
+    """
+    回调订阅者
+
+    使用 deque(maxlen) 作为缓冲区：满时由 append 在 C 层自动淘汰最旧数据，
+    无需 QueueFull 后 get/put 的二次操作；event 用于唤醒所属事件循环上的消费者
+    """
+
+    loop: Optional[asyncio.AbstractEventLoop]
+    account_id: Optional[str] = None
+    buffer: deque = field(default_factory=lambda: deque(maxlen=1000))
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+
+
 class TradingCallbackHandler(XtQuantTraderCallback if XTQUANT_AVAILABLE else object):
     """
     交易回调处理器
@@ -78,14 +109,14 @@ class TradingCallbackHandler(XtQuantTraderCallback if XTQUANT_AVAILABLE else obj
         self._manager._dispatch_callback(
             TradingCallbackType.ASSET,
             account_id=account_id,
-            data=AssetCallback(
+            data=AssetCallbackDict(
                 account_id=account_id,
                 total_asset=getattr(asset, 'total_asset', 0.0),
                 market_value=getattr(asset, 'market_value', 0.0),
                 cash=getattr(asset, 'cash', 0.0),
                 frozen_cash=getattr(asset, 'frozen_cash', 0.0),
                 available_cash=getattr(asset, 'available_cash', 0.0)
-            ).model_dump()
+            )
         )
 
     def on_stock_order(self, order):
@@ -95,22 +126,22 @@ class TradingCallbackHandler(XtQuantTraderCallback if XTQUANT_AVAILABLE else obj
         self._manager._dispatch_callback(
             TradingCallbackType.ORDER,
             account_id=account_id,
-            data=OrderCallback(
+            data=OrderCallbackDict(
                 account_id=account_id,
                 order_id=str(getattr(order, 'order_id', '')),
                 order_sysid=getattr(order, 'order_sysid', None),
                 stock_code=getattr(order, 'stock_code', ''),
                 stock_name=getattr(order, 'stock_name', None),
-                side=str(getattr(order, 'order_type', '')),
-                order_type=str(getattr(order, 'price_type', '')),
+                side=_code_str(getattr(order, 'order_type', '')),
+                order_type=_code_str(getattr(order, 'price_type', '')),
                 volume=getattr(order, 'order_volume', 0),
                 price=getattr(order, 'price', 0.0),
-                status=str(getattr(order, 'order_status', '')),
+                status=_code_str(getattr(order, 'order_status', '')),
                 status_msg=getattr(order, 'order_status_msg', None),
                 filled_volume=getattr(order, 'traded_volume', 0),
                 filled_amount=getattr(order, 'traded_amount', 0.0),
                 order_time=None
-            ).model_dump()
+            )
         )
 
     def on_stock_trade(self, trade):
@@ -120,20 +151,20 @@ class TradingCallbackHandler(XtQuantTraderCallback if XTQUANT_AVAILABLE else obj
         self._manager._dispatch_callback(
             TradingCallbackType.TRADE,
             account_id=account_id,
-            data=TradeCallback(
+            data=TradeCallbackDict(
                 account_id=account_id,
                 trade_id=str(getattr(trade, 'traded_id', '')),
                 order_id=str(getattr(trade, 'order_id', '')),
                 order_sysid=getattr(trade, 'order_sysid', None),
                 stock_code=getattr(trade, 'stock_code', ''),
                 stock_name=getattr(trade, 'stock_name', None),
-                side=str(getattr(trade, 'order_type', '')),
+                side=_code_str(getattr(trade, 'order_type', '')),
                 volume=getattr(trade, 'traded_volume', 0),
                 price=getattr(trade, 'traded_price', 0.0),
                 amount=getattr(trade, 'traded_amount', 0.0),
                 trade_time=datetime.now(),
                 commission=getattr(trade, 'commission', 0.0)
-            ).model_dump()
+            )
         )
 
     def on_stock_position(self, position):
@@ -143,7 +174,7 @@ class TradingCallbackHandler(XtQuantTraderCallback if XTQUANT_AVAILABLE else obj
         self._manager._dispatch_callback(
             TradingCallbackType.POSITION,
             account_id=account_id,
-            data=PositionCallback(
+            data=PositionCallbackDict(
                 account_id=account_id,
                 stock_code=getattr(position, 'stock_code', ''),
                 stock_name=getattr(position, 'stock_name', None),
@@ -154,7 +185,7 @@ class TradingCallbackHandler(XtQuantTraderCallback if XTQUANT_AVAILABLE else obj
                 market_price=getattr(position, 'market_value', 0.0) / max(getattr(position, 'volume', 1), 1),
                 market_value=getattr(position, 'market_value', 0.0),
                 profit_loss=getattr(position, 'profit', 0.0)
-            ).model_dump()
+            )
         )
 
     def on_order_error(self, order_error):
@@ -245,17 +276,17 @@ class TradingCallbackManager:
         self._xt_trader: Optional["XtQuantTrader"] = None
         self._event_loop: Optional[asyncio.AbstractEventLoop] = None
 
-        # WebSocket 客户端管理
-        # account_id -> Set[asyncio.Queue]
-        self._ws_queues: Dict[str, Set[asyncio.Queue]] = {}
+        # WebSocket / gRPC 订阅者管理
+        # account_id -> Set[CallbackSubscriber]
+        self._ws_subscribers: Dict[str, Set[CallbackSubscriber]] = {}
         self._ws_lock = threading.Lock()
 
         # 全局订阅者（接收所有账户的回调）
-        self._global_queues: Set[asyncio.Queue] = set()
+        self._global_subscribers: Set[CallbackSubscriber] = set()
 
-        # 回调历史（用于新连接时发送最近的回调）
-        self._callback_history: List[TradingCallback] = []
+        # 回调历史（用于新连接时发送最近的回调），满时自动淘汰最旧的回调
         self._max_history = 100
+        self._callback_history: Deque[TradingCallbackDict] = deque(maxlen=self._max_history)
 
         self._initialized = True
         logger.info("交易回调管理器已初始化")
@@ -295,16 +326,16 @@ class TradingCallbackManager:
 
     def stop(self):
         """停止回调管理器"""
-        # 清空所有队列
+        # 清空所有订阅者
         with self._ws_lock:
-            self._ws_queues.clear()
-            self._global_queues.clear()
+            self._ws_subscribers.clear()
+            self._global_subscribers.clear()
 
         self._xt_trader = None
         self._callback_handler = None
         logger.info("交易回调管理器已停止")
 
-    def subscribe(self, account_id: str = None) -> asyncio.Queue:
+    def subscribe(self, account_id: str = None) -> CallbackSubscriber:
         """
         订阅交易回调
 
@@ -312,37 +343,42 @@ class TradingCallbackManager:
             account_id: 账户ID，如果为 None 则订阅所有账户的回调
 
         Returns:
-            asyncio.Queue: 用于接收回调的队列
+            CallbackSubscriber: 绑定到当前事件循环的订阅者
         """
-        queue = asyncio.Queue(maxsize=1000)
+        # REST 与 gRPC 各自运行在不同的事件循环上，订阅者需记录自己所属的循环
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = self._event_loop
+        subscriber = CallbackSubscriber(loop=loop, account_id=account_id)
 
         with self._ws_lock:
             if account_id:
-                if account_id not in self._ws_queues:
-                    self._ws_queues[account_id] = set()
-                self._ws_queues[account_id].add(queue)
+                if account_id not in self._ws_subscribers:
+                    self._ws_subscribers[account_id] = set()
+                self._ws_subscribers[account_id].add(subscriber)
                 logger.info(f"新订阅: account_id={account_id}")
             else:
-                self._global_queues.add(queue)
+                self._global_subscribers.add(subscriber)
                 logger.info("新全局订阅")
 
-        return queue
+        return subscriber
 
-    def unsubscribe(self, queue: asyncio.Queue, account_id: str = None):
+    def unsubscribe(self, subscriber: CallbackSubscriber, account_id: str = None):
         """
         取消订阅
 
         Args:
-            queue: 要取消的队列
+            subscriber: 要取消的订阅者
             account_id: 账户ID
         """
         with self._ws_lock:
-            if account_id and account_id in self._ws_queues:
-                self._ws_queues[account_id].discard(queue)
-                if not self._ws_queues[account_id]:
-                    del self._ws_queues[account_id]
+            if account_id and account_id in self._ws_subscribers:
+                self._ws_subscribers[account_id].discard(subscriber)
+                if not self._ws_subscribers[account_id]:
+                    del self._ws_subscribers[account_id]
             else:
-                self._global_queues.discard(queue)
+                self._global_subscribers.discard(subscriber)
 
         logger.info(f"取消订阅: account_id={account_id}")
 
@@ -356,59 +392,42 @@ class TradingCallbackManager:
         """
         分发回调到所有订阅者
 
-        在 xtquant 回调线程中调用，需要线程安全地将消息放入队列
+        在 xtquant 回调线程中调用，需要线程安全地将消息放入队列。
+        回调消息直接按 TradingCallbackDict 构造为普通 dict，不经 pydantic 校验与 model_dump；
+        同一个 dict 分发给所有订阅者并保存到历史，订阅者只读不改
         """
-        callback = TradingCallback(
-            callback_type=callback_type,
+        callback_dict = TradingCallbackDict(
+            callback_type=callback_type.value,
             account_id=account_id,
-            timestamp=datetime.now(),
+            timestamp=datetime.now().isoformat(),
             data=data,
             seq=seq
         )
 
         # 保存到历史
-        self._callback_history.append(callback)
-        if len(self._callback_history) > self._max_history:
-            self._callback_history = self._callback_history[-self._max_history:]
+        self._callback_history.append(callback_dict)
 
         # 分发到订阅者
-        callback_dict = callback.model_dump()
-        # 转换 datetime 为 ISO 格式字符串
-        callback_dict['timestamp'] = callback.timestamp.isoformat()
-        callback_dict['callback_type'] = callback_type.value
-
         with self._ws_lock:
             # 分发到账户特定订阅者
-            if account_id and account_id in self._ws_queues:
-                for queue in self._ws_queues[account_id]:
-                    self._put_to_queue(queue, callback_dict)
+            if account_id and account_id in self._ws_subscribers:
+                for subscriber in self._ws_subscribers[account_id]:
+                    self._put_to_subscriber(subscriber, callback_dict)
 
             # 分发到全局订阅者
-            for queue in self._global_queues:
-                self._put_to_queue(queue, callback_dict)
-
-    def _put_to_queue(self, queue: asyncio.Queue, data: Dict[str, Any]):
-        """线程安全地将数据放入队列"""
-        if self._event_loop and not self._event_loop.is_closed():
-            try:
-                asyncio.run_coroutine_threadsafe(
-                    self._async_put(queue, data),
-                    self._event_loop
-                )
-            except Exception as e:
-                logger.error(f"放入队列失败: {e}")
-
-    async def _async_put(self, queue: asyncio.Queue, data: Dict[str, Any]):
-        """异步放入队列"""
-        try:
-            queue.put_nowait(data)
-        except asyncio.QueueFull:
-            # 队列满时丢弃旧数据
+            for subscriber in self._global_subscribers:
+                self._put_to_subscriber(subscriber, callback_dict)
+
+    def _put_to_subscriber(self, subscriber: CallbackSubscriber, data: Dict[str, Any]):
+        """线程安全地将数据放入订阅者缓冲区，并唤醒其所属事件循环上的消费者"""
+        loop = subscriber.loop
+        if loop and not loop.is_closed():
+            # deque.append 本身是原子操作，满时自动丢弃最旧数据
+            subscriber.buffer.append(data)
             try:
-                queue.get_nowait()
-                queue.put_nowait(data)
-            except Exception:
-                pass
+                loop.call_soon_threadsafe(subscriber.event.set)
+            except RuntimeError as e:
+                logger.error(f"唤醒订阅者失败: {e}")
 
     async def stream_callbacks(
         self,
@@ -423,21 +442,84 @@ class TradingCallbackManager:
         Yields:
             Dict: 回调数据
         """
-        queue = self.subscribe(account_id)
+        subscriber = self.subscribe(account_id)
+        buffer = subscriber.buffer
 
         try:
             while True:
-                try:
-                    data = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield data
-                except asyncio.TimeoutError:
+                if not await self._wait_for_callbacks(subscriber):
                     # 发送心跳
-                    yield {
-                        "callback_type": "heartbeat",
-                        "timestamp": datetime.now().isoformat()
-                    }
+                    yield self._heartbeat()
+                    continue
+                yield buffer.popleft()
         finally:
-            self.unsubscribe(queue, account_id)
+            self.unsubscribe(subscriber, account_id)
+
+    async def stream_callback_batches(
+        self,
+        account_id: str = None,
+        max_batch_size: int = 64,
+        batch_window: float = 0.001
+    ):
+        """
+        批量流式获取交易回调
+
+        收到第一条回调后再等待一个短时间窗口，将窗口内到达的回调合并为一批返回，
+        用于委托/成交回报密集时减少逐条发送的开销
+
+        Args:
+            account_id: 账户ID，如果为 None 则获取所有账户的回调
+            max_batch_size: 单批最大回调数
+            batch_window: 合并窗口（秒）
+
+        Yields:
+            List[Dict]: 回调数据列表（心跳为单元素列表）
+        """
+        subscriber = self.subscribe(account_id)
+        buffer = subscriber.buffer
+        popleft = buffer.popleft
+
+        try:
+            while True:
+                if not await self._wait_for_callbacks(subscriber):
+                    yield [self._heartbeat()]
+                    continue
+                if len(buffer) < max_batch_size:
+                    await asyncio.sleep(batch_window)
+                yield [popleft() for _ in range(min(len(buffer), max_batch_size))]
+        finally:
+            self.unsubscribe(subscriber, account_id)
+
+    @staticmethod
+    async def _wait_for_callbacks(subscriber: CallbackSubscriber, timeout: float = 30.0) -> bool:
+        """
+        等待订阅者缓冲区中有回调，超时返回 False
+
+        生产者线程先 append 再排队 set()，消费者可能在 set() 执行前就已取走该条回调，
+        迟到的 set() 会造成一次缓冲区为空的唤醒；因此唤醒后重新检查缓冲区，为空时继续等待剩余时间
+        """
+        buffer = subscriber.buffer
+        event = subscriber.event
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not buffer:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return bool(buffer)
+        return True
+
+    @staticmethod
+    def _heartbeat() -> Dict[str, Any]:
+        """构建心跳消息（心跳只用于保活，时间戳精确到秒，直接 strftime 避免构造 datetime）"""
+        return {
+            "callback_type": "heartbeat",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
 
     def get_recent_callbacks(self, account_id: str = None, limit: int = 20) -> List[Dict]:
         """
@@ -450,19 +532,13 @@ class TradingCallbackManager:
         Returns:
             最近的回调列表
         """
-        callbacks = self._callback_history
+        callbacks = list(self._callback_history)
 
         if account_id:
-            callbacks = [c for c in callbacks if c.account_id == account_id]
+            callbacks = [c for c in callbacks if c["account_id"] == account_id]
 
-        result = []
-        for c in callbacks[-limit:]:
-            d = c.model_dump()
-            d['timestamp'] = c.timestamp.isoformat()
-            d['callback_type'] = c.callback_type.value
-            result.append(d)
-
-        return result
+        # 返回浅拷贝，调用方修改结果不影响历史记录
+        return [dict(c) for c in callbacks[-limit:]]
 
     # ==================== Mock 模式支持 ====================
 
@@ -481,11 +557,14 @@ class TradingCallbackManager:
 
 # 全局单例获取函数
 _trading_callback_manager: Optional[TradingCallbackManager] = None
+_trading_callback_manager_lock = threading.Lock()
 
 
 def get_trading_callback_manager(settings: Settings = None) -> TradingCallbackManager:
     """获取交易回调管理器单例"""
     global _trading_callback_manager
     if _trading_callback_manager is None:
-        _trading_callback_manager = TradingCallbackManager(settings)
+        with _trading_callback_manager_lock:
+            if _trading_callback_manager is None:
+                _trading_callback_manager = TradingCallbackManager(settings)
     return _trading_callback_manager
@@ -14,9 +14,9 @@ import os
 import sys
 import threading
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from app.utils.logger import logger
+from app.utils.logger import log_error, logger
 
 # 添加xtquant包到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -63,7 +63,7 @@ from app.models.trading_models import (
 )
 from app.utils.exceptions import TradingServiceException
 from app.utils.helpers import validate_stock_code
-from app.utils.logger import logger
+from app.utils.logger import log_error, logger
 
 
 class TradingService:
@@ -146,7 +146,7 @@ class TradingService:
                 return self._connect_mock_account(request)
 
         except Exception as e:
-            logger.error(f"连接账户失败: {e}", exc_info=True)
+            log_error("连接账户失败", e)
             return ConnectResponse(
                 success=False,
                 message=f"账户连接失败: {str(e)}"
@@ -226,7 +226,7 @@ class TradingService:
             )
 
         except Exception as e:
-            logger.error(f"真实连接账户失败: {e}", exc_info=True)
+            log_error("真实连接账户失败", e)
             raise
 
     def _connect_mock_account(self, request: ConnectRequest) -> ConnectResponse:
@@ -324,7 +324,7 @@ class TradingService:
 
     def _get_mock_asset_info(self) -> AssetInfo:
         """获取模拟资产信息"""
-        return AssetInfo(
+        return AssetInfo.model_construct(
             total_asset=1800000.0,
             market_value=800000.0,
             cash=950000.0,
@@ -394,7 +394,7 @@ class TradingService:
     def _get_mock_positions(self) -> List[PositionInfo]:
         """获取模拟持仓信息"""
         return [
-            PositionInfo(
+            PositionInfo.model_construct(
                 stock_code="000001.SZ",
                 stock_name="平安银行",
                 volume=10000,
@@ -406,7 +406,7 @@ class TradingService:
                 profit_loss=7000.0,
                 profit_loss_ratio=0.056
             ),
-            PositionInfo(
+            PositionInfo.model_construct(
                 stock_code="000002.SZ",
                 stock_name="万科A",
                 volume=5000,
@@ -472,7 +472,7 @@ class TradingService:
     def _get_mock_trades(self) -> List[TradeInfo]:
         """获取模拟成交记录"""
         return [
-            TradeInfo(
+            TradeInfo.model_construct(
                 trade_id="trade_001",
                 order_id="order_1001",
                 stock_code="000001.SZ",
@@ -585,7 +585,8 @@ class TradingService:
         if not order_id or order_id < 0:
             raise TradingServiceException(f"下单失败，错误码: {order_id}")
 
-        order_response = OrderResponse(
+        # 字段均取自已校验的 OrderRequest 或本地生成，直接构造跳过重复校验
+        order_response = OrderResponse.model_construct(
             order_id=str(order_id),
             stock_code=request.stock_code,
             side=request.side.value,
@@ -604,7 +605,8 @@ class TradingService:
         order_id = f"mock_order_{self._order_counter}"
         self._order_counter += 1
 
-        order_response = OrderResponse(
+        # 字段均取自已校验的 OrderRequest 或本地生成，直接构造跳过重复校验
+        order_response = OrderResponse.model_construct(
             order_id=order_id,
             stock_code=request.stock_code,
             side=request.side.value,
@@ -745,6 +747,25 @@ class TradingService:
 
         return self._cancel_real_order_async(session_id, request)
 
+    def submit_orders_async_batch(self, items: List[Tuple[str, AsyncOrderRequest]]) -> List[Any]:
+        """批量异步下单（一次线程池调用内依次提交，单笔失败时对应位置为异常实例，不影响其余订单）"""
+        return self._run_batch(self.submit_order_async, items)
+
+    def cancel_orders_async_batch(self, items: List[Tuple[str, AsyncCancelRequest]]) -> List[Any]:
+        """批量异步撤单（一次线程池调用内依次提交，单笔失败时对应位置为异常实例，不影响其余撤单）"""
+        return self._run_batch(self.cancel_order_async, items)
+
+    @staticmethod
+    def _run_batch(method: Callable[[str, Any], Any], items: List[Tuple[str, Any]]) -> List[Any]:
+        """按顺序执行批量调用，收集每项的结果或异常"""
+        results: List[Any] = []
+        for session_id, request in items:
+            try:
+                results.append(method(session_id, request))
+            except Exception as e:
+                results.append(e)
+        return results
+
     def _cancel_real_order_async(self, session_id: str, request: AsyncCancelRequest) -> AsyncCancelResponse:
         """真实异步撤单"""
         xt_trader = self._get_xt_trader(session_id)
@@ -792,7 +813,7 @@ class TradingService:
             asset = self.get_asset_info(session_id)
             total = asset.total_asset if asset.total_asset > 0 else 1
 
-            return RiskInfo(
+            return RiskInfo.model_construct(
                 position_ratio=asset.market_value / total,
                 cash_ratio=asset.cash / total,
                 max_drawdown=0.05,
@@ -808,7 +829,7 @@ class TradingService:
             raise TradingServiceException("账户未连接")
 
         return [
-            StrategyInfo(
+            StrategyInfo.model_construct(
                 strategy_name="MA策略",
                 strategy_type="TREND_FOLLOWING",
                 status="RUNNING",
@@ -816,7 +837,7 @@ class TradingService:
                 last_update_time=datetime.now(),
                 parameters={"period": 20, "threshold": 0.02}
             ),
-            StrategyInfo(
+            StrategyInfo.model_construct(
                 strategy_name="均值回归策略",
                 strategy_type="MEAN_REVERSION",
                 status="STOPPED",
@@ -828,6 +849,14 @@ class TradingService:
 
     def is_connected(self, session_id: str) -> bool:
         """检查账户是否连接"""
+        return self.is_connected_sync(session_id)
+
+    def is_connected_sync(self, session_id: str) -> bool:
+        """
+        检查账户是否连接（可直接在事件循环中调用）
+
+        只读内存连接表，不调用 xttrader、不加锁，后续修改须保持这一约束。
+        """
         return session_id in self._connected_accounts
 
     # ==================== 辅助方法 ====================
@@ -16,15 +16,27 @@ from app.utils.logger import logger
 T = TypeVar("T")
 
 # 全局线程池，用于执行阻塞操作
-# 使用较大的线程池以支持并发请求
+# 独立于 Starlette/anyio 默认线程池（40 线程），xtquant 调用积压时不影响框架自身的线程池任务
 _executor: ThreadPoolExecutor | None = None
 
+# 未通过 init_executor 指定大小时的默认线程数
+DEFAULT_MAX_WORKERS = 50
+
+
+def init_executor(max_workers: int) -> ThreadPoolExecutor:
+    """按配置创建全局线程池（应用启动时调用）"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="async-worker-")
+    return _executor
+
 
 def get_executor() -> ThreadPoolExecutor:
-    """获取全局线程池（懒加载）"""
+    """获取全局线程池（未初始化时按默认大小懒加载）"""
     global _executor
     if _executor is None:
-        _executor = ThreadPoolExecutor(max_workers=50, thread_name_prefix="async-worker-")
+        _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="async-worker-")
     return _executor
 
 
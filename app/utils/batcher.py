@@ -0,0 +1,125 @@
+"""
+多标的请求微批处理工具
+
+Level2 等按标的列表查询的接口，在短时间窗口内收集并发请求，合并各请求的标的列表后
+只调用一次 xtdata，再按标的把结果分发回各请求，减少线程池调用与 xtdata 往返次数。
+CallBatcher 用于异步下单/撤单等逐项执行的操作：窗口内的请求在一次线程池调用中依次执行。
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class Batcher:
+    """
+    微批处理器
+
+    首个请求到达时启动一次延迟 window 秒的合并调用，窗口内到达的请求加入同一批；
+    fetch 接收合并去重后的标的列表，返回以标的代码为键的字典。
+    合并调用失败时，同批所有请求收到同一异常。
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        window: float = 0.005
+    ):
+        self._fetch = fetch
+        self._window = window
+        self._pending: List[Tuple[Tuple[str, ...], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def submit(self, stock_codes: Sequence[str]) -> Dict[str, Any]:
+        """
+        提交一次查询并等待所在批次的结果
+
+        Args:
+            stock_codes: 标的代码列表
+
+        Returns:
+            仅包含本次请求标的的结果字典
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((tuple(stock_codes), future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """等待窗口结束后执行合并调用并分发结果"""
+        await asyncio.sleep(self._window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        # 保持首次出现顺序去重
+        union = list(dict.fromkeys(code for codes, _ in batch for code in codes))
+        try:
+            results = await self._fetch(union)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for codes, future in batch:
+            if not future.done():
+                future.set_result({code: results[code] for code in codes if code in results})
+
+
+class CallBatcher:
+    """
+    逐项调用微批处理器
+
+    与 Batcher 相同的时间窗口合并方式，但不合并参数：fetch 接收窗口内各请求的参数列表，
+    按相同顺序返回各请求的结果；结果为异常实例时只有对应请求收到该异常，
+    合并调用本身失败时同批所有请求收到同一异常。
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[Any]], Awaitable[List[Any]]],
+        window: float = 0.001
+    ):
+        self._fetch = fetch
+        self._window = window
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def submit(self, item: Any) -> Any:
+        """
+        提交一次调用并等待所在批次中对应的结果
+
+        Args:
+            item: 本次调用的参数
+
+        Returns:
+            本次调用的结果
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        """等待窗口结束后执行合并调用并按顺序分发结果"""
+        await asyncio.sleep(self._window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        try:
+            results = await self._fetch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
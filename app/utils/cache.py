@@ -0,0 +1,192 @@
+"""
+响应缓存工具
+
+为变化频率很低的参考数据接口（板块列表、交易日历、节假日等）提供基于 Redis 的旁路缓存：
+命中时直接返回缓存结果，不再经线程池调用 xtdata；未命中时执行原查询并回填缓存。
+
+同时提供基于 Redis SETNX 的互斥锁，用于合并多个客户端同时触发的同一下载任务。
+
+Redis 为可选依赖：未安装 redis 包、未配置 redis.url 或 Redis 不可用时自动降级为直接查询，
+互斥锁降级为进程内锁，不影响接口可用性。
+"""
+import json
+import secrets
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from app.utils.logger import logger
+
+# 尝试导入 redis（可选依赖）
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+# 安装了 orjson 时用其序列化缓存值，否则回退到标准库 json
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    _loads = json.loads
+
+# 缓存过期时间（秒）
+TTL_DAY = 86400
+TTL_HOUR = 3600
+TTL_TEN_MINUTES = 600
+
+# Redis 出错后暂停访问的时间（秒），避免 Redis 宕机时每个请求都先等待一次连接失败
+_FAILURE_BACKOFF = 30.0
+
+# 仅当锁值仍为本次持有者的 token 时才删除，避免误删锁过期后被其他实例重新获取的锁
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_redis: Optional["aioredis.Redis"] = None
+_retry_at: float = 0.0
+
+# Redis 不可用时使用的进程内锁
+_local_locks: Set[str] = set()
+
+
+async def init_cache(url: Optional[str]):
+    """初始化 Redis 连接池（应用启动时调用）"""
+    global _redis
+    if not url:
+        logger.info("未配置 redis.url，响应缓存未启用")
+        return
+    if not REDIS_AVAILABLE:
+        logger.warning("redis 模块未安装，响应缓存未启用")
+        return
+    _redis = aioredis.Redis.from_url(url)
+    logger.info("响应缓存已启用")
+
+
+async def close_cache():
+    """关闭 Redis 连接池（应用关闭时调用）"""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def _get_client() -> Optional["aioredis.Redis"]:
+    """获取可用的 Redis 客户端；未启用或处于失败退避期时返回 None"""
+    if _redis is None or time.monotonic() < _retry_at:
+        return None
+    return _redis
+
+
+def _mark_failure(action: str, key: str, exc: Exception):
+    """记录 Redis 访问失败并进入退避期"""
+    global _retry_at
+    _retry_at = time.monotonic() + _FAILURE_BACKOFF
+    logger.warning(f"Redis {action}失败，{_FAILURE_BACKOFF:.0f} 秒内跳过缓存: key={key}, {type(exc).__name__}: {exc}")
+
+
+async def cached(key: str, ttl: int, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    旁路缓存：命中时返回缓存值，未命中时调用 fetch 并写入缓存
+
+    Redis 读写失败时直接返回 fetch 的结果（fail-open）。
+    缓存值为 JSON 兼容结构，命中时返回的是 dict/list，而非 pydantic 模型实例。
+
+    Args:
+        key: 缓存键
+        ttl: 过期时间（秒）
+        fetch: 未命中时执行的查询协程工厂
+
+    Returns:
+        查询结果
+    """
+    client = _get_client()
+    if client is None:
+        return await fetch()
+
+    try:
+        raw = await client.get(key)
+    except Exception as e:
+        _mark_failure("读取", key, e)
+        return await fetch()
+    if raw is not None:
+        return _loads(raw)
+
+    result = await fetch()
+    try:
+        await client.set(key, _dumps(jsonable_encoder(result)), ex=ttl)
+    except Exception as e:
+        _mark_failure("写入", key, e)
+    return result
+
+
+async def invalidate(*keys: str):
+    """删除缓存键（数据被修改时调用）"""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        await client.delete(*keys)
+    except Exception as e:
+        _mark_failure("删除", ",".join(keys), e)
+
+
+@asynccontextmanager
+async def exclusive(key: str, ttl: int) -> AsyncIterator[bool]:
+    """
+    互斥执行：同一键同一时间只有一个持有者，未获取到锁时立即返回而不等待
+
+    使用 SET NX EX 获取锁，ttl 保证持有者异常退出时锁最终释放；
+    Redis 未启用或出错时降级为进程内锁（仅对当前进程生效）。
+
+    Args:
+        key: 锁键
+        ttl: 锁过期时间（秒）
+
+    Yields:
+        是否获取到锁
+    """
+    token: Optional[str] = None
+    client = _get_client()
+    if client is not None:
+        token = secrets.token_hex(16)
+        try:
+            acquired = bool(await client.set(key, token, nx=True, ex=ttl))
+        except Exception as e:
+            _mark_failure("加锁", key, e)
+            token = None
+        else:
+            if not acquired:
+                yield False
+                return
+
+    if token is None:
+        if key in _local_locks:
+            yield False
+            return
+        _local_locks.add(key)
+
+    try:
+        yield True
+    finally:
+        if token is None:
+            _local_locks.discard(key)
+        else:
+            try:
+                await client.eval(_RELEASE_SCRIPT, 1, key, token)
+            except Exception as e:
+                _mark_failure("解锁", key, e)
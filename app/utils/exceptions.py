@@ -1,10 +1,12 @@
 """
 异常处理模块
 """
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import HTTPException, status
 
+from app.utils.logger import log_error
+
 
 class XTQuantException(Exception):
     """xtquant相关异常基类"""
@@ -54,40 +56,70 @@ def create_error_response(
     )
 
 
+# 异常类型 -> (默认错误码, 状态码)；按异常类的 MRO 查表，代替逐个 isinstance 判断
+_XTQUANT_ERROR_TABLE: Dict[type, Tuple[str, int]] = {
+    DataServiceException: ("DATA_SERVICE_ERROR", status.HTTP_400_BAD_REQUEST),
+    TradingServiceException: ("TRADING_SERVICE_ERROR", status.HTTP_400_BAD_REQUEST),
+    AuthenticationException: ("AUTHENTICATION_ERROR", status.HTTP_401_UNAUTHORIZED),
+    ConfigurationException: ("CONFIGURATION_ERROR", status.HTTP_500_INTERNAL_SERVER_ERROR),
+}
+
+# 数据服务中属于请求校验失败（如空列表）的错误码，使用422状态码
+# （直接写数值：新版 Starlette 访问 HTTP_422_UNPROCESSABLE_ENTITY 会在每次调用时发出弃用警告）
+_VALIDATION_ERROR_CODES = frozenset({"EMPTY_SYMBOLS", "INVALID_SYMBOLS"})
+_VALIDATION_STATUS = 422
+
+
+def _lookup_error(exc_type: type) -> Tuple[str, int]:
+    """按 MRO 查找异常类型对应的 (默认错误码, 状态码)"""
+    for cls in exc_type.__mro__:
+        entry = _XTQUANT_ERROR_TABLE.get(cls)
+        if entry is not None:
+            return entry
+    return "UNKNOWN_ERROR", status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
 def handle_xtquant_exception(exc: XTQuantException) -> HTTPException:
     """处理xtquant异常"""
-    if isinstance(exc, DataServiceException):
-        # 对于验证相关的错误（如空列表），使用422状态码
-        if exc.error_code in ["EMPTY_SYMBOLS", "INVALID_SYMBOLS"]:
-            status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
-        else:
-            status_code = status.HTTP_400_BAD_REQUEST
-        
-        return create_error_response(
-            message=exc.message,
-            error_code=exc.error_code or "DATA_SERVICE_ERROR",
-            status_code=status_code
-        )
-    elif isinstance(exc, TradingServiceException):
-        return create_error_response(
-            message=exc.message,
-            error_code=exc.error_code or "TRADING_SERVICE_ERROR",
-            status_code=status.HTTP_400_BAD_REQUEST
-        )
-    elif isinstance(exc, AuthenticationException):
-        return create_error_response(
-            message=exc.message,
-            error_code=exc.error_code or "AUTHENTICATION_ERROR",
-            status_code=status.HTTP_401_UNAUTHORIZED
-        )
-    elif isinstance(exc, ConfigurationException):
-        return create_error_response(
-            message=exc.message,
-            error_code=exc.error_code or "CONFIGURATION_ERROR",
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-    else:
-        return create_error_response(
-            message=exc.message,
-            error_code=exc.error_code or "UNKNOWN_ERROR"
+    default_code, status_code = _lookup_error(type(exc))
+    if exc.error_code in _VALIDATION_ERROR_CODES and isinstance(exc, DataServiceException):
+        status_code = _VALIDATION_STATUS
+
+    return HTTPException(
+        status_code=status_code,
+        detail={"message": exc.message, "error_code": exc.error_code or default_code}
+    )
+
+
+class ServiceErrorHandler:
+    """
+    路由统一异常转换（上下文管理器）
+
+    - XTQuantException：经 handle_xtquant_exception 转换为对应状态码
+    - HTTPException：原样抛出
+    - 其他异常：记录错误日志后转换为 500，消息为 "{message}: {异常信息}"
+
+    用法::
+
+        with ServiceErrorHandler("获取合约类型失败"):
+            result = await run_sync(...)
+            return format_response(data=result)
+    """
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __enter__(self) -> "ServiceErrorHandler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc is None or not isinstance(exc, Exception) or isinstance(exc, HTTPException):
+            return False
+        if isinstance(exc, XTQuantException):
+            raise handle_xtquant_exception(exc)
+        log_error(self.message, exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"message": f"{self.message}: {str(exc)}"}
         )
@@ -1,9 +1,28 @@
 """
 辅助函数模块
 """
+import functools
+import hashlib
+import time
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pydantic_core
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+
+@functools.lru_cache(maxsize=1)
+def _iso_second(second: int) -> str:
+    """格式化到秒的本地时间 ISO 前缀（同一秒内的调用命中缓存）"""
+    return datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def now_iso() -> str:
+    """当前本地时间的 ISO 8601 字符串（微秒精度），代替 datetime.now().isoformat()"""
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return f"{_iso_second(second)}.{nanos // 1000:06d}"
 
 
 def format_response(
@@ -17,7 +36,7 @@ def format_response(
         "success": success,
         "message": message,
         "code": code,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
     
     if data is not None:
@@ -26,6 +45,114 @@ def format_response(
     return response
 
 
+def model_response(content: Any) -> Response:
+    """
+    构建已序列化的 JSON 响应
+
+    由 pydantic-core 一次性将内容（含 pydantic 模型）序列化为 JSON 字节。路由直接返回该响应时，
+    FastAPI 不再按 response_model 重新校验，也不再经 jsonable_encoder 逐层遍历，
+    因此只用于服务层已返回校验过的模型的接口；NaN/Infinity 输出为 null，与 ORJSONResponse 一致
+    """
+    return Response(
+        content=pydantic_core.to_json(content, inf_nan_mode="null"),
+        media_type="application/json"
+    )
+
+
+def json_response(data: Any = None, message: str = "success") -> Response:
+    """构建已序列化的成功响应（format_response 格式），用于 Level2、完整tick 等数据量大的接口"""
+    return model_response(format_response(data=data, message=message))
+
+
+@functools.lru_cache(maxsize=256)
+def _flag_templates(field: str, message: str) -> Tuple[bytes, bytes, bytes]:
+    """预先序列化 flag_response 的固定部分：(timestamp 之前的前缀, data 为 true 的后缀, data 为 false 的后缀)"""
+    prefix = pydantic_core.to_json({"success": True, "message": message, "code": 200})[:-1] + b',"timestamp":"'
+    return (
+        prefix,
+        b'","data":' + pydantic_core.to_json({field: True}) + b"}",
+        b'","data":' + pydantic_core.to_json({field: False}) + b"}",
+    )
+
+
+def flag_response(field: str, value: bool, message: str) -> Response:
+    """
+    构建 data 只含一个布尔字段的成功响应（format_response 格式）
+
+    用于断开账户、撤单、连接状态等接口：信封按 (字段名, 消息) 预先序列化为字节模板，
+    每次请求只拼接时间戳，不再构建字典并逐层编码
+    """
+    prefix, true_suffix, false_suffix = _flag_templates(field, message)
+    return Response(
+        content=prefix + now_iso().encode() + (true_suffix if value else false_suffix),
+        media_type="application/json"
+    )
+
+
+# 流式响应每次写出的列表元素数（按批序列化，避免逐条切换线程）
+STREAM_CHUNK_SIZE = 256
+
+
+def stream_json_response(items: Sequence[Any], message: str = "success") -> StreamingResponse:
+    """
+    构建分块输出的成功响应（format_response 格式，data 为列表）
+
+    输出内容与 json_response 相同，但按批序列化列表元素并逐块发送：不再一次性生成完整 JSON 字节，
+    降低大结果的峰值内存；同步生成器由 Starlette 放入线程池迭代，序列化不占用事件循环
+    """
+    def generate() -> Iterator[bytes]:
+        # 信封中 data 固定为最后一个字段，去掉结尾的 "}" 后拼接列表
+        yield pydantic_core.to_json(format_response(message=message))[:-1] + b',"data":['
+        for start in range(0, len(items), STREAM_CHUNK_SIZE):
+            chunk = pydantic_core.to_json(items[start:start + STREAM_CHUNK_SIZE], inf_nan_mode="null")[1:-1]
+            yield chunk if start == 0 else b"," + chunk
+        yield b"]}"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """判断 If-None-Match 请求头是否命中当前 ETag（支持多值、弱校验前缀与 *）"""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def etag_response(
+    request: Request,
+    data: Any,
+    message: Optional[str] = None,
+    max_age: int = 300
+) -> Response:
+    """
+    构建带 ETag 的响应，客户端缓存仍有效时直接返回 304
+
+    ETag 由数据本身的 JSON 序列化结果计算（不含 format_response 中每次变化的 timestamp），
+    数据未变化时重复请求只返回 304，不再传输响应体。
+
+    Args:
+        request: 当前请求（读取 If-None-Match）
+        data: 响应数据
+        message: 提供时按 format_response 格式包装数据，否则直接返回数据本身
+        max_age: Cache-Control 缓存时间（秒）
+    """
+    payload = pydantic_core.to_json(data, inf_nan_mode="null")
+    etag = f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"max-age={max_age}"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if message is not None:
+        envelope = pydantic_core.to_json(format_response(message=message))
+        # 与 format_response 一致：data 为 None 时不输出 data 字段，否则作为最后一个字段拼接
+        payload = envelope if data is None else envelope[:-1] + b',"data":' + payload + b"}"
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
 def serialize_data(data: Any) -> Any:
     """序列化数据，处理特殊类型"""
     if isinstance(data, (datetime, date)):
@@ -8,6 +8,9 @@ from typing import Any, Dict, Optional
 
 from loguru import logger
 
+# 是否在错误日志中附带完整堆栈（由 configure_logging 按日志级别设置，仅 DEBUG 级别开启）
+_log_tracebacks = True
+
 
 def configure_logging(log_level: str = "INFO", 
                      log_file: str = "logs/app.log",
@@ -28,6 +31,9 @@ def configure_logging(log_level: str = "INFO",
         retention: 日志保留时间
         compression: 压缩格式
     """
+    global _log_tracebacks
+    _log_tracebacks = log_level.upper() == "DEBUG"
+
     # 移除默认的handler
     logger.remove()
     
@@ -226,6 +232,22 @@ def log_exception(exc: Exception, context: Optional[str] = None):
     )
 
 
+def log_error(message: str, exc: BaseException):
+    """
+    记录错误日志
+
+    DEBUG 级别下附带完整堆栈；其他级别只记录异常类型与信息，省去遍历栈帧、读取源码格式化 traceback 的开销
+
+    Args:
+        message: 错误描述
+        exc: 异常对象
+    """
+    if _log_tracebacks:
+        logger.opt(exception=exc, depth=1).error("{}: {}", message, exc)
+    else:
+        logger.opt(depth=1).error("{}: {}: {}", message, type(exc).__name__, exc)
+
+
 def log_performance(operation: str, duration_ms: float, threshold_ms: float = 1000):
     """
     记录性能日志
@@ -271,6 +293,7 @@ __all__ = [
     'log_xtquant_call',
     'log_xtquant_result',
     'log_exception',
+    'log_error',
     'log_performance',
     'log_data_operation',
 ]
@@ -0,0 +1,108 @@
+"""
+请求合并（single-flight）工具
+
+多个客户端同时请求相同参数的行情数据时，只向线程池提交一次 xtdata 调用，
+其余并发请求等待同一结果，避免突发流量下重复调用占满线程池。
+TTLSingleFlight 另将结果保留极短时间，供被高频轮询的查询接口合并连续的轮询。
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from pydantic import BaseModel
+
+
+def make_key(name: str, payload: BaseModel) -> str:
+    """
+    根据接口名与请求体生成合并键
+
+    同一模型的 JSON 序列化按字段定义顺序输出，相同参数得到相同的键；
+    接口名用于区分字段结构相同的不同接口（如 Level2 快照/逐笔委托/逐笔成交）
+    """
+    digest = hashlib.blake2b(payload.model_dump_json().encode("utf-8"), digest_size=16)
+    return f"{name}:{digest.hexdigest()}"
+
+
+class SingleFlight:
+    """
+    进程内请求合并器
+
+    同一键的调用在执行期间只会运行一次，并发的后续调用共享其结果或异常；
+    调用完成后键即被移除，之后的请求重新执行（不做结果缓存）。
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行或加入同一键的进行中调用
+
+        Args:
+            key: 合并键
+            coro_factory: 无进行中调用时执行的协程工厂
+
+        Returns:
+            调用结果
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        # shield：某个客户端断开取消等待时，不影响其他等待同一结果的请求
+        return await asyncio.shield(task)
+
+    def forget(self, prefix: str):
+        """移除以 prefix 开头的进行中调用，之后的请求重新执行（已在等待的请求仍得到原结果）"""
+        for key in [key for key in self._inflight if key.startswith(prefix)]:
+            del self._inflight[key]
+
+    def _done(self, key: str, task: asyncio.Task):
+        """调用完成后移除键（所有等待者都已取消时由此取走异常，避免未检索异常告警）"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+
+class TTLSingleFlight(SingleFlight):
+    """
+    带短时结果缓存的请求合并器
+
+    调用成功后结果保留 ttl 秒，期间同一键的请求直接返回该结果；失败结果不缓存。
+    数据被修改时调用 forget 移除相关键，进行中的调用完成后也不会再写入其结果。
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        super().__init__()
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._results: Dict[str, Tuple[float, Any]] = {}
+
+    async def do(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._results.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                return entry[1]
+            del self._results[key]
+        return await super().do(key, coro_factory)
+
+    def forget(self, prefix: str):
+        """移除以 prefix 开头的缓存结果与进行中调用"""
+        for key in [key for key in self._results if key.startswith(prefix)]:
+            del self._results[key]
+        super().forget(prefix)
+
+    def _done(self, key: str, task: asyncio.Task):
+        # 键仍指向本次调用（未被 forget）且成功时才缓存结果
+        store = self._inflight.get(key) is task and not task.cancelled() and task.exception() is None
+        super()._done(key, task)
+        if store:
+            if len(self._results) >= self._maxsize:
+                now = time.monotonic()
+                self._results = {k: v for k, v in self._results.items() if v[0] > now}
+                if len(self._results) >= self._maxsize:
+                    self._results.clear()
+            self._results[key] = (time.monotonic() + self._ttl, task.result())
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from generated import common_pb2 as common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rtrading.proto\x12\x0bqmt.trading\x1a\x0c\x63ommon.proto\"I\n\x0e\x43onnectRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\x12\x11\n\tclient_id\x18\x03 \x01(\x05\"\xe6\x01\n\x0b\x41\x63\x63ountInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12.\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\x0e\x32\x18.qmt.trading.AccountType\x12\x14\n\x0c\x61\x63\x63ount_name\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x0f\n\x07\x62\x61lance\x18\x05 \x01(\x01\x12\x19\n\x11\x61vailable_balance\x18\x06 \x01(\x01\x12\x16\n\x0e\x66rozen_balance\x18\x07 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x08 \x01(\x01\x12\x13\n\x0btotal_asset\x18\t \x01(\x01\"\x9b\x01\n\x0f\x43onnectResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12.\n\x0c\x61\x63\x63ount_info\x18\x04 \x01(\x0b\x32\x18.qmt.trading.AccountInfo\x12\"\n\x06status\x18\x05 \x01(\x0b\x32\x12.qmt.common.Status\"\'\n\x11\x44isconnectRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"Z\n\x12\x44isconnectResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x06status\x18\x03 \x01(\x0b\x32\x12.qmt.common.Status\"%\n\x0fPositionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xe7\x01\n\x0cPositionInfo\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x12\n\nstock_name\x18\x02 \x01(\t\x12\x0e\n\x06volume\x18\x03 \x01(\x03\x12\x18\n\x10\x61vailable_volume\x18\x04 \x01(\x03\x12\x15\n\rfrozen_volume\x18\x05 \x01(\x03\x12\x12\n\ncost_price\x18\x06 \x01(\x01\x12\x14\n\x0cmarket_price\x18\x07 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x08 \x01(\x01\x12\x13\n\x0bprofit_loss\x18\t \x01(\x01\x12\x19\n\x11profit_loss_ratio\x18\n \x01(\x01\"h\n\x14PositionListResponse\x12,\n\tpositions\x18\x01 \x03(\x0b\x32\x19.qmt.trading.PositionInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"\xbe\x01\n\x0cOrderRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12$\n\x04side\x18\x03 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12*\n\norder_type\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderType\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12\x15\n\rstrategy_name\x18\x07 \x01(\t\"\xa9\x02\n\tOrderInfo\x12\x10\n\x08order_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12$\n\x04side\x18\x03 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12*\n\norder_type\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderType\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12(\n\x06status\x18\x07 \x01(\x0e\x32\x18.qmt.trading.OrderStatus\x12\x16\n\x0esubmitted_time\x18\x08 \x01(\t\x12\x15\n\rfilled_volume\x18\t \x01(\x03\x12\x15\n\rfilled_amount\x18\n \x01(\x01\x12\x15\n\raverage_price\x18\x0b \x01(\x01\"Z\n\rOrderResponse\x12%\n\x05order\x18\x01 \x01(\x0b\x32\x16.qmt.trading.OrderInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\":\n\x12\x43\x61ncelOrderRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\"[\n\x13\x43\x61ncelOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x06status\x18\x03 \x01(\x0b\x32\x12.qmt.common.Status\"L\n\x10OrderListRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x12\n\nstart_date\x18\x02 \x01(\t\x12\x10\n\x08\x65nd_date\x18\x03 \x01(\t\"_\n\x11OrderListResponse\x12&\n\x06orders\x18\x01 \x03(\x0b\x32\x16.qmt.trading.OrderInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"&\n\x10TradeListRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xc0\x01\n\tTradeInfo\x12\x10\n\x08trade_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12$\n\x04side\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x01\x12\x12\n\ntrade_time\x18\x08 \x01(\t\x12\x12\n\ncommission\x18\t \x01(\x01\"_\n\x11TradeListResponse\x12&\n\x06trades\x18\x01 \x03(\x0b\x32\x16.qmt.trading.TradeInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"\"\n\x0c\x41ssetRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xa1\x01\n\tAssetInfo\x12\x13\n\x0btotal_asset\x18\x01 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x02 \x01(\x01\x12\x0c\n\x04\x63\x61sh\x18\x03 \x01(\x01\x12\x13\n\x0b\x66rozen_cash\x18\x04 \x01(\x01\x12\x16\n\x0e\x61vailable_cash\x18\x05 \x01(\x01\x12\x13\n\x0bprofit_loss\x18\x06 \x01(\x01\x12\x19\n\x11profit_loss_ratio\x18\x07 \x01(\x01\"Z\n\rAssetResponse\x12%\n\x05\x61sset\x18\x01 \x01(\x0b\x32\x16.qmt.trading.AssetInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"%\n\x0fRiskInfoRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\x98\x01\n\x10RiskInfoResponse\x12\x16\n\x0eposition_ratio\x18\x01 \x01(\x01\x12\x12\n\ncash_ratio\x18\x02 \x01(\x01\x12\x14\n\x0cmax_drawdown\x18\x03 \x01(\x01\x12\x0e\n\x06var_95\x18\x04 \x01(\x01\x12\x0e\n\x06var_99\x18\x05 \x01(\x01\x12\"\n\x06status\x18\x06 \x01(\x0b\x32\x12.qmt.common.Status\")\n\x13StrategyListRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xee\x01\n\x0cStrategyInfo\x12\x15\n\rstrategy_name\x18\x01 \x01(\t\x12\x15\n\rstrategy_type\x18\x02 \x01(\t\x12\x0e\n\x06status\x18\x03 \x01(\t\x12\x14\n\x0c\x63reated_time\x18\x04 \x01(\t\x12\x18\n\x10last_update_time\x18\x05 \x01(\t\x12=\n\nparameters\x18\x06 \x03(\x0b\x32).qmt.trading.StrategyInfo.ParametersEntry\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"i\n\x14StrategyListResponse\x12-\n\nstrategies\x18\x01 \x03(\x0b\x32\x19.qmt.trading.StrategyInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"\xc3\x01\n\x11\x41syncOrderRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12$\n\x04side\x18\x03 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12*\n\norder_type\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderType\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12\x15\n\rstrategy_name\x18\x07 \x01(\t\"\xa8\x01\n\x12\x41syncOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\x12\x12\n\nstock_code\x18\x04 \x01(\t\x12\x0c\n\x04side\x18\x05 \x01(\t\x12\x0e\n\x06volume\x18\x06 \x01(\x03\x12\r\n\x05price\x18\x07 \x01(\x01\x12\"\n\x06status\x18\x08 \x01(\x0b\x32\x12.qmt.common.Status\"O\n\x12\x41syncCancelRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x13\n\x0border_sysid\x18\x03 \x01(\t\"z\n\x13\x41syncCancelResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\x12\x10\n\x08order_id\x18\x04 \x01(\t\x12\"\n\x06status\x18\x05 \x01(\x0b\x32\x12.qmt.common.Status\",\n\x16TradingCallbackRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\"\xa5\x04\n\x16TradingCallbackMessage\x12\x37\n\rcallback_type\x18\x01 \x01(\x0e\x32 .qmt.trading.TradingCallbackType\x12\x12\n\naccount_id\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\t\x12\x0b\n\x03seq\x18\x04 \x01(\x03\x12\x34\n\norder_data\x18\n \x01(\x0b\x32\x1e.qmt.trading.OrderCallbackDataH\x00\x12\x34\n\ntrade_data\x18\x0b \x01(\x0b\x32\x1e.qmt.trading.TradeCallbackDataH\x00\x12:\n\rposition_data\x18\x0c \x01(\x0b\x32!.qmt.trading.PositionCallbackDataH\x00\x12\x34\n\nasset_data\x18\r \x01(\x0b\x32\x1e.qmt.trading.AssetCallbackDataH\x00\x12\x34\n\nerror_data\x18\x0e \x01(\x0b\x32\x1e.qmt.trading.ErrorCallbackDataH\x00\x12?\n\x10\x61sync_order_data\x18\x0f \x01(\x0b\x32#.qmt.trading.AsyncOrderCallbackDataH\x00\x12\x41\n\x11\x61sync_cancel_data\x18\x10 \x01(\x0b\x32$.qmt.trading.AsyncCancelCallbackDataH\x00\x42\x06\n\x04\x64\x61ta\"\x89\x02\n\x11OrderCallbackData\x12\x10\n\x08order_id\x18\x01 \x01(\t\x12\x13\n\x0border_sysid\x18\x02 \x01(\t\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12\x12\n\nstock_name\x18\x04 \x01(\t\x12\x0c\n\x04side\x18\x05 \x01(\t\x12\x12\n\norder_type\x18\x06 \x01(\t\x12\x0e\n\x06volume\x18\x07 \x01(\x03\x12\r\n\x05price\x18\x08 \x01(\x01\x12\x0e\n\x06status\x18\t \x01(\t\x12\x12\n\nstatus_msg\x18\n \x01(\t\x12\x15\n\rfilled_volume\x18\x0b \x01(\x03\x12\x15\n\rfilled_amount\x18\x0c \x01(\x01\x12\x12\n\norder_time\x18\r \x01(\t\"\xd9\x01\n\x11TradeCallbackData\x12\x10\n\x08trade_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x13\n\x0border_sysid\x18\x03 \x01(\t\x12\x12\n\nstock_code\x18\x04 \x01(\t\x12\x12\n\nstock_name\x18\x05 \x01(\t\x12\x0c\n\x04side\x18\x06 \x01(\t\x12\x0e\n\x06volume\x18\x07 \x01(\x03\x12\r\n\x05price\x18\x08 \x01(\x01\x12\x0e\n\x06\x61mount\x18\t \x01(\x01\x12\x12\n\ntrade_time\x18\n \x01(\t\x12\x12\n\ncommission\x18\x0b \x01(\x01\"\xd4\x01\n\x14PositionCallbackData\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x12\n\nstock_name\x18\x02 \x01(\t\x12\x0e\n\x06volume\x18\x03 \x01(\x03\x12\x18\n\x10\x61vailable_volume\x18\x04 \x01(\x03\x12\x15\n\rfrozen_volume\x18\x05 \x01(\x03\x12\x12\n\ncost_price\x18\x06 \x01(\x01\x12\x14\n\x0cmarket_price\x18\x07 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x08 \x01(\x01\x12\x13\n\x0bprofit_loss\x18\t \x01(\x01\"y\n\x11\x41ssetCallbackData\x12\x13\n\x0btotal_asset\x18\x01 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x02 \x01(\x01\x12\x0c\n\x04\x63\x61sh\x18\x03 \x01(\x01\x12\x13\n\x0b\x66rozen_cash\x18\x04 \x01(\x01\x12\x16\n\x0e\x61vailable_cash\x18\x05 \x01(\x01\"L\n\x11\x45rrorCallbackData\x12\x12\n\nerror_code\x18\x01 \x01(\t\x12\x11\n\terror_msg\x18\x02 \x01(\t\x12\x10\n\x08order_id\x18\x03 \x01(\t\"J\n\x16\x41syncOrderCallbackData\x12\x0b\n\x03seq\x18\x01 \x01(\x03\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x11\n\terror_msg\x18\x03 \x01(\t\"K\n\x17\x41syncCancelCallbackData\x12\x0b\n\x03seq\x18\x01 \x01(\x03\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x11\n\terror_msg\x18\x03 \x01(\t*\xb7\x01\n\x0b\x41\x63\x63ountType\x12\x1c\n\x18\x41\x43\x43OUNT_TYPE_UNSPECIFIED\x10\x00\x12\x17\n\x13\x41\x43\x43OUNT_TYPE_FUTURE\x10\x01\x12\x19\n\x15\x41\x43\x43OUNT_TYPE_SECURITY\x10\x02\x12\x17\n\x13\x41\x43\x43OUNT_TYPE_CREDIT\x10\x03\x12\x1e\n\x1a\x41\x43\x43OUNT_TYPE_FUTURE_OPTION\x10\x04\x12\x1d\n\x19\x41\x43\x43OUNT_TYPE_STOCK_OPTION\x10\x05*P\n\tOrderSide\x12\x1a\n\x16ORDER_SIDE_UNSPECIFIED\x10\x00\x12\x12\n\x0eORDER_SIDE_BUY\x10\x01\x12\x13\n\x0fORDER_SIDE_SELL\x10\x02*\x84\x01\n\tOrderType\x12\x1a\n\x16ORDER_TYPE_UNSPECIFIED\x10\x00\x12\x15\n\x11ORDER_TYPE_MARKET\x10\x01\x12\x14\n\x10ORDER_TYPE_LIMIT\x10\x02\x12\x13\n\x0fORDER_TYPE_STOP\x10\x03\x12\x19\n\x15ORDER_TYPE_STOP_LIMIT\x10\x04*\xd2\x01\n\x0bOrderStatus\x12\x1c\n\x18ORDER_STATUS_UNSPECIFIED\x10\x00\x12\x18\n\x14ORDER_STATUS_PENDING\x10\x01\x12\x1a\n\x16ORDER_STATUS_SUBMITTED\x10\x02\x12\x1f\n\x1bORDER_STATUS_PARTIAL_FILLED\x10\x03\x12\x17\n\x13ORDER_STATUS_FILLED\x10\x04\x12\x1a\n\x16ORDER_STATUS_CANCELLED\x10\x05\x12\x19\n\x15ORDER_STATUS_REJECTED\x10\x06*\x95\x03\n\x13TradingCallbackType\x12\x1d\n\x19\x43\x41LLBACK_TYPE_UNSPECIFIED\x10\x00\x12\x1b\n\x17\x43\x41LLBACK_TYPE_CONNECTED\x10\x01\x12\x1e\n\x1a\x43\x41LLBACK_TYPE_DISCONNECTED\x10\x02\x12 \n\x1c\x43\x41LLBACK_TYPE_ACCOUNT_STATUS\x10\x03\x12\x17\n\x13\x43\x41LLBACK_TYPE_ASSET\x10\x04\x12\x17\n\x13\x43\x41LLBACK_TYPE_ORDER\x10\x05\x12\x17\n\x13\x43\x41LLBACK_TYPE_TRADE\x10\x06\x12\x1a\n\x16\x43\x41LLBACK_TYPE_POSITION\x10\x07\x12\x1d\n\x19\x43\x41LLBACK_TYPE_ORDER_ERROR\x10\x08\x12\x1e\n\x1a\x43\x41LLBACK_TYPE_CANCEL_ERROR\x10\t\x12\x1d\n\x19\x43\x41LLBACK_TYPE_ASYNC_ORDER\x10\n\x12\x1e\n\x1a\x43\x41LLBACK_TYPE_ASYNC_CANCEL\x10\x0b\x12\x1b\n\x17\x43\x41LLBACK_TYPE_HEARTBEAT\x10\x0c\x32\xed\x08\n\x0eTradingService\x12\x44\n\x07\x43onnect\x12\x1b.qmt.trading.ConnectRequest\x1a\x1c.qmt.trading.ConnectResponse\x12M\n\nDisconnect\x12\x1e.qmt.trading.DisconnectRequest\x1a\x1f.qmt.trading.DisconnectResponse\x12N\n\x0eGetAccountInfo\x12\x1e.qmt.trading.DisconnectRequest\x1a\x1c.qmt.trading.ConnectResponse\x12O\n\x0cGetPositions\x12\x1c.qmt.trading.PositionRequest\x1a!.qmt.trading.PositionListResponse\x12\x44\n\x0bSubmitOrder\x12\x19.qmt.trading.OrderRequest\x1a\x1a.qmt.trading.OrderResponse\x12P\n\x0b\x43\x61ncelOrder\x12\x1f.qmt.trading.CancelOrderRequest\x1a .qmt.trading.CancelOrderResponse\x12J\n\tGetOrders\x12\x1d.qmt.trading.OrderListRequest\x1a\x1e.qmt.trading.OrderListResponse\x12J\n\tGetTrades\x12\x1d.qmt.trading.TradeListRequest\x1a\x1e.qmt.trading.TradeListResponse\x12\x41\n\x08GetAsset\x12\x19.qmt.trading.AssetRequest\x1a\x1a.qmt.trading.AssetResponse\x12J\n\x0bGetRiskInfo\x12\x1c.qmt.trading.RiskInfoRequest\x1a\x1d.qmt.trading.RiskInfoResponse\x12T\n\rGetStrategies\x12 .qmt.trading.StrategyListRequest\x1a!.qmt.trading.StrategyListResponse\x12S\n\x10SubmitOrderAsync\x12\x1e.qmt.trading.AsyncOrderRequest\x1a\x1f.qmt.trading.AsyncOrderResponse\x12U\n\x10\x43\x61ncelOrderAsync\x12\x1f.qmt.trading.AsyncCancelRequest\x1a .qmt.trading.AsyncCancelResponse\x12\x64\n\x16StreamTradingCallbacks\x12#.qmt.trading.TradingCallbackRequest\x1a#.qmt.trading.TradingCallbackMessage0\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rtrading.proto\x12\x0bqmt.trading\x1a\x0c\x63ommon.proto\"I\n\x0e\x43onnectRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\x12\x11\n\tclient_id\x18\x03 \x01(\x05\"\xe6\x01\n\x0b\x41\x63\x63ountInfo\x12\x12\n\naccount_id\x18\x01 \x01(\t\x12.\n\x0c\x61\x63\x63ount_type\x18\x02 \x01(\x0e\x32\x18.qmt.trading.AccountType\x12\x14\n\x0c\x61\x63\x63ount_name\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x0f\n\x07\x62\x61lance\x18\x05 \x01(\x01\x12\x19\n\x11\x61vailable_balance\x18\x06 \x01(\x01\x12\x16\n\x0e\x66rozen_balance\x18\x07 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x08 \x01(\x01\x12\x13\n\x0btotal_asset\x18\t \x01(\x01\"\x9b\x01\n\x0f\x43onnectResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12.\n\x0c\x61\x63\x63ount_info\x18\x04 \x01(\x0b\x32\x18.qmt.trading.AccountInfo\x12\"\n\x06status\x18\x05 \x01(\x0b\x32\x12.qmt.common.Status\"\'\n\x11\x44isconnectRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"Z\n\x12\x44isconnectResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x06status\x18\x03 \x01(\x0b\x32\x12.qmt.common.Status\"%\n\x0fPositionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xe7\x01\n\x0cPositionInfo\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x12\n\nstock_name\x18\x02 \x01(\t\x12\x0e\n\x06volume\x18\x03 \x01(\x03\x12\x18\n\x10\x61vailable_volume\x18\x04 \x01(\x03\x12\x15\n\rfrozen_volume\x18\x05 \x01(\x03\x12\x12\n\ncost_price\x18\x06 \x01(\x01\x12\x14\n\x0cmarket_price\x18\x07 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x08 \x01(\x01\x12\x13\n\x0bprofit_loss\x18\t \x01(\x01\x12\x19\n\x11profit_loss_ratio\x18\n \x01(\x01\"h\n\x14PositionListResponse\x12,\n\tpositions\x18\x01 \x03(\x0b\x32\x19.qmt.trading.PositionInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"\xbe\x01\n\x0cOrderRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12$\n\x04side\x18\x03 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12*\n\norder_type\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderType\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12\x15\n\rstrategy_name\x18\x07 \x01(\t\"\xa9\x02\n\tOrderInfo\x12\x10\n\x08order_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12$\n\x04side\x18\x03 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12*\n\norder_type\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderType\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12(\n\x06status\x18\x07 \x01(\x0e\x32\x18.qmt.trading.OrderStatus\x12\x16\n\x0esubmitted_time\x18\x08 \x01(\t\x12\x15\n\rfilled_volume\x18\t \x01(\x03\x12\x15\n\rfilled_amount\x18\n \x01(\x01\x12\x15\n\raverage_price\x18\x0b \x01(\x01\"Z\n\rOrderResponse\x12%\n\x05order\x18\x01 \x01(\x0b\x32\x16.qmt.trading.OrderInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\":\n\x12\x43\x61ncelOrderRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\"[\n\x13\x43\x61ncelOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x06status\x18\x03 \x01(\x0b\x32\x12.qmt.common.Status\"L\n\x10OrderListRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x12\n\nstart_date\x18\x02 \x01(\t\x12\x10\n\x08\x65nd_date\x18\x03 \x01(\t\"_\n\x11OrderListResponse\x12&\n\x06orders\x18\x01 \x03(\x0b\x32\x16.qmt.trading.OrderInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"&\n\x10TradeListRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xc0\x01\n\tTradeInfo\x12\x10\n\x08trade_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12$\n\x04side\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12\x0e\n\x06\x61mount\x18\x07 \x01(\x01\x12\x12\n\ntrade_time\x18\x08 \x01(\t\x12\x12\n\ncommission\x18\t \x01(\x01\"_\n\x11TradeListResponse\x12&\n\x06trades\x18\x01 \x03(\x0b\x32\x16.qmt.trading.TradeInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"\"\n\x0c\x41ssetRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xa1\x01\n\tAssetInfo\x12\x13\n\x0btotal_asset\x18\x01 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x02 \x01(\x01\x12\x0c\n\x04\x63\x61sh\x18\x03 \x01(\x01\x12\x13\n\x0b\x66rozen_cash\x18\x04 \x01(\x01\x12\x16\n\x0e\x61vailable_cash\x18\x05 \x01(\x01\x12\x13\n\x0bprofit_loss\x18\x06 \x01(\x01\x12\x19\n\x11profit_loss_ratio\x18\x07 \x01(\x01\"Z\n\rAssetResponse\x12%\n\x05\x61sset\x18\x01 \x01(\x0b\x32\x16.qmt.trading.AssetInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"%\n\x0fRiskInfoRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\x98\x01\n\x10RiskInfoResponse\x12\x16\n\x0eposition_ratio\x18\x01 \x01(\x01\x12\x12\n\ncash_ratio\x18\x02 \x01(\x01\x12\x14\n\x0cmax_drawdown\x18\x03 \x01(\x01\x12\x0e\n\x06var_95\x18\x04 \x01(\x01\x12\x0e\n\x06var_99\x18\x05 \x01(\x01\x12\"\n\x06status\x18\x06 \x01(\x0b\x32\x12.qmt.common.Status\")\n\x13StrategyListRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xee\x01\n\x0cStrategyInfo\x12\x15\n\rstrategy_name\x18\x01 \x01(\t\x12\x15\n\rstrategy_type\x18\x02 \x01(\t\x12\x0e\n\x06status\x18\x03 \x01(\t\x12\x14\n\x0c\x63reated_time\x18\x04 \x01(\t\x12\x18\n\x10last_update_time\x18\x05 \x01(\t\x12=\n\nparameters\x18\x06 \x03(\x0b\x32).qmt.trading.StrategyInfo.ParametersEntry\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"i\n\x14StrategyListResponse\x12-\n\nstrategies\x18\x01 \x03(\x0b\x32\x19.qmt.trading.StrategyInfo\x12\"\n\x06status\x18\x02 \x01(\x0b\x32\x12.qmt.common.Status\"\xae\x01\n\x0cQueryRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x11\n\x07\x61\x63\x63ount\x18\x02 \x01(\x08H\x00\x12\x13\n\tpositions\x18\x03 \x01(\x08H\x00\x12\x10\n\x06orders\x18\x04 \x01(\x08H\x00\x12\x10\n\x06trades\x18\x05 \x01(\x08H\x00\x12\x0f\n\x05\x61sset\x18\x06 \x01(\x08H\x00\x12\x0e\n\x04risk\x18\x07 \x01(\x08H\x00\x12\x14\n\nstrategies\x18\x08 \x01(\x08H\x00\x42\x07\n\x05query\"\xfc\x02\n\rQueryResponse\x12/\n\x07\x61\x63\x63ount\x18\x01 \x01(\x0b\x32\x1c.qmt.trading.ConnectResponseH\x00\x12\x36\n\tpositions\x18\x02 \x01(\x0b\x32!.qmt.trading.PositionListResponseH\x00\x12\x30\n\x06orders\x18\x03 \x01(\x0b\x32\x1e.qmt.trading.OrderListResponseH\x00\x12\x30\n\x06trades\x18\x04 \x01(\x0b\x32\x1e.qmt.trading.TradeListResponseH\x00\x12+\n\x05\x61sset\x18\x05 \x01(\x0b\x32\x1a.qmt.trading.AssetResponseH\x00\x12-\n\x04risk\x18\x06 \x01(\x0b\x32\x1d.qmt.trading.RiskInfoResponseH\x00\x12\x37\n\nstrategies\x18\x07 \x01(\x0b\x32!.qmt.trading.StrategyListResponseH\x00\x42\t\n\x07payload\"\xc3\x01\n\x11\x41syncOrderRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x12\n\nstock_code\x18\x02 \x01(\t\x12$\n\x04side\x18\x03 \x01(\x0e\x32\x16.qmt.trading.OrderSide\x12*\n\norder_type\x18\x04 \x01(\x0e\x32\x16.qmt.trading.OrderType\x12\x0e\n\x06volume\x18\x05 \x01(\x03\x12\r\n\x05price\x18\x06 \x01(\x01\x12\x15\n\rstrategy_name\x18\x07 \x01(\t\"\xa8\x01\n\x12\x41syncOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\x12\x12\n\nstock_code\x18\x04 \x01(\t\x12\x0c\n\x04side\x18\x05 \x01(\t\x12\x0e\n\x06volume\x18\x06 \x01(\x03\x12\r\n\x05price\x18\x07 \x01(\x01\x12\"\n\x06status\x18\x08 \x01(\x0b\x32\x12.qmt.common.Status\"O\n\x12\x41syncCancelRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x13\n\x0border_sysid\x18\x03 \x01(\t\"z\n\x13\x41syncCancelResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x03\x12\x10\n\x08order_id\x18\x04 \x01(\t\x12\"\n\x06status\x18\x05 \x01(\x0b\x32\x12.qmt.common.Status\",\n\x16TradingCallbackRequest\x12\x12\n\naccount_id\x18\x01 \x01(\t\"\xa5\x04\n\x16TradingCallbackMessage\x12\x37\n\rcallback_type\x18\x01 \x01(\x0e\x32 .qmt.trading.TradingCallbackType\x12\x12\n\naccount_id\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\t\x12\x0b\n\x03seq\x18\x04 \x01(\x03\x12\x34\n\norder_data\x18\n \x01(\x0b\x32\x1e.qmt.trading.OrderCallbackDataH\x00\x12\x34\n\ntrade_data\x18\x0b \x01(\x0b\x32\x1e.qmt.trading.TradeCallbackDataH\x00\x12:\n\rposition_data\x18\x0c \x01(\x0b\x32!.qmt.trading.PositionCallbackDataH\x00\x12\x34\n\nasset_data\x18\r \x01(\x0b\x32\x1e.qmt.trading.AssetCallbackDataH\x00\x12\x34\n\nerror_data\x18\x0e \x01(\x0b\x32\x1e.qmt.trading.ErrorCallbackDataH\x00\x12?\n\x10\x61sync_order_data\x18\x0f \x01(\x0b\x32#.qmt.trading.AsyncOrderCallbackDataH\x00\x12\x41\n\x11\x61sync_cancel_data\x18\x10 \x01(\x0b\x32$.qmt.trading.AsyncCancelCallbackDataH\x00\x42\x06\n\x04\x64\x61ta\"M\n\x14TradingCallbackBatch\x12\x35\n\x08messages\x18\x01 \x03(\x0b\x32#.qmt.trading.TradingCallbackMessage\"\x89\x02\n\x11OrderCallbackData\x12\x10\n\x08order_id\x18\x01 \x01(\t\x12\x13\n\x0border_sysid\x18\x02 \x01(\t\x12\x12\n\nstock_code\x18\x03 \x01(\t\x12\x12\n\nstock_name\x18\x04 \x01(\t\x12\x0c\n\x04side\x18\x05 \x01(\t\x12\x12\n\norder_type\x18\x06 \x01(\t\x12\x0e\n\x06volume\x18\x07 \x01(\x03\x12\r\n\x05price\x18\x08 \x01(\x01\x12\x0e\n\x06status\x18\t \x01(\t\x12\x12\n\nstatus_msg\x18\n \x01(\t\x12\x15\n\rfilled_volume\x18\x0b \x01(\x03\x12\x15\n\rfilled_amount\x18\x0c \x01(\x01\x12\x12\n\norder_time\x18\r \x01(\t\"\xd9\x01\n\x11TradeCallbackData\x12\x10\n\x08trade_id\x18\x01 \x01(\t\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x13\n\x0border_sysid\x18\x03 \x01(\t\x12\x12\n\nstock_code\x18\x04 \x01(\t\x12\x12\n\nstock_name\x18\x05 \x01(\t\x12\x0c\n\x04side\x18\x06 \x01(\t\x12\x0e\n\x06volume\x18\x07 \x01(\x03\x12\r\n\x05price\x18\x08 \x01(\x01\x12\x0e\n\x06\x61mount\x18\t \x01(\x01\x12\x12\n\ntrade_time\x18\n \x01(\t\x12\x12\n\ncommission\x18\x0b \x01(\x01\"\xd4\x01\n\x14PositionCallbackData\x12\x12\n\nstock_code\x18\x01 \x01(\t\x12\x12\n\nstock_name\x18\x02 \x01(\t\x12\x0e\n\x06volume\x18\x03 \x01(\x03\x12\x18\n\x10\x61vailable_volume\x18\x04 \x01(\x03\x12\x15\n\rfrozen_volume\x18\x05 \x01(\x03\x12\x12\n\ncost_price\x18\x06 \x01(\x01\x12\x14\n\x0cmarket_price\x18\x07 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x08 \x01(\x01\x12\x13\n\x0bprofit_loss\x18\t \x01(\x01\"y\n\x11\x41ssetCallbackData\x12\x13\n\x0btotal_asset\x18\x01 \x01(\x01\x12\x14\n\x0cmarket_value\x18\x02 \x01(\x01\x12\x0c\n\x04\x63\x61sh\x18\x03 \x01(\x01\x12\x13\n\x0b\x66rozen_cash\x18\x04 \x01(\x01\x12\x16\n\x0e\x61vailable_cash\x18\x05 \x01(\x01\"L\n\x11\x45rrorCallbackData\x12\x12\n\nerror_code\x18\x01 \x01(\t\x12\x11\n\terror_msg\x18\x02 \x01(\t\x12\x10\n\x08order_id\x18\x03 \x01(\t\"J\n\x16\x41syncOrderCallbackData\x12\x0b\n\x03seq\x18\x01 \x01(\x03\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x11\n\terror_msg\x18\x03 \x01(\t\"K\n\x17\x41syncCancelCallbackData\x12\x0b\n\x03seq\x18\x01 \x01(\x03\x12\x10\n\x08order_id\x18\x02 \x01(\t\x12\x11\n\terror_msg\x18\x03 \x01(\t*\xb7\x01\n\x0b\x41\x63\x63ountType\x12\x1c\n\x18\x41\x43\x43OUNT_TYPE_UNSPECIFIED\x10\x00\x12\x17\n\x13\x41\x43\x43OUNT_TYPE_FUTURE\x10\x01\x12\x19\n\x15\x41\x43\x43OUNT_TYPE_SECURITY\x10\x02\x12\x17\n\x13\x41\x43\x43OUNT_TYPE_CREDIT\x10\x03\x12\x1e\n\x1a\x41\x43\x43OUNT_TYPE_FUTURE_OPTION\x10\x04\x12\x1d\n\x19\x41\x43\x43OUNT_TYPE_STOCK_OPTION\x10\x05*P\n\tOrderSide\x12\x1a\n\x16ORDER_SIDE_UNSPECIFIED\x10\x00\x12\x12\n\x0eORDER_SIDE_BUY\x10\x01\x12\x13\n\x0fORDER_SIDE_SELL\x10\x02*\x84\x01\n\tOrderType\x12\x1a\n\x16ORDER_TYPE_UNSPECIFIED\x10\x00\x12\x15\n\x11ORDER_TYPE_MARKET\x10\x01\x12\x14\n\x10ORDER_TYPE_LIMIT\x10\x02\x12\x13\n\x0fORDER_TYPE_STOP\x10\x03\x12\x19\n\x15ORDER_TYPE_STOP_LIMIT\x10\x04*\xd2\x01\n\x0bOrderStatus\x12\x1c\n\x18ORDER_STATUS_UNSPECIFIED\x10\x00\x12\x18\n\x14ORDER_STATUS_PENDING\x10\x01\x12\x1a\n\x16ORDER_STATUS_SUBMITTED\x10\x02\x12\x1f\n\x1bORDER_STATUS_PARTIAL_FILLED\x10\x03\x12\x17\n\x13ORDER_STATUS_FILLED\x10\x04\x12\x1a\n\x16ORDER_STATUS_CANCELLED\x10\x05\x12\x19\n\x15ORDER_STATUS_REJECTED\x10\x06*\x95\x03\n\x13TradingCallbackType\x12\x1d\n\x19\x43\x41LLBACK_TYPE_UNSPECIFIED\x10\x00\x12\x1b\n\x17\x43\x41LLBACK_TYPE_CONNECTED\x10\x01\x12\x1e\n\x1a\x43\x41LLBACK_TYPE_DISCONNECTED\x10\x02\x12 \n\x1c\x43\x41LLBACK_TYPE_ACCOUNT_STATUS\x10\x03\x12\x17\n\x13\x43\x41LLBACK_TYPE_ASSET\x10\x04\x12\x17\n\x13\x43\x41LLBACK_TYPE_ORDER\x10\x05\x12\x17\n\x13\x43\x41LLBACK_TYPE_TRADE\x10\x06\x12\x1a\n\x16\x43\x41LLBACK_TYPE_POSITION\x10\x07\x12\x1d\n\x19\x43\x41LLBACK_TYPE_ORDER_ERROR\x10\x08\x12\x1e\n\x1a\x43\x41LLBACK_TYPE_CANCEL_ERROR\x10\t\x12\x1d\n\x19\x43\x41LLBACK_TYPE_ASYNC_ORDER\x10\n\x12\x1e\n\x1a\x43\x41LLBACK_TYPE_ASYNC_CANCEL\x10\x0b\x12\x1b\n\x17\x43\x41LLBACK_TYPE_HEARTBEAT\x10\x0c\x32\xf2\n\n\x0eTradingService\x12\x44\n\x07\x43onnect\x12\x1b.qmt.trading.ConnectRequest\x1a\x1c.qmt.trading.ConnectResponse\x12M\n\nDisconnect\x12\x1e.qmt.trading.DisconnectRequest\x1a\x1f.qmt.trading.DisconnectResponse\x12N\n\x0eGetAccountInfo\x12\x1e.qmt.trading.DisconnectRequest\x1a\x1c.qmt.trading.ConnectResponse\x12O\n\x0cGetPositions\x12\x1c.qmt.trading.PositionRequest\x1a!.qmt.trading.PositionListResponse\x12\x44\n\x0bSubmitOrder\x12\x19.qmt.trading.OrderRequest\x1a\x1a.qmt.trading.OrderResponse\x12N\n\x11SubmitOrderStream\x12\x19.qmt.trading.OrderRequest\x1a\x1a.qmt.trading.OrderResponse(\x01\x30\x01\x12P\n\x0b\x43\x61ncelOrder\x12\x1f.qmt.trading.CancelOrderRequest\x1a .qmt.trading.CancelOrderResponse\x12J\n\tGetOrders\x12\x1d.qmt.trading.OrderListRequest\x1a\x1e.qmt.trading.OrderListResponse\x12J\n\tGetTrades\x12\x1d.qmt.trading.TradeListRequest\x1a\x1e.qmt.trading.TradeListResponse\x12\x41\n\x08GetAsset\x12\x19.qmt.trading.AssetRequest\x1a\x1a.qmt.trading.AssetResponse\x12J\n\x0bGetRiskInfo\x12\x1c.qmt.trading.RiskInfoRequest\x1a\x1d.qmt.trading.RiskInfoResponse\x12T\n\rGetStrategies\x12 .qmt.trading.StrategyListRequest\x1a!.qmt.trading.StrategyListResponse\x12I\n\x0cSessionQuery\x12\x19.qmt.trading.QueryRequest\x1a\x1a.qmt.trading.QueryResponse(\x01\x30\x01\x12S\n\x10SubmitOrderAsync\x12\x1e.qmt.trading.AsyncOrderRequest\x1a\x1f.qmt.trading.AsyncOrderResponse\x12U\n\x10\x43\x61ncelOrderAsync\x12\x1f.qmt.trading.AsyncCancelRequest\x1a .qmt.trading.AsyncCancelResponse\x12\x64\n\x16StreamTradingCallbacks\x12#.qmt.trading.TradingCallbackRequest\x1a#.qmt.trading.TradingCallbackMessage0\x01\x12h\n\x1cStreamTradingCallbackBatches\x12#.qmt.trading.TradingCallbackRequest\x1a!.qmt.trading.TradingCallbackBatch0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,16 +34,16 @@ if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_STRATEGYINFO_PARAMETERSENTRY']._loaded_options = None
   _globals['_STRATEGYINFO_PARAMETERSENTRY']._serialized_options = b'8\001'
-  _globals['_ACCOUNTTYPE']._serialized_start=5374
-  _globals['_ACCOUNTTYPE']._serialized_end=5557
-  _globals['_ORDERSIDE']._serialized_start=5559
-  _globals['_ORDERSIDE']._serialized_end=5639
-  _globals['_ORDERTYPE']._serialized_start=5642
-  _globals['_ORDERTYPE']._serialized_end=5774
-  _globals['_ORDERSTATUS']._serialized_start=5777
-  _globals['_ORDERSTATUS']._serialized_end=5987
-  _globals['_TRADINGCALLBACKTYPE']._serialized_start=5990
-  _globals['_TRADINGCALLBACKTYPE']._serialized_end=6395
+  _globals['_ACCOUNTTYPE']._serialized_start=6013
+  _globals['_ACCOUNTTYPE']._serialized_end=6196
+  _globals['_ORDERSIDE']._serialized_start=6198
+  _globals['_ORDERSIDE']._serialized_end=6278
+  _globals['_ORDERTYPE']._serialized_start=6281
+  _globals['_ORDERTYPE']._serialized_end=6413
+  _globals['_ORDERSTATUS']._serialized_start=6416
+  _globals['_ORDERSTATUS']._serialized_end=6626
+  _globals['_TRADINGCALLBACKTYPE']._serialized_start=6629
+  _globals['_TRADINGCALLBACKTYPE']._serialized_end=7034
   _globals['_CONNECTREQUEST']._serialized_start=44
   _globals['_CONNECTREQUEST']._serialized_end=117
   _globals['_ACCOUNTINFO']._serialized_start=120
@@ -98,32 +98,38 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_STRATEGYINFO_PARAMETERSENTRY']._serialized_end=3035
   _globals['_STRATEGYLISTRESPONSE']._serialized_start=3037
   _globals['_STRATEGYLISTRESPONSE']._serialized_end=3142
-  _globals['_ASYNCORDERREQUEST']._serialized_start=3145
-  _globals['_ASYNCORDERREQUEST']._serialized_end=3340
-  _globals['_ASYNCORDERRESPONSE']._serialized_start=3343
-  _globals['_ASYNCORDERRESPONSE']._serialized_end=3511
-  _globals['_ASYNCCANCELREQUEST']._serialized_start=3513
-  _globals['_ASYNCCANCELREQUEST']._serialized_end=3592
-  _globals['_ASYNCCANCELRESPONSE']._serialized_start=3594
-  _globals['_ASYNCCANCELRESPONSE']._serialized_end=3716
-  _globals['_TRADINGCALLBACKREQUEST']._serialized_start=3718
-  _globals['_TRADINGCALLBACKREQUEST']._serialized_end=3762
-  _globals['_TRADINGCALLBACKMESSAGE']._serialized_start=3765
-  _globals['_TRADINGCALLBACKMESSAGE']._serialized_end=4314
-  _globals['_ORDERCALLBACKDATA']._serialized_start=4317
-  _globals['_ORDERCALLBACKDATA']._serialized_end=4582
-  _globals['_TRADECALLBACKDATA']._serialized_start=4585
-  _globals['_TRADECALLBACKDATA']._serialized_end=4802
-  _globals['_POSITIONCALLBACKDATA']._serialized_start=4805
-  _globals['_POSITIONCALLBACKDATA']._serialized_end=5017
-  _globals['_ASSETCALLBACKDATA']._serialized_start=5019
-  _globals['_ASSETCALLBACKDATA']._serialized_end=5140
-  _globals['_ERRORCALLBACKDATA']._serialized_start=5142
-  _globals['_ERRORCALLBACKDATA']._serialized_end=5218
-  _globals['_ASYNCORDERCALLBACKDATA']._serialized_start=5220
-  _globals['_ASYNCORDERCALLBACKDATA']._serialized_end=5294
-  _globals['_ASYNCCANCELCALLBACKDATA']._serialized_start=5296
-  _globals['_ASYNCCANCELCALLBACKDATA']._serialized_end=5371
-  _globals['_TRADINGSERVICE']._serialized_start=6398
-  _globals['_TRADINGSERVICE']._serialized_end=7531
+  _globals['_QUERYREQUEST']._serialized_start=3145
+  _globals['_QUERYREQUEST']._serialized_end=3319
+  _globals['_QUERYRESPONSE']._serialized_start=3322
+  _globals['_QUERYRESPONSE']._serialized_end=3702
+  _globals['_ASYNCORDERREQUEST']._serialized_start=3705
+  _globals['_ASYNCORDERREQUEST']._serialized_end=3900
+  _globals['_ASYNCORDERRESPONSE']._serialized_start=3903
+  _globals['_ASYNCORDERRESPONSE']._serialized_end=4071
+  _globals['_ASYNCCANCELREQUEST']._serialized_start=4073
+  _globals['_ASYNCCANCELREQUEST']._serialized_end=4152
+  _globals['_ASYNCCANCELRESPONSE']._serialized_start=4154
+  _globals['_ASYNCCANCELRESPONSE']._serialized_end=4276
+  _globals['_TRADINGCALLBACKREQUEST']._serialized_start=4278
+  _globals['_TRADINGCALLBACKREQUEST']._serialized_end=4322
+  _globals['_TRADINGCALLBACKMESSAGE']._serialized_start=4325
+  _globals['_TRADINGCALLBACKMESSAGE']._serialized_end=4874
+  _globals['_TRADINGCALLBACKBATCH']._serialized_start=4876
+  _globals['_TRADINGCALLBACKBATCH']._serialized_end=4953
+  _globals['_ORDERCALLBACKDATA']._serialized_start=4956
+  _globals['_ORDERCALLBACKDATA']._serialized_end=5221
+  _globals['_TRADECALLBACKDATA']._serialized_start=5224
+  _globals['_TRADECALLBACKDATA']._serialized_end=5441
+  _globals['_POSITIONCALLBACKDATA']._serialized_start=5444
+  _globals['_POSITIONCALLBACKDATA']._serialized_end=5656
+  _globals['_ASSETCALLBACKDATA']._serialized_start=5658
+  _globals['_ASSETCALLBACKDATA']._serialized_end=5779
+  _globals['_ERRORCALLBACKDATA']._serialized_start=5781
+  _globals['_ERRORCALLBACKDATA']._serialized_end=5857
+  _globals['_ASYNCORDERCALLBACKDATA']._serialized_start=5859
+  _globals['_ASYNCORDERCALLBACKDATA']._serialized_end=5933
+  _globals['_ASYNCCANCELCALLBACKDATA']._serialized_start=5935
+  _globals['_ASYNCCANCELCALLBACKDATA']._serialized_end=6010
+  _globals['_TRADINGSERVICE']._serialized_start=7037
+  _globals['_TRADINGSERVICE']._serialized_end=8431
 # @@protoc_insertion_point(module_scope)
@@ -61,6 +61,11 @@ class TradingServiceStub(object):
                 request_serializer=trading__pb2.OrderRequest.SerializeToString,
                 response_deserializer=trading__pb2.OrderResponse.FromString,
                 _registered_method=True)
+        self.SubmitOrderStream = channel.stream_stream(
+                '/qmt.trading.TradingService/SubmitOrderStream',
+                request_serializer=trading__pb2.OrderRequest.SerializeToString,
+                response_deserializer=trading__pb2.OrderResponse.FromString,
+                _registered_method=True)
         self.CancelOrder = channel.unary_unary(
                 '/qmt.trading.TradingService/CancelOrder',
                 request_serializer=trading__pb2.CancelOrderRequest.SerializeToString,
@@ -91,6 +96,11 @@ class TradingServiceStub(object):
                 request_serializer=trading__pb2.StrategyListRequest.SerializeToString,
                 response_deserializer=trading__pb2.StrategyListResponse.FromString,
                 _registered_method=True)
+        self.SessionQuery = channel.stream_stream(
+                '/qmt.trading.TradingService/SessionQuery',
+                request_serializer=trading__pb2.QueryRequest.SerializeToString,
+                response_deserializer=trading__pb2.QueryResponse.FromString,
+                _registered_method=True)
         self.SubmitOrderAsync = channel.unary_unary(
                 '/qmt.trading.TradingService/SubmitOrderAsync',
                 request_serializer=trading__pb2.AsyncOrderRequest.SerializeToString,
@@ -106,6 +116,11 @@ class TradingServiceStub(object):
                 request_serializer=trading__pb2.TradingCallbackRequest.SerializeToString,
                 response_deserializer=trading__pb2.TradingCallbackMessage.FromString,
                 _registered_method=True)
+        self.StreamTradingCallbackBatches = channel.unary_stream(
+                '/qmt.trading.TradingService/StreamTradingCallbackBatches',
+                request_serializer=trading__pb2.TradingCallbackRequest.SerializeToString,
+                response_deserializer=trading__pb2.TradingCallbackBatch.FromString,
+                _registered_method=True)
 
 
 class TradingServiceServicer(object):
@@ -148,6 +163,13 @@ class TradingServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SubmitOrderStream(self, request_iterator, context):
+        """批量提交订单（双向流，复用同一条流连续下单，每个请求对应一个响应）
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def CancelOrder(self, request, context):
         """撤销订单（一元调用）
         """
@@ -190,6 +212,13 @@ class TradingServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SessionQuery(self, request_iterator, context):
+        """会话查询（双向流，在同一条流上依次查询账户/持仓/订单/成交/资产/风险/策略）
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SubmitOrderAsync(self, request, context):
         """==================== 异步交易接口 ====================
 
@@ -213,6 +242,13 @@ class TradingServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamTradingCallbackBatches(self, request, context):
+        """订阅交易回调批量流（服务端流，回调密集时合并发送）
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_TradingServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -241,6 +277,11 @@ def add_TradingServiceServicer_to_server(servicer, server):
                     request_deserializer=trading__pb2.OrderRequest.FromString,
                     response_serializer=trading__pb2.OrderResponse.SerializeToString,
             ),
+            'SubmitOrderStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.SubmitOrderStream,
+                    request_deserializer=trading__pb2.OrderRequest.FromString,
+                    response_serializer=trading__pb2.OrderResponse.SerializeToString,
+            ),
             'CancelOrder': grpc.unary_unary_rpc_method_handler(
                     servicer.CancelOrder,
                     request_deserializer=trading__pb2.CancelOrderRequest.FromString,
@@ -271,6 +312,11 @@ def add_TradingServiceServicer_to_server(servicer, server):
                     request_deserializer=trading__pb2.StrategyListRequest.FromString,
                     response_serializer=trading__pb2.StrategyListResponse.SerializeToString,
             ),
+            'SessionQuery': grpc.stream_stream_rpc_method_handler(
+                    servicer.SessionQuery,
+                    request_deserializer=trading__pb2.QueryRequest.FromString,
+                    response_serializer=trading__pb2.QueryResponse.SerializeToString,
+            ),
             'SubmitOrderAsync': grpc.unary_unary_rpc_method_handler(
                     servicer.SubmitOrderAsync,
                     request_deserializer=trading__pb2.AsyncOrderRequest.FromString,
@@ -286,6 +332,11 @@ def add_TradingServiceServicer_to_server(servicer, server):
                     request_deserializer=trading__pb2.TradingCallbackRequest.FromString,
                     response_serializer=trading__pb2.TradingCallbackMessage.SerializeToString,
             ),
+            'StreamTradingCallbackBatches': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamTradingCallbackBatches,
+                    request_deserializer=trading__pb2.TradingCallbackRequest.FromString,
+                    response_serializer=trading__pb2.TradingCallbackBatch.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'qmt.trading.TradingService', rpc_method_handlers)
@@ -434,6 +485,33 @@ class TradingService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SubmitOrderStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/qmt.trading.TradingService/SubmitOrderStream',
+            trading__pb2.OrderRequest.SerializeToString,
+            trading__pb2.OrderResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def CancelOrder(request,
             target,
@@ -596,6 +674,33 @@ class TradingService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SessionQuery(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/qmt.trading.TradingService/SessionQuery',
+            trading__pb2.QueryRequest.SerializeToString,
+            trading__pb2.QueryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SubmitOrderAsync(request,
             target,
@@ -676,3 +781,30 @@ class TradingService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamTradingCallbackBatches(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/qmt.trading.TradingService/StreamTradingCallbackBatches',
+            trading__pb2.TradingCallbackRequest.SerializeToString,
+            trading__pb2.TradingCallbackBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
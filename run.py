@@ -87,4 +87,6 @@ if __name__ == '__main__':
         log_level=settings.logging.level.lower(),
         access_log=True,
         timeout_keep_alive=settings.uvicorn.timeout_keep_alive,
+        loop=settings.uvicorn.loop,
+        http=settings.uvicorn.http,
     )
@@ -65,7 +65,9 @@ def main():
         reload=reload_enabled,
         reload_includes=reload_includes,
         log_level=settings.logging.level.lower(),
-        access_log=True
+        access_log=True,
+        loop=settings.uvicorn.loop,
+        http=settings.uvicorn.http
     )
 
 
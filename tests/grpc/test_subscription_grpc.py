@@ -33,11 +33,26 @@ def grpc_service(data_service):
 @pytest.fixture
 def grpc_context():
     """Mock gRPC上下文"""
-    context = Mock(spec=grpc.ServicerContext)
-    context.is_active.return_value = True
+    context = Mock(spec=grpc.aio.ServicerContext)
+    context.done.return_value = False
     return context
 
 
+def take(stream, count):
+    """从异步流式接口中读取至多 count 条消息，读取后关闭流（触发取消订阅）"""
+    async def collect():
+        items = []
+        try:
+            async for item in stream:
+                items.append(item)
+                if len(items) >= count:
+                    break
+        finally:
+            await stream.aclose()
+        return items
+    return asyncio.run(collect())
+
+
 class TestSubscriptionGrpc:
     """gRPC订阅服务测试"""
     
@@ -50,21 +65,15 @@ class TestSubscriptionGrpc:
             subscription_type=data_pb2.SUBSCRIPTION_QUOTE
         )
         
-        # 调用订阅方法（流式返回）
-        response_stream = grpc_service.SubscribeQuote(request, grpc_context)
+        # 调用订阅方法（流式返回），接收3条后退出
+        quote_updates = take(grpc_service.SubscribeQuote(request, grpc_context), 3)
         
-        # 接收几条数据
-        count = 0
-        for quote_update in response_stream:
+        for quote_update in quote_updates:
             assert isinstance(quote_update, data_pb2.QuoteUpdate)
             assert quote_update.stock_code in ["000001.SZ", "600000.SH"]
             assert quote_update.last_price > 0
-            
-            count += 1
-            if count >= 3:  # 接收3条后退出
-                break
         
-        assert count >= 3
+        assert len(quote_updates) >= 3
     
     def test_unsubscribe_quote(self, grpc_service, grpc_context):
         """测试取消订阅"""
@@ -75,32 +84,37 @@ class TestSubscriptionGrpc:
             subscription_type=data_pb2.SUBSCRIPTION_QUOTE
         )
         
-        response_stream = grpc_service.SubscribeQuote(subscribe_request, grpc_context)
-        
-        # 获取第一条数据以确保订阅建立
-        quote_update = next(iter(response_stream))
-        assert quote_update is not None
-        
-        # 注意：实际的subscription_id需要从订阅管理器获取
-        # 这里为了测试简化，直接使用mock
-        from app.dependencies import get_subscription_manager
-        
-        settings = get_settings()
-        manager = get_subscription_manager(settings)
-        subscriptions = manager.list_subscriptions()
-        
-        if subscriptions:
-            subscription_id = subscriptions[0]["subscription_id"]
+        async def run():
+            response_stream = grpc_service.SubscribeQuote(subscribe_request, grpc_context)
             
-            # 取消订阅
-            unsubscribe_request = data_pb2.UnsubscribeRequest(
-                subscription_id=subscription_id
-            )
+            # 获取第一条数据以确保订阅建立
+            quote_update = await response_stream.__anext__()
+            assert quote_update is not None
+            
+            # 注意：实际的subscription_id需要从订阅管理器获取
+            # 这里为了测试简化，直接使用mock
+            from app.dependencies import get_subscription_manager
             
-            response = grpc_service.UnsubscribeQuote(unsubscribe_request, grpc_context)
+            settings = get_settings()
+            manager = get_subscription_manager(settings)
+            subscriptions = manager.list_subscriptions()
             
-            assert response.success is True
-            assert "取消" in response.message
+            if subscriptions:
+                subscription_id = subscriptions[0]["subscription_id"]
+                
+                # 取消订阅
+                unsubscribe_request = data_pb2.UnsubscribeRequest(
+                    subscription_id=subscription_id
+                )
+                
+                response = grpc_service.UnsubscribeQuote(unsubscribe_request, grpc_context)
+                
+                assert response.success is True
+                assert "取消" in response.message
+            
+            await response_stream.aclose()
+        
+        asyncio.run(run())
     
     def test_get_subscription_info(self, grpc_service, grpc_context):
         """测试获取订阅信息"""
@@ -176,10 +190,8 @@ class TestSubscriptionGrpc:
             subscription_type=data_pb2.SUBSCRIPTION_QUOTE
         )
         
-        response_stream = grpc_service.SubscribeQuote(request, grpc_context)
-        
         # 验证能够接收数据
-        quote_update = next(iter(response_stream))
+        quote_update = take(grpc_service.SubscribeQuote(request, grpc_context), 1)[0]
         assert quote_update is not None
         assert quote_update.stock_code == "000001.SZ"
     
@@ -201,19 +213,14 @@ class TestSubscriptionGrpc:
             markets=["SH", "SZ"]
         )
         
-        response_stream = grpc_service.SubscribeWholeQuote(request, grpc_context)
-        
         # 接收几条数据
-        count = 0
-        for quote_update in response_stream:
+        quote_updates = take(grpc_service.SubscribeWholeQuote(request, grpc_context), 5)
+        
+        for quote_update in quote_updates:
             assert isinstance(quote_update, data_pb2.QuoteUpdate)
             assert len(quote_update.stock_code) > 0
-            
-            count += 1
-            if count >= 5:
-                break
         
-        assert count >= 5
+        assert len(quote_updates) >= 5
     
     def test_subscribe_with_empty_symbols(self, grpc_service, grpc_context):
         """测试空股票列表的订阅（应该返回INVALID_ARGUMENT）"""
@@ -223,15 +230,9 @@ class TestSubscriptionGrpc:
             subscription_type=data_pb2.SUBSCRIPTION_QUOTE
         )
         
-        # 调用订阅方法
-        response_stream = grpc_service.SubscribeQuote(request, grpc_context)
-        
-        # 尝试获取第一条数据（应该立即返回空）
-        count = 0
-        for _ in response_stream:
-            count += 1
-            if count >= 1:
-                break
+        # 调用订阅方法，尝试获取第一条数据（应该立即返回空）
+        count = len(take(grpc_service.SubscribeQuote(request, grpc_context), 1))
+        assert count == 0
         
         # 验证上下文被设置为INVALID_ARGUMENT
         grpc_context.set_code.assert_called()
@@ -243,6 +244,44 @@ class TestSubscriptionGrpc:
         ), f"Expected INVALID_ARGUMENT, but got {call_args}"
 
 
+class TestSubscriptionGrpcServer:
+    """通过进程内 grpc.aio 服务器调用订阅接口，覆盖真实的 aio 上下文"""
+    
+    @pytest.mark.skipif(
+        get_settings().xtquant.mode.value != "mock",
+        reason="依赖Mock模式的模拟行情推送"
+    )
+    def test_subscribe_quote_stream_over_aio_server(self, grpc_service):
+        """测试订阅行情流可持续读取多条消息（Mock模式）"""
+        async def run():
+            server = grpc.aio.server()
+            data_pb2_grpc.add_DataServiceServicer_to_server(grpc_service, server)
+            port = server.add_insecure_port("127.0.0.1:0")
+            await server.start()
+            try:
+                async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                    stub = data_pb2_grpc.DataServiceStub(channel)
+                    call = stub.SubscribeQuote(data_pb2.SubscriptionRequest(
+                        symbols=["000001.SZ", "600000.SH"],
+                        adjust_type="none",
+                        subscription_type=data_pb2.SUBSCRIPTION_QUOTE
+                    ))
+                    quote_updates = []
+                    async for quote_update in call:
+                        quote_updates.append(quote_update)
+                        if len(quote_updates) >= 3:
+                            break
+                    call.cancel()
+                    return quote_updates
+            finally:
+                await server.stop(None)
+        
+        # Mock模式每秒推送一轮，第3条来自第二轮，验证流未在首条消息后中断
+        quote_updates = asyncio.run(run())
+        assert len(quote_updates) == 3
+        assert {q.stock_code for q in quote_updates} == {"000001.SZ", "600000.SH"}
+
+
 class TestSubscriptionManager:
     """订阅管理器单元测试"""
     
@@ -0,0 +1,309 @@
+"""
+gRPC 交易流式接口测试
+
+覆盖双向流下单/会话查询、交易回调流、批量回调流与交易回调管理器的等待/唤醒逻辑
+"""
+import asyncio
+
+import grpc
+import pytest
+
+from app.config import get_settings
+from app.grpc_services.trading_grpc_service import TradingGrpcService
+from app.models.trading_models import ConnectRequest, TradingCallbackType
+from app.services.trading_callback_manager import TradingCallbackManager, get_trading_callback_manager
+from app.services.trading_service import TradingService
+from generated import trading_pb2, trading_pb2_grpc
+
+
+ACCOUNT_ID = "123456"
+
+
+@pytest.fixture
+def callback_manager():
+    """创建独立的交易回调管理器实例"""
+    return TradingCallbackManager(get_settings())
+
+
+@pytest.fixture
+def trading_grpc_service():
+    """创建gRPC交易服务实例"""
+    return TradingGrpcService(TradingService(get_settings()))
+
+
+async def start_server(servicer):
+    """启动进程内 grpc.aio 服务器，返回 (server, 端口)"""
+    server = grpc.aio.server()
+    trading_pb2_grpc.add_TradingServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, port
+
+
+async def wait_subscribed(manager, account_id):
+    """等待服务端流完成订阅"""
+    for _ in range(200):
+        if account_id in manager._ws_subscribers:
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("回调流未建立订阅")
+
+
+def dispatch_order(manager, order_id):
+    """分发一条委托回调"""
+    manager._dispatch_callback(
+        TradingCallbackType.ORDER,
+        account_id=ACCOUNT_ID,
+        data={"order_id": order_id, "stock_code": "000001.SZ"}
+    )
+
+
+async def run_bidi(servicer, method, requests):
+    """通过进程内 grpc.aio 服务器调用双向流接口，发送全部请求后读取全部响应"""
+    server, port = await start_server(servicer)
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = trading_pb2_grpc.TradingServiceStub(channel)
+            call = getattr(stub, method)(iter(requests))
+            return [response async for response in call]
+    finally:
+        await server.stop(None)
+
+
+class TestTradingRequestStreams:
+    """双向流下单与会话查询测试"""
+
+    @pytest.fixture
+    def session_id(self, trading_grpc_service):
+        """连接测试账户，返回会话ID"""
+        result = trading_grpc_service.trading_service.connect_account(
+            ConnectRequest(account_id=ACCOUNT_ID, password="x")
+        )
+        assert result.success
+        return result.session_id
+
+    def test_submit_order_stream(self, trading_grpc_service, session_id):
+        """测试同一条流上逐笔下单，响应与请求顺序一一对应"""
+        requests = [
+            trading_pb2.OrderRequest(
+                session_id=session_id,
+                stock_code=stock_code,
+                side=trading_pb2.ORDER_SIDE_BUY,
+                order_type=trading_pb2.ORDER_TYPE_LIMIT,
+                volume=100,
+                price=10.0
+            )
+            for stock_code in ("000001.SZ", "600000.SH")
+        ]
+        responses = asyncio.run(run_bidi(trading_grpc_service, "SubmitOrderStream", requests))
+
+        assert len(responses) == 2
+        assert [r.status.code for r in responses] == [0, 0]
+        assert [r.order.stock_code for r in responses] == ["000001.SZ", "600000.SH"]
+        assert all(r.order.order_id for r in responses)
+
+    def test_submit_order_stream_partial_failure(self, trading_grpc_service, session_id):
+        """测试单笔订单失败只体现在对应响应中，不中断整条流"""
+        def order(stock_code, sid=session_id):
+            return trading_pb2.OrderRequest(
+                session_id=sid,
+                stock_code=stock_code,
+                side=trading_pb2.ORDER_SIDE_BUY,
+                order_type=trading_pb2.ORDER_TYPE_LIMIT,
+                volume=100,
+                price=10.0
+            )
+
+        requests = [order("000001.SZ"), order("INVALID"), order("000001.SZ", "no_such_session"), order("600000.SH")]
+        responses = asyncio.run(run_bidi(trading_grpc_service, "SubmitOrderStream", requests))
+
+        assert [r.status.code for r in responses] == [0, 400, 400, 0]
+        assert responses[0].order.stock_code == "000001.SZ"
+        assert responses[3].order.stock_code == "600000.SH"
+        assert not responses[1].HasField("order")
+        assert "账户未连接" in responses[2].status.message
+
+    def test_session_query(self, trading_grpc_service, session_id):
+        """测试同一条流上依次查询，payload 与请求的查询类型一一对应"""
+        requests = [
+            trading_pb2.QueryRequest(session_id=session_id, account=True),
+            trading_pb2.QueryRequest(session_id=session_id, positions=True),
+            trading_pb2.QueryRequest(session_id=session_id, asset=True),
+        ]
+        responses = asyncio.run(run_bidi(trading_grpc_service, "SessionQuery", requests))
+
+        assert [r.WhichOneof("payload") for r in responses] == ["account", "positions", "asset"]
+        assert responses[0].account.success is True
+        assert responses[0].account.account_info.account_id == ACCOUNT_ID
+        assert responses[1].positions.status.code == 0
+        assert responses[2].asset.status.code == 0
+
+    def test_session_query_partial_failure(self, trading_grpc_service, session_id):
+        """测试单个查询失败只体现在对应 payload 的 status 中，不中断整条流"""
+        requests = [
+            trading_pb2.QueryRequest(session_id="no_such_session", account=True),
+            trading_pb2.QueryRequest(session_id=session_id),
+            trading_pb2.QueryRequest(session_id=session_id, account=True),
+        ]
+        responses = asyncio.run(run_bidi(trading_grpc_service, "SessionQuery", requests))
+
+        assert len(responses) == 3
+        assert responses[0].WhichOneof("payload") == "account"
+        assert responses[0].account.success is False
+        assert responses[0].account.status.code == 400
+        # 未指定查询类型时返回空响应
+        assert responses[1].WhichOneof("payload") is None
+        assert responses[2].account.success is True
+
+
+class TestTradingCallbackStream:
+    """交易回调流测试"""
+
+    def test_stream_callbacks_in_order(self, callback_manager):
+        """测试回调按分发顺序推送"""
+        async def run():
+            stream = callback_manager.stream_callbacks(ACCOUNT_ID)
+            pending = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+
+            for order_id in ("1", "2", "3"):
+                dispatch_order(callback_manager, order_id)
+
+            received = [await pending, await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            return received
+
+        received = asyncio.run(run())
+        assert [c["data"]["order_id"] for c in received] == ["1", "2", "3"]
+        assert all(c["callback_type"] == TradingCallbackType.ORDER.value for c in received)
+
+    def test_recent_callbacks_history(self, callback_manager):
+        """测试回调历史按账户过滤、数量受限，且记录为 TradingCallbackDict 结构"""
+        for i in range(150):
+            callback_manager._dispatch_callback(
+                TradingCallbackType.ORDER,
+                account_id=ACCOUNT_ID if i % 2 else "other",
+                data={"order_id": str(i)},
+                seq=i
+            )
+
+        recent = callback_manager.get_recent_callbacks(ACCOUNT_ID, limit=3)
+        assert [c["seq"] for c in recent] == [145, 147, 149]
+        assert set(recent[0]) == {"callback_type", "account_id", "timestamp", "data", "seq"}
+        assert recent[0]["callback_type"] == "order"
+        assert isinstance(recent[0]["timestamp"], str)
+        assert len(callback_manager.get_recent_callbacks(limit=1000)) == 100
+
+    def test_wait_ignores_stale_wakeup(self, callback_manager):
+        """测试缓冲区已被取空后迟到的唤醒不会被当作有数据"""
+        async def run():
+            subscriber = callback_manager.subscribe(ACCOUNT_ID)
+            # 生产者 append 后排队 set()，消费者在 set() 执行前已取走数据
+            dispatch_order(callback_manager, "1")
+            subscriber.buffer.popleft()
+            has_data = await callback_manager._wait_for_callbacks(subscriber, timeout=0.05)
+            callback_manager.unsubscribe(subscriber, ACCOUNT_ID)
+            return has_data, len(subscriber.buffer)
+
+        has_data, buffered = asyncio.run(run())
+        assert has_data is False
+        assert buffered == 0
+
+    def test_stream_survives_stale_wakeup(self, callback_manager):
+        """测试消费者重新进入等待后收到迟到的唤醒，流继续等待下一条回调而不是抛出 IndexError"""
+        async def run():
+            stream = callback_manager.stream_callbacks(ACCOUNT_ID)
+            first = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            dispatch_order(callback_manager, "1")
+            assert (await first)["data"]["order_id"] == "1"
+
+            subscriber = next(iter(callback_manager._ws_subscribers[ACCOUNT_ID]))
+            pending = asyncio.ensure_future(stream.__anext__())
+            # 迟到的 set() 在消费者 clear() 并进入等待之后才执行
+            asyncio.get_running_loop().call_soon(subscriber.event.set)
+            await asyncio.sleep(0.01)
+            assert not pending.done()
+
+            dispatch_order(callback_manager, "2")
+            second = await pending
+            await stream.aclose()
+            return second
+
+        assert asyncio.run(run())["data"]["order_id"] == "2"
+
+
+class TestTradingCallbackBatchStream:
+    """交易回调批量流测试"""
+
+    def test_batches_merge_burst(self, callback_manager):
+        """测试窗口内到达的回调合并为一批"""
+        async def run():
+            stream = callback_manager.stream_callback_batches(ACCOUNT_ID, batch_window=0.01)
+            pending = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            for order_id in ("1", "2", "3"):
+                dispatch_order(callback_manager, order_id)
+            batch = await pending
+            await stream.aclose()
+            return batch
+
+        batch = asyncio.run(run())
+        assert [c["data"]["order_id"] for c in batch] == ["1", "2", "3"]
+
+    def test_batches_skip_stale_wakeup(self, callback_manager):
+        """测试迟到的唤醒不会产生空批次"""
+        async def run():
+            stream = callback_manager.stream_callback_batches(ACCOUNT_ID)
+            first = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)
+            dispatch_order(callback_manager, "1")
+            assert len(await first) == 1
+
+            subscriber = next(iter(callback_manager._ws_subscribers[ACCOUNT_ID]))
+            pending = asyncio.ensure_future(stream.__anext__())
+            asyncio.get_running_loop().call_soon(subscriber.event.set)
+            await asyncio.sleep(0.01)
+            assert not pending.done()
+
+            dispatch_order(callback_manager, "2")
+            batch = await pending
+            await stream.aclose()
+            return batch
+
+        batch = asyncio.run(run())
+        assert [c["data"]["order_id"] for c in batch] == ["2"]
+
+    def test_stream_trading_callback_batches_rpc(self, trading_grpc_service):
+        """测试 StreamTradingCallbackBatches 通过 gRPC 推送非空批次"""
+        async def run():
+            manager = get_trading_callback_manager(get_settings())
+            server, port = await start_server(trading_grpc_service)
+            try:
+                async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                    stub = trading_pb2_grpc.TradingServiceStub(channel)
+                    call = stub.StreamTradingCallbackBatches(
+                        trading_pb2.TradingCallbackRequest(account_id=ACCOUNT_ID)
+                    )
+                    read = asyncio.ensure_future(call.read())
+                    await wait_subscribed(manager, ACCOUNT_ID)
+                    for order_id in ("1", "2", "3"):
+                        dispatch_order(manager, order_id)
+
+                    messages = []
+                    batch = await read
+                    while True:
+                        assert len(batch.messages) > 0
+                        messages.extend(batch.messages)
+                        if len(messages) >= 3:
+                            break
+                        batch = await call.read()
+                    call.cancel()
+                    return messages
+            finally:
+                await server.stop(None)
+
+        messages = asyncio.run(run())
+        assert [m.order_data.order_id for m in messages] == ["1", "2", "3"]
+        assert all(m.callback_type == trading_pb2.CALLBACK_TYPE_ORDER for m in messages)
+        assert all(m.account_id == ACCOUNT_ID for m in messages)
@@ -1115,6 +1115,72 @@ class TestNewDataAPI:
         
         print("="*80)
     
+    def test_batch_mutate_sectors(self, http_client: httpx.Client, sample_stock_codes):
+        """测试批量修改板块成分股（结果与操作按顺序一一对应）"""
+        data = {
+            "ops": [
+                {"op": "add", "sector_name": "测试板块_pytest", "stock_list": sample_stock_codes[:3]},
+                {"op": "remove", "sector_name": "测试板块_pytest", "stock_list": [sample_stock_codes[0]]},
+                {"op": "reset", "sector_name": "测试板块_pytest", "stock_list": sample_stock_codes[:2]}
+            ]
+        }
+        
+        response = http_client.post("/api/v1/data/sector/batch-mutate", json=data)
+        assert response.status_code == 200
+        
+        result = response.json()
+        assert result["success"] is True
+        results = result["data"]
+        assert [r["op"] for r in results] == ["add", "remove", "reset"]
+        assert all(r["sector_name"] == "测试板块_pytest" for r in results)
+        assert all(r["success"] is True and r["message"] == "" for r in results)
+    
+    def test_batch_mutate_sectors_invalid_op(self, http_client: httpx.Client, sample_stock_codes):
+        """测试批量修改板块时不支持的操作类型（整个请求校验失败）"""
+        data = {
+            "ops": [
+                {"op": "rename", "sector_name": "测试板块_pytest", "stock_list": sample_stock_codes[:1]}
+            ]
+        }
+        
+        response = http_client.post("/api/v1/data/sector/batch-mutate", json=data)
+        assert response.status_code == 422
+        
+        response = http_client.post("/api/v1/data/sector/batch-mutate", json={"ops": []})
+        assert response.status_code == 422
+    
+    def test_batch_mutate_sectors_partial_failure(self, sample_stock_codes):
+        """测试批量修改板块时单个操作失败只体现在对应结果中，后续操作继续执行"""
+        from unittest.mock import patch
+        
+        from app.config import get_settings
+        from app.models.data_models import SectorMutation
+        from app.services.data_service import DataService
+        from app.utils.exceptions import DataServiceException
+        
+        data_service = DataService(get_settings())
+        ops = [
+            SectorMutation(op="add", sector_name="板块A", stock_list=sample_stock_codes[:2]),
+            SectorMutation(op="remove", sector_name="板块B", stock_list=sample_stock_codes[:1]),
+            SectorMutation(op="reset", sector_name="板块C", stock_list=sample_stock_codes[:1])
+        ]
+        
+        # 替换底层单项操作，使测试不依赖 xtquant 运行模式
+        with patch.object(data_service, "add_sector", return_value=True), patch.object(
+            data_service, "remove_stock_from_sector",
+            side_effect=DataServiceException("移除成分股失败: 板块不存在")
+        ), patch.object(data_service, "reset_sector", return_value=True) as reset_sector:
+            results = data_service.batch_mutate_sectors(ops)
+        
+        assert [(r.op, r.sector_name, r.success) for r in results] == [
+            ("add", "板块A", True),
+            ("remove", "板块B", False),
+            ("reset", "板块C", True)
+        ]
+        assert results[1].message == "移除成分股失败: 板块不存在"
+        assert results[0].message == "" and results[2].message == ""
+        reset_sector.assert_called_once_with("板块C", sample_stock_codes[:1])
+    
     # ===== 阶段5: Level2数据接口测试 =====
     
     def test_get_l2_quote(self, http_client: httpx.Client, sample_stock_codes):
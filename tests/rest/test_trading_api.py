@@ -121,6 +121,16 @@ class TestTradingAPI:
         # 可能返回 200 或 404（订单不存在）
         assert response.status_code in [200, 404]
     
+    def test_get_connection_status(self, http_client: httpx.Client, test_session: str):
+        """测试查询连接状态"""
+        response = http_client.get(f"/api/v1/trading/status/{test_session}")
+        assert response.status_code == 200
+        assert response.json()["data"]["connected"] is True
+
+        response = http_client.get("/api/v1/trading/status/no_such_session")
+        assert response.status_code == 200
+        assert response.json()["data"]["connected"] is False
+    
     def test_disconnect_account(self, http_client: httpx.Client):
         """测试断开账户连接"""
         from tests.rest.config import TEST_ACCOUNT_ID, TEST_ACCOUNT_PASSWORD, TEST_ACCOUNT_TYPE
@@ -0,0 +1,451 @@
+"""
+工具模块单元测试
+
+不依赖 REST/gRPC 服务运行，直接测试 app.utils 中的并发工具
+（CallBatcher 另与 TradingService 的批量异步下单/撤单组合测试）
+"""
+import asyncio
+
+import pytest
+
+from app.config import get_settings
+from app.models.trading_models import (
+    AsyncCancelRequest,
+    AsyncOrderRequest,
+    ConnectRequest,
+    OrderSide,
+)
+from app.services.trading_service import TradingService
+from app.utils import cache
+from app.utils.async_utils import run_sync
+from app.utils.batcher import Batcher, CallBatcher
+from app.utils.exceptions import TradingServiceException
+from app.utils.singleflight import SingleFlight, TTLSingleFlight
+
+
+class Counter:
+    """记录调用次数的协程工厂"""
+
+    def __init__(self, result=None, exc: Exception = None, delay: float = 0.01):
+        self.calls = 0
+        self.result = result
+        self.exc = exc
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.exc is not None:
+            raise self.exc
+        return self.result if self.result is not None else self.calls
+
+
+class TestSingleFlight:
+    """请求合并器测试"""
+
+    def test_concurrent_calls_coalesce(self):
+        """测试同一键的并发调用只执行一次并共享结果"""
+        async def run():
+            flight = SingleFlight()
+            fetch = Counter(result="data")
+            results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+            return fetch.calls, results
+
+        calls, results = asyncio.run(run())
+        assert calls == 1
+        assert results == ["data"] * 5
+
+    def test_sequential_calls_not_cached(self):
+        """测试调用完成后不保留结果"""
+        async def run():
+            flight = SingleFlight()
+            fetch = Counter()
+            return [await flight.do("k", fetch), await flight.do("k", fetch)]
+
+        assert asyncio.run(run()) == [1, 2]
+
+
+class TestTTLSingleFlight:
+    """带短时结果缓存的请求合并器测试"""
+
+    def test_result_cached_within_ttl(self):
+        """测试 TTL 内的顺序调用直接返回缓存结果"""
+        async def run():
+            flight = TTLSingleFlight(ttl=10)
+            fetch = Counter()
+            return [await flight.do("k", fetch) for _ in range(3)], fetch.calls
+
+        results, calls = asyncio.run(run())
+        assert results == [1, 1, 1]
+        assert calls == 1
+
+    def test_result_expires_after_ttl(self):
+        """测试 TTL 过期后重新执行"""
+        async def run():
+            flight = TTLSingleFlight(ttl=0.05)
+            fetch = Counter(delay=0)
+            first = await flight.do("k", fetch)
+            await asyncio.sleep(0.08)
+            second = await flight.do("k", fetch)
+            return first, second
+
+        assert asyncio.run(run()) == (1, 2)
+
+    def test_concurrent_calls_coalesce(self):
+        """测试执行期间到达的同一键调用共享同一次执行"""
+        async def run():
+            flight = TTLSingleFlight(ttl=10)
+            fetch = Counter()
+            results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+            return fetch.calls, results
+
+        calls, results = asyncio.run(run())
+        assert calls == 1
+        assert results == [1] * 5
+
+    def test_exception_propagates_and_not_cached(self):
+        """测试异常传递给所有等待者，且失败结果不缓存"""
+        async def run():
+            flight = TTLSingleFlight(ttl=10)
+            failing = Counter(exc=ValueError("boom"))
+            results = await asyncio.gather(
+                *(flight.do("k", failing) for _ in range(3)), return_exceptions=True
+            )
+            retry = Counter(result="ok")
+            return failing.calls, results, await flight.do("k", retry), retry.calls
+
+        failing_calls, results, retried, retry_calls = asyncio.run(run())
+        assert failing_calls == 1
+        assert all(isinstance(r, ValueError) and str(r) == "boom" for r in results)
+        assert retried == "ok"
+        assert retry_calls == 1
+
+    def test_forget_removes_only_matching_keys(self):
+        """测试 forget 只移除匹配的键，其他键仍命中缓存"""
+        async def run():
+            flight = TTLSingleFlight(ttl=10)
+            fetch_a, fetch_b = Counter(), Counter()
+            await flight.do("subscription:a", fetch_a)
+            await flight.do("subscriptions", fetch_b)
+            flight.forget("subscription:a")
+            await flight.do("subscription:a", fetch_a)
+            await flight.do("subscriptions", fetch_b)
+            return fetch_a.calls, fetch_b.calls
+
+        assert asyncio.run(run()) == (2, 1)
+
+    def test_forget_during_flight_skips_store(self):
+        """测试执行期间被 forget 的调用完成后不写入缓存"""
+        async def run():
+            flight = TTLSingleFlight(ttl=10)
+            fetch = Counter(delay=0.02)
+            task = asyncio.ensure_future(flight.do("k", fetch))
+            await asyncio.sleep(0)
+            flight.forget("k")
+            first = await task
+            second = await flight.do("k", fetch)
+            return first, second
+
+        assert asyncio.run(run()) == (1, 2)
+
+    def test_maxsize_evicts(self):
+        """测试缓存条目达到上限后淘汰，不无限增长"""
+        async def run():
+            flight = TTLSingleFlight(ttl=10, maxsize=2)
+            for key in ("a", "b", "c"):
+                await flight.do(key, Counter(delay=0))
+            return len(flight._results)
+
+        assert asyncio.run(run()) <= 2
+
+
+class TestBatcher:
+    """多标的请求微批处理器测试"""
+
+    def test_results_mapped_back_to_callers(self):
+        """测试窗口内的请求合并为一次调用，各请求只收到自己的标的结果"""
+        async def run():
+            fetched = []
+
+            async def fetch(codes):
+                fetched.append(list(codes))
+                return {code: f"quote:{code}" for code in codes}
+
+            batcher = Batcher(fetch, window=0.005)
+            results = await asyncio.gather(
+                batcher.submit(["000001.SZ", "600000.SH"]),
+                batcher.submit(["600000.SH"]),
+                batcher.submit(["300750.SZ"])
+            )
+            return fetched, results
+
+        fetched, results = asyncio.run(run())
+        # 合并去重后只调用一次，保持首次出现顺序
+        assert fetched == [["000001.SZ", "600000.SH", "300750.SZ"]]
+        assert results == [
+            {"000001.SZ": "quote:000001.SZ", "600000.SH": "quote:600000.SH"},
+            {"600000.SH": "quote:600000.SH"},
+            {"300750.SZ": "quote:300750.SZ"}
+        ]
+
+    def test_missing_codes_omitted(self):
+        """测试合并调用未返回的标的不出现在对应请求的结果中"""
+        async def run():
+            async def fetch(codes):
+                return {code: 1 for code in codes if code != "INVALID"}
+
+            batcher = Batcher(fetch, window=0.001)
+            return await asyncio.gather(
+                batcher.submit(["000001.SZ", "INVALID"]),
+                batcher.submit(["INVALID"])
+            )
+
+        assert asyncio.run(run()) == [{"000001.SZ": 1}, {}]
+
+    def test_fetch_failure_propagates_to_batch(self):
+        """测试合并调用失败时同批请求收到同一异常，之后的批次不受影响"""
+        async def run():
+            calls = 0
+
+            async def fetch(codes):
+                nonlocal calls
+                calls += 1
+                if calls == 1:
+                    raise RuntimeError("xtdata unavailable")
+                return {code: calls for code in codes}
+
+            batcher = Batcher(fetch, window=0.001)
+            failed = await asyncio.gather(
+                batcher.submit(["000001.SZ"]),
+                batcher.submit(["600000.SH"]),
+                return_exceptions=True
+            )
+            retried = await batcher.submit(["000001.SZ"])
+            return failed, retried
+
+        failed, retried = asyncio.run(run())
+        assert all(isinstance(e, RuntimeError) and str(e) == "xtdata unavailable" for e in failed)
+        assert failed[0] is failed[1]
+        assert retried == {"000001.SZ": 2}
+
+
+
+class TestCallBatcher:
+    """逐项调用微批处理器测试"""
+
+    @pytest.fixture
+    def trading_service(self):
+        """创建已连接测试账户的交易服务，返回 (服务, 会话ID)"""
+        service = TradingService(get_settings())
+        result = service.connect_account(ConnectRequest(account_id="123456", password="x"))
+        assert result.success
+        return service, result.session_id
+
+    def test_results_mapped_back_to_callers(self):
+        """测试窗口内的调用合并为一次 fetch，结果按顺序回到对应调用方"""
+        async def run():
+            batches = []
+
+            async def fetch(items):
+                batches.append(list(items))
+                return [item * 10 for item in items]
+
+            batcher = CallBatcher(fetch, window=0.005)
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+            return batches, results
+
+        batches, results = asyncio.run(run())
+        assert batches == [[0, 1, 2, 3, 4]]
+        assert results == [0, 10, 20, 30, 40]
+
+    def test_item_exception_isolated(self):
+        """测试单项结果为异常时只有对应调用方收到该异常"""
+        async def run():
+            async def fetch(items):
+                return [ValueError(f"bad {item}") if item == 2 else item for item in items]
+
+            batcher = CallBatcher(fetch, window=0.001)
+            return await asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert results[0] == 0 and results[1] == 1 and results[3] == 3
+        assert isinstance(results[2], ValueError) and str(results[2]) == "bad 2"
+
+    def test_fetch_failure_propagates_to_batch(self):
+        """测试合并调用本身失败时同批调用方收到同一异常"""
+        async def run():
+            async def fetch(items):
+                raise RuntimeError("thread pool timeout")
+
+            batcher = CallBatcher(fetch, window=0.001)
+            return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(e, RuntimeError) for e in results)
+
+    def test_order_batch_isolates_failures(self, trading_service):
+        """测试同一批异步下单中单笔失败只返回自身错误，其余订单正常提交且结果对应各自请求"""
+        service, session_id = trading_service
+
+        def order(stock_code, volume=100):
+            return AsyncOrderRequest(stock_code=stock_code, side=OrderSide.BUY, volume=volume, price=10.0)
+
+        async def run():
+            async def fetch(items):
+                return await run_sync(service.submit_orders_async_batch, items)
+
+            batcher = CallBatcher(fetch, window=0.005)
+            return await asyncio.gather(
+                batcher.submit((session_id, order("000001.SZ", 100))),
+                batcher.submit((session_id, order("INVALID", 200))),
+                batcher.submit(("no_such_session", order("600000.SH", 300))),
+                batcher.submit((session_id, order("600000.SH", 400))),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert isinstance(results[1], TradingServiceException)
+        assert "无效的股票代码" in str(results[1])
+        assert isinstance(results[2], TradingServiceException)
+        assert "账户未连接" in str(results[2])
+        assert [(r.success, r.stock_code, r.volume) for r in (results[0], results[3])] == [
+            (True, "000001.SZ", 100),
+            (True, "600000.SH", 400)
+        ]
+        assert results[0].seq != results[3].seq
+
+    def test_cancel_batch_isolates_failures(self, trading_service):
+        """测试同一批异步撤单中单笔失败只返回自身错误"""
+        service, session_id = trading_service
+        results = service.cancel_orders_async_batch([
+            (session_id, AsyncCancelRequest(order_id="1001")),
+            (session_id, AsyncCancelRequest()),
+            (session_id, AsyncCancelRequest(order_id="1002"))
+        ])
+
+        assert [r.order_id for r in (results[0], results[2])] == ["1001", "1002"]
+        assert all(r.success for r in (results[0], results[2]))
+        assert isinstance(results[1], TradingServiceException)
+
+
+
+class FakeRedis:
+    """最小的内存 Redis 替身，仅实现 exclusive 使用的 SET NX EX 与释放脚本"""
+
+    def __init__(self):
+        self.store = {}
+        self.fail = False
+
+    async def set(self, key, value, nx=False, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        # 与 _RELEASE_SCRIPT 相同的语义：仅当值仍为本持有者的 token 时删除
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+class TestExclusive:
+    """下载任务互斥锁测试"""
+
+    @pytest.fixture
+    def fake_redis(self, monkeypatch):
+        """启用内存 Redis 替身"""
+        client = FakeRedis()
+        monkeypatch.setattr(cache, "_redis", client)
+        monkeypatch.setattr(cache, "_retry_at", 0.0)
+        return client
+
+    @staticmethod
+    async def download(key, state):
+        """模拟一次下载任务：获取到锁时执行，记录最大并发数"""
+        async with cache.exclusive(key, ttl=60) as acquired:
+            if not acquired:
+                return False
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+            await asyncio.sleep(0.01)
+            state["running"] -= 1
+            return True
+
+    def run_concurrent_downloads(self, count=5):
+        """并发触发同一下载任务，随后再触发一次"""
+        async def run():
+            state = {"running": 0, "max_running": 0}
+            results = await asyncio.gather(*(self.download("download:test", state) for _ in range(count)))
+            after = await self.download("download:test", state)
+            return results, after, state["max_running"]
+
+        return asyncio.run(run())
+
+    def test_local_lock_serializes_concurrent_downloads(self):
+        """测试未启用 Redis 时进程内锁只允许一个下载任务执行，结束后可再次获取"""
+        results, after, max_running = self.run_concurrent_downloads()
+        assert results.count(True) == 1
+        assert max_running == 1
+        assert after is True
+        assert "download:test" not in cache._local_locks
+
+    def test_local_lock_released_on_exception(self):
+        """测试持有进程内锁时抛出异常，锁仍被释放"""
+        async def run():
+            with pytest.raises(RuntimeError):
+                async with cache.exclusive("download:test", ttl=60) as acquired:
+                    assert acquired is True
+                    raise RuntimeError("download failed")
+            async with cache.exclusive("download:test", ttl=60) as acquired:
+                return acquired
+
+        assert asyncio.run(run()) is True
+        assert "download:test" not in cache._local_locks
+
+    def test_redis_lock_serializes_concurrent_downloads(self, fake_redis):
+        """测试 Redis 锁只允许一个下载任务执行，结束后释放键"""
+        results, after, max_running = self.run_concurrent_downloads()
+        assert results.count(True) == 1
+        assert max_running == 1
+        assert after is True
+        assert fake_redis.store == {}
+        assert not cache._local_locks
+
+    def test_redis_lock_released_on_exception(self, fake_redis):
+        """测试持有 Redis 锁时抛出异常，锁仍被释放"""
+        async def run():
+            with pytest.raises(RuntimeError):
+                async with cache.exclusive("download:test", ttl=60) as acquired:
+                    assert acquired is True
+                    assert "download:test" in fake_redis.store
+                    raise RuntimeError("download failed")
+            return dict(fake_redis.store)
+
+        assert asyncio.run(run()) == {}
+
+    def test_redis_lock_keeps_other_holders_lock(self, fake_redis):
+        """测试锁过期后被其他实例重新获取时，原持有者退出不会删除他人的锁"""
+        async def run():
+            async with cache.exclusive("download:test", ttl=60) as acquired:
+                assert acquired is True
+                fake_redis.store["download:test"] = "other-token"
+            return dict(fake_redis.store)
+
+        assert asyncio.run(run()) == {"download:test": "other-token"}
+
+    def test_redis_failure_falls_back_to_local_lock(self, fake_redis):
+        """测试 Redis 出错时降级为进程内锁，仍只允许一个下载任务执行"""
+        fake_redis.fail = True
+        results, after, max_running = self.run_concurrent_downloads()
+        assert results.count(True) == 1
+        assert max_running == 1
+        assert after is True
+        assert not cache._local_locks
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])